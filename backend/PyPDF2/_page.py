@@ -167,6 +167,17 @@ def deleteRectangle(self: Any, name: str) -> None:  # pragma: no cover
     del self[name]
 
 
+def _peeked_as_image(pdf: Any, ref: Any) -> bool:
+    """
+    True when a text-only reader can tell from the XObject dictionary alone
+    that ``ref`` is an image, so its data never has to be loaded.
+    """
+    if not getattr(pdf, "text_only", False) or not isinstance(ref, IndirectObject):
+        return False
+    xobj_dict = pdf._peek_stream_dict(ref)
+    return xobj_dict is not None and xobj_dict.get("/Subtype") == "/Image"
+
+
 def _create_rectangle_accessor(name: str, fallback: Iterable[str]) -> property:
     return property(
         lambda self: _get_rectangle(self, name, fallback),
@@ -1338,8 +1349,22 @@ class PageObject(DictionaryObject):
         except Exception:
             return ""  # no resources means no text is possible (no font) we consider the file as not damaged, no need to check for TJ or Tj
         if "/Font" in resources_dict:
-            for f in cast(DictionaryObject, resources_dict["/Font"]):
+            # Fonts shared by several pages are parsed once per reader
+            font_cache = getattr(pdf, "_font_cache", None)
+            fonts = cast(DictionaryObject, resources_dict["/Font"])
+            for f in fonts:
+                font_ref = fonts.raw_get(f)
+                cache_key = (
+                    (font_ref.idnum, font_ref.generation, space_width)
+                    if font_cache is not None and isinstance(font_ref, IndirectObject)
+                    else None
+                )
+                if cache_key is not None and cache_key in font_cache:
+                    cmaps[f] = font_cache[cache_key]
+                    continue
                 cmaps[f] = build_char_map(f, space_width, obj)
+                if cache_key is not None:
+                    font_cache[cache_key] = cmaps[f]
         cmap: Tuple[
             Union[str, Dict[int, str]], Dict[str, str], str, Optional[DictionaryObject]
         ] = (
@@ -1732,7 +1757,10 @@ class PageObject(DictionaryObject):
                     pass
                 try:
                     xobj = resources_dict["/XObject"]
-                    if xobj[operands[0]]["/Subtype"] != "/Image":  # type: ignore
+                    if (
+                        not _peeked_as_image(pdf, xobj.raw_get(operands[0]))  # type: ignore
+                        and xobj[operands[0]]["/Subtype"] != "/Image"  # type: ignore
+                    ):
                         # output += text
                         text = self.extract_xform_text(
                             xobj[operands[0]],  # type: ignore
@@ -39,6 +39,7 @@ from typing import (
     Callable,
     Dict,
     Iterable,
+    Iterator,
     List,
     Optional,
     Tuple,
@@ -292,21 +293,36 @@ class PdfReader:
     :param None/str/bytes password: Decrypt PDF file at initialization. If the
         password is None, the file will not be decrypted.
         Defaults to ``None``
+    :param bool text_only: Read the document for text extraction only. Image
+        XObjects are recognised from their dictionary and skipped without
+        loading their data. Combine with :meth:`iter_pages` to also avoid
+        resolving pages that are never read.
+        Defaults to ``False``.
     """
 
+    # bytes read past an object header when peeking at a stream dictionary
+    _PEEK_SIZE = 4096
+
     def __init__(
         self,
         stream: Union[StrByteType, Path],
         strict: bool = False,
         password: Union[None, str, bytes] = None,
+        text_only: bool = False,
     ) -> None:
         self.strict = strict
+        self.text_only = text_only
         self.flattened_pages: Optional[List[PageObject]] = None
         self.resolved_objects: Dict[Tuple[Any, Any], Optional[PdfObject]] = {}
         self.xref_index = 0
         self._page_id2num: Optional[
             Dict[Any, Any]
         ] = None  # map page indirect_reference number to Page Number
+        # build_char_map results keyed by (font idnum, generation, space_width),
+        # shared by all pages of this reader during text extraction
+        self._font_cache: Dict[Tuple[int, int, float], Tuple[Any, ...]] = {}
+        # stream dictionaries read without their data (text_only mode)
+        self._peeked_stream_dicts: Dict[Tuple[int, int], Optional[DictionaryObject]] = {}
         if hasattr(stream, "mode") and "b" not in stream.mode:  # type: ignore
             logger_warning(
                 "PdfReader stream/file object is not in binary mode. "
@@ -985,6 +1001,96 @@ class PdfReader:
         """Read-only property that emulates a list of :py:class:`Page<PyPDF2._page.Page>` objects."""
         return _VirtualList(self._get_num_pages, self._get_page)  # type: ignore
 
+    def iter_pages(self, limit: Optional[int] = None) -> Iterator[PageObject]:
+        """
+        Iterate over the pages, resolving the page tree only as far as needed.
+
+        :py:attr:`pages` flattens the whole page tree on first access; this
+        walks ``/Kids`` on demand instead, so reading the first pages of a
+        large document never loads the dictionaries of the others.
+
+        :param limit: Stop after this many pages. Defaults to all pages.
+        """
+        if limit is not None and limit <= 0:
+            return
+        if self.flattened_pages is not None:
+            yield from self.flattened_pages[:limit]
+            return
+        catalog = self.trailer[TK.ROOT].get_object()
+        pages = catalog["/Pages"].get_object()  # type: ignore
+        for count, page in enumerate(self._iter_page_tree(pages, {}), 1):  # type: ignore
+            yield page
+            if limit is not None and count >= limit:
+                return
+
+    def _iter_page_tree(
+        self,
+        pages: DictionaryObject,
+        inherit: Dict[str, Any],
+        indirect_reference: Optional[IndirectObject] = None,
+    ) -> Iterator[PageObject]:
+        # lazy counterpart of _flatten
+        t = pages[PA.TYPE] if PA.TYPE in pages else "/Pages"
+        if t == "/Pages":
+            inherit = dict(inherit)
+            for attr in (PG.RESOURCES, PG.MEDIABOX, PG.CROPBOX, PG.ROTATE):
+                if attr in pages:
+                    inherit[NameObject(attr)] = pages[attr]
+            for page in pages[PA.KIDS]:  # type: ignore
+                yield from self._iter_page_tree(
+                    page.get_object(),
+                    inherit,
+                    page if isinstance(page, IndirectObject) else None,
+                )
+        elif t == "/Page":
+            for attr_in, value in inherit.items():
+                if attr_in not in pages:
+                    pages[attr_in] = value
+            page_obj = PageObject(self, indirect_reference)
+            page_obj.update(pages)
+            yield page_obj
+
+    def _peek_stream_dict(
+        self, indirect_reference: IndirectObject
+    ) -> Optional[DictionaryObject]:
+        """
+        Dictionary of a stream object, parsed without reading the stream data.
+
+        Only the first bytes after the object header are read. Peeked
+        dictionaries are kept apart from the resolved objects, so resolving
+        the object later still reads it in full. Returns ``None`` whenever the
+        dictionary cannot be peeked at cheaply; callers then fall back to
+        resolving the object.
+        """
+        key = (indirect_reference.generation, indirect_reference.idnum)
+        cached = self.cache_get_indirect_object(*key)
+        if cached is not None:
+            return cached if isinstance(cached, DictionaryObject) else None
+        if key in self._peeked_stream_dicts:
+            return self._peeked_stream_dicts[key]
+        start = self.xref.get(indirect_reference.generation, {}).get(
+            indirect_reference.idnum
+        )
+        if start is None:
+            return None
+        pos = self.stream.tell()
+        peeked: Optional[DictionaryObject] = None
+        try:
+            self.stream.seek(start, 0)
+            idnum, _ = self.read_object_header(self.stream)
+            head = self.stream.read(self._PEEK_SIZE)
+            end = head.find(b"stream")
+            if idnum == indirect_reference.idnum and end >= 0:
+                obj = read_object(BytesIO(head[:end]), self)
+                if isinstance(obj, DictionaryObject):
+                    peeked = obj
+        except Exception:
+            peeked = None
+        finally:
+            self.stream.seek(pos, 0)
+        self._peeked_stream_dicts[key] = peeked
+        return peeked
+
     @property
     def page_layout(self) -> Optional[str]:
         """
@@ -38,10 +38,16 @@ import math
 import struct
 import zlib
 from io import BytesIO
+from itertools import accumulate
 from typing import Any, Dict, Optional, Tuple, Union, cast
 
 from .generic import ArrayObject, DictionaryObject, IndirectObject, NameObject
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; pure-Python row decoders are used instead
+    np = None  # type: ignore
+
 try:
     from typing import Literal  # type: ignore[attr-defined]
 except ImportError:
@@ -49,7 +55,7 @@ except ImportError:
     # For older Python versions, the backport typing_extensions is necessary:
     from typing_extensions import Literal  # type: ignore[misc]
 
-from ._utils import b_, deprecate_with_replacement, ord_, paeth_predictor
+from ._utils import b_, deprecate_with_replacement
 from .constants import CcittFaxDecodeParameters as CCITT
 from .constants import ColorSpaces
 from .constants import FilterTypeAbbreviations as FTA
@@ -75,6 +81,46 @@ def decompress(data: bytes) -> bytes:
         return result_str
 
 
+def _png_sub(raw: memoryview) -> bytes:
+    if np is not None:
+        return np.cumsum(np.frombuffer(raw, dtype=np.uint8), dtype=np.uint8).tobytes()
+    return bytes(accumulate(raw, lambda left, x: (left + x) & 0xFF))
+
+
+def _png_up(raw: memoryview, prev: bytes) -> bytes:
+    if np is not None:
+        return (np.frombuffer(raw, dtype=np.uint8) + np.frombuffer(prev, dtype=np.uint8)).tobytes()
+    return bytes([(x + up) & 0xFF for x, up in zip(raw, prev)])
+
+
+def _png_average(raw: memoryview, prev: bytes) -> bytes:
+    current = bytearray(raw)
+    left = 0
+    for i, up in enumerate(prev):
+        left = current[i] = (current[i] + ((left + up) >> 1)) & 0xFF
+    return bytes(current)
+
+
+def _png_paeth(raw: memoryview, prev: bytes) -> bytes:
+    current = bytearray(raw)
+    left = 0
+    up_left = 0
+    for i, up in enumerate(prev):
+        p = left + up - up_left
+        dist_left = abs(p - left)
+        dist_up = abs(p - up)
+        dist_up_left = abs(p - up_left)
+        if dist_left <= dist_up and dist_left <= dist_up_left:
+            predicted = left
+        elif dist_up <= dist_up_left:
+            predicted = up
+        else:
+            predicted = up_left
+        left = current[i] = (current[i] + predicted) & 0xFF
+        up_left = up
+    return bytes(current)
+
+
 class FlateDecode:
     @staticmethod
     def decode(
@@ -146,43 +192,44 @@ class FlateDecode:
 
     @staticmethod
     def _decode_png_prediction(data: str, columns: int, rowlength: int) -> bytes:
-        output = BytesIO()
+        """
+        Undo PNG row filters (predictors 10-15), one row at a time.
+
+        Sub and Up rows are vectorized with NumPy when it is installed; the
+        remaining filters run tight loops over bytearrays. The left
+        neighbour is always the previous byte, as in the original decoder.
+        """
+        if isinstance(data, str):
+            data = data.encode("latin-1")
         # PNG prediction can vary from row to row
         if len(data) % rowlength != 0:
             raise PdfReadError("Image data is not rectangular")
-        prev_rowdata = (0,) * rowlength
-        for row in range(len(data) // rowlength):
-            rowdata = [
-                ord_(x) for x in data[(row * rowlength) : ((row + 1) * rowlength)]
-            ]
-            filter_byte = rowdata[0]
+        width = rowlength - 1
+        rows = len(data) // rowlength
+        output = bytearray(rows * width)
+        view = memoryview(data)
+        prev = bytes(width)
+        for row in range(rows):
+            start = row * rowlength
+            filter_byte = data[start]
+            raw = view[start + 1 : start + rowlength]
 
             if filter_byte == 0:
-                pass
+                current = bytes(raw)
             elif filter_byte == 1:
-                for i in range(2, rowlength):
-                    rowdata[i] = (rowdata[i] + rowdata[i - 1]) % 256
+                current = _png_sub(raw)
             elif filter_byte == 2:
-                for i in range(1, rowlength):
-                    rowdata[i] = (rowdata[i] + prev_rowdata[i]) % 256
+                current = _png_up(raw, prev)
             elif filter_byte == 3:
-                for i in range(1, rowlength):
-                    left = rowdata[i - 1] if i > 1 else 0
-                    floor = math.floor(left + prev_rowdata[i]) / 2
-                    rowdata[i] = (rowdata[i] + int(floor)) % 256
+                current = _png_average(raw, prev)
             elif filter_byte == 4:
-                for i in range(1, rowlength):
-                    left = rowdata[i - 1] if i > 1 else 0
-                    up = prev_rowdata[i]
-                    up_left = prev_rowdata[i - 1] if i > 1 else 0
-                    paeth = paeth_predictor(left, up, up_left)
-                    rowdata[i] = (rowdata[i] + paeth) % 256
+                current = _png_paeth(raw, prev)
             else:
                 # unsupported PNG filter
                 raise PdfReadError(f"Unsupported PNG filter {filter_byte!r}")
-            prev_rowdata = tuple(rowdata)
-            output.write(bytearray(rowdata[1:]))
-        return output.getvalue()
+            output[row * width : (row + 1) * width] = current
+            prev = current
+        return bytes(output)
 
     @staticmethod
     def encode(data: bytes) -> bytes:
@@ -243,37 +290,7 @@ class LZWDecode:
         def __init__(self, data: bytes) -> None:
             self.STOP = 257
             self.CLEARDICT = 256
-            self.data = data
-            self.bytepos = 0
-            self.bitpos = 0
-            self.dict = [""] * 4096
-            for i in range(256):
-                self.dict[i] = chr(i)
-            self.reset_dict()
-
-        def reset_dict(self) -> None:
-            self.dictlen = 258
-            self.bitspercode = 9
-
-        def next_code(self) -> int:
-            fillbits = self.bitspercode
-            value = 0
-            while fillbits > 0:
-                if self.bytepos >= len(self.data):
-                    return -1
-                nextbits = ord_(self.data[self.bytepos])
-                bitsfromhere = 8 - self.bitpos
-                bitsfromhere = min(bitsfromhere, fillbits)
-                value |= (
-                    (nextbits >> (8 - self.bitpos - bitsfromhere))
-                    & (0xFF >> (8 - bitsfromhere))
-                ) << (fillbits - bitsfromhere)
-                fillbits -= bitsfromhere
-                self.bitpos += bitsfromhere
-                if self.bitpos >= 8:
-                    self.bitpos = 0
-                    self.bytepos = self.bytepos + 1
-            return value
+            self.data = data.encode("latin-1") if isinstance(data, str) else data
 
         def decode(self) -> str:
             """
@@ -284,38 +301,57 @@ class LZWDecode:
             http://www.rasip.fer.hr/research/compress/algorithms/fund/lz/lzw.html
             and the PDFReference
 
+            Codes are read from an integer bit buffer and table entries are
+            bytes, so output is built with bytearray appends instead of
+            per-bit loops and string concatenation.
+
             :raises PdfReadError: If the stop code is missing
             """
-            cW = self.CLEARDICT
-            baos = ""
+            data = self.data
+            data_len = len(data)
+            stop, clear = self.STOP, self.CLEARDICT
+            single = [bytes((i,)) for i in range(256)]
+            table = single + [b""] * (4096 - 256)
+            dictlen = 258
+            bitspercode = 9
+            pos = 0
+            bitbuf = 0
+            nbits = 0
+            out = bytearray()
+
+            cW = clear
             while True:
                 pW = cW
-                cW = self.next_code()
-                if cW == -1:
-                    raise PdfReadError("Missed the stop code in LZWDecode!")
-                if cW == self.STOP:
+                while nbits < bitspercode:
+                    if pos >= data_len:
+                        raise PdfReadError("Missed the stop code in LZWDecode!")
+                    bitbuf = (bitbuf << 8) | data[pos]
+                    pos += 1
+                    nbits += 8
+                nbits -= bitspercode
+                cW = bitbuf >> nbits
+                bitbuf &= (1 << nbits) - 1
+
+                if cW == stop:
                     break
-                elif cW == self.CLEARDICT:
-                    self.reset_dict()
-                elif pW == self.CLEARDICT:
-                    baos += self.dict[cW]
+                elif cW == clear:
+                    dictlen = 258
+                    bitspercode = 9
+                elif pW == clear:
+                    out += table[cW]
                 else:
-                    if cW < self.dictlen:
-                        baos += self.dict[cW]
-                        p = self.dict[pW] + self.dict[cW][0]
-                        self.dict[self.dictlen] = p
-                        self.dictlen += 1
+                    if cW < dictlen:
+                        entry = table[cW]
+                        out += entry
+                        table[dictlen] = table[pW] + single[entry[0]]
                     else:
-                        p = self.dict[pW] + self.dict[pW][0]
-                        baos += p
-                        self.dict[self.dictlen] = p
-                        self.dictlen += 1
-                    if (
-                        self.dictlen >= (1 << self.bitspercode) - 1
-                        and self.bitspercode < 12
-                    ):
-                        self.bitspercode += 1
-            return baos
+                        entry = table[pW] + single[table[pW][0]]
+                        out += entry
+                        table[dictlen] = entry
+                    dictlen += 1
+                    if dictlen >= (1 << bitspercode) - 1 and bitspercode < 12:
+                        bitspercode += 1
+            return out.decode("latin-1")
 
     @staticmethod
     def decode(
@@ -0,0 +1,217 @@
+"""
+Async OpenSearch Client
+Non-blocking vector search and document access for the FastAPI routes
+"""
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from app.clients.aws_factory import get_credentials
+from app.clients.opensearch_client import (
+    OpenSearchClient,
+    opensearch_client,
+    parse_opensearch_endpoint,
+    build_knn_query,
+    hits_to_results,
+    search_cache_key,
+    msearch_batches,
+    msearch_outcome,
+    bulk_actions
+)
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.exceptions import OpenSearchError
+from app.core.tracing import traced
+
+logger = get_logger(__name__)
+
+try:
+    # AsyncOpenSearch needs aiohttp (optional); without it the sync client runs in threads
+    import aiohttp  # noqa: F401
+    from opensearchpy import AsyncOpenSearch, AsyncHttpConnection, AWSV4SignerAsyncAuth
+    from opensearchpy.helpers import async_bulk
+except ImportError:
+    AsyncOpenSearch = None
+
+
+class AsyncOpenSearchClient:
+    """
+    Async counterpart of OpenSearchClient (vector_search,
+    vector_search_many, get_document, index_document, bulk)
+
+    Requests go through AsyncOpenSearch over one pooled aiohttp session,
+    so a worker can have many searches in flight instead of blocking its
+    event loop on each. It shares the sync client's result cache, which
+    keeps invalidation consistent whichever client writes. In mock mode,
+    or when aiohttp is not installed, calls run on the sync client (in a
+    thread when they do I/O).
+    """
+
+    def __init__(self, sync_client: OpenSearchClient):
+        self.sync = sync_client
+        self.search_cache = sync_client.search_cache
+        self._client = None
+        self.native = (
+            not settings.USE_MOCK and
+            settings.OPENSEARCH_ASYNC_ENABLED and
+            AsyncOpenSearch is not None
+        )
+        if not settings.USE_MOCK and not self.native:
+            logger.info("AsyncOpenSearchClient running the sync client in threads (aiohttp not installed or disabled)")
+
+    def _get_client(self):
+        """
+        AsyncOpenSearch client, created on first use
+
+        Its aiohttp session binds to the running event loop, so it is
+        created inside it rather than at import time.
+        """
+        if self._client is None:
+            host, port, region = parse_opensearch_endpoint()
+            self._client = AsyncOpenSearch(
+                hosts=[{'host': host, 'port': port}],
+                # Signs every request with the shared session's (refreshable) credentials
+                http_auth=AWSV4SignerAsyncAuth(get_credentials(region), region, 'es'),
+                use_ssl=settings.OPENSEARCH_USE_SSL,
+                verify_certs=settings.OPENSEARCH_VERIFY_CERTS,
+                connection_class=AsyncHttpConnection,
+                maxsize=settings.AWS_MAX_POOL_CONNECTIONS,
+                timeout=settings.AWS_READ_TIMEOUT_SECONDS
+            )
+            logger.info(f"AsyncOpenSearchClient initialized for endpoint: {settings.OPENSEARCH_ENDPOINT}")
+        return self._client
+
+    @traced("vector_search")
+    async def vector_search(
+        self,
+        index_name: str,
+        query_vector: List[float],
+        top_k: int = 50,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Perform vector similarity search (see OpenSearchClient.vector_search)"""
+        if not self.native:
+            if settings.USE_MOCK:
+                return self.sync.vector_search(index_name, query_vector, top_k, filters)
+            return await asyncio.to_thread(self.sync.vector_search, index_name, query_vector, top_k, filters)
+
+        if not settings.VECTOR_SEARCH_CACHE_ENABLED:
+            return await self._vector_search_uncached(index_name, query_vector, top_k, filters)
+
+        cache_key = search_cache_key(query_vector, top_k, filters)
+        cached = self.search_cache.get(index_name, cache_key)
+        if cached is not None:
+            logger.info(f"Vector search cache hit for {index_name} (top_k={top_k})")
+            return cached
+
+        generation = self.search_cache.generation(index_name)
+        results = await self._vector_search_uncached(index_name, query_vector, top_k, filters)
+        self.search_cache.put(index_name, cache_key, results, generation=generation)
+        return results
+
+    async def _vector_search_uncached(
+        self,
+        index_name: str,
+        query_vector: List[float],
+        top_k: int,
+        filters: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        try:
+            response = await self._get_client().search(index=index_name, body=build_knn_query(query_vector, top_k, filters))
+            results = hits_to_results(response)
+            logger.info(f"Vector search returned {len(results)} results")
+            return results
+        except Exception as e:
+            logger.error(f"Error in vector search: {e}")
+            raise OpenSearchError(f"Vector search failed: {str(e)}")
+
+    @traced("vector_search")
+    async def vector_search_many(self, index_name: str, queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Several vector searches over _msearch (see OpenSearchClient.vector_search_many)
+
+        Batches are sent concurrently on the pooled session.
+        """
+        if not self.native:
+            if settings.USE_MOCK:
+                return self.sync.vector_search_many(index_name, queries)
+            return await asyncio.to_thread(self.sync.vector_search_many, index_name, queries)
+
+        outcomes, pending, generation = self.sync._cached_outcomes(index_name, queries)
+
+        async def run_batch(positions: List[int], body: str) -> None:
+            try:
+                items = (await self._get_client().msearch(body=body, index=index_name))["responses"]
+            except Exception as e:
+                logger.error(f"Error in multi-search batch of {len(positions)}: {e}")
+                items = [{"error": {"reason": f"Vector search failed: {str(e)}"}}] * len(positions)
+            for position, item in zip(positions, items):
+                outcomes[position] = msearch_outcome(item)
+
+        batches = msearch_batches(index_name, [(position, queries[position]) for position in pending])
+        await asyncio.gather(*(run_batch(positions, body) for positions, body in batches))
+        self.sync._cache_outcomes(index_name, queries, outcomes, pending, generation)
+        return outcomes
+
+    async def get_document(self, index_name: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Get a document by ID"""
+        if not self.native:
+            if settings.USE_MOCK:
+                return self.sync.get_document(index_name, doc_id)
+            return await asyncio.to_thread(self.sync.get_document, index_name, doc_id)
+
+        try:
+            response = await self._get_client().get(index=index_name, id=doc_id)
+            return response['_source']
+        except Exception as e:
+            logger.error(f"Error getting document {doc_id}: {e}")
+            return None
+
+    async def index_document(self, index_name: str, doc_id: str, document: Dict[str, Any]) -> bool:
+        """Index a document"""
+        if not self.native:
+            return await asyncio.to_thread(self.sync.index_document, index_name, doc_id, document)
+
+        self.sync.invalidate_index(index_name)
+        try:
+            target = await asyncio.to_thread(self.sync.write_target, index_name)
+            await self._get_client().index(index=target, id=doc_id, body=document)
+            # Bump again so searches that started during the write are not cached as fresh
+            self.sync.invalidate_index(index_name)
+            logger.info(f"Indexed document {doc_id} in {index_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Error indexing document: {e}")
+            raise OpenSearchError(f"Failed to index document: {str(e)}")
+
+    async def bulk(self, index_name: str, documents: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        """Index many documents (doc_id -> document); see OpenSearchClient.bulk"""
+        if not self.native:
+            return await asyncio.to_thread(self.sync.bulk, index_name, documents)
+
+        self.sync.invalidate_index(index_name)
+        try:
+            target = await asyncio.to_thread(self.sync.write_target, index_name)
+            indexed, errors = await async_bulk(
+                self._get_client(),
+                bulk_actions(target, documents),
+                chunk_size=settings.OPENSEARCH_BULK_CHUNK_SIZE,
+                raise_on_error=False
+            )
+            self.sync.invalidate_index(index_name)
+            for error in errors[:5]:
+                logger.warning(f"Bulk index error in {index_name}: {error}")
+            logger.info(f"Bulk indexed {indexed} documents in {index_name} ({len(errors)} failed)")
+            return {"indexed": indexed, "failed": len(errors)}
+        except Exception as e:
+            logger.error(f"Error in bulk indexing: {e}")
+            raise OpenSearchError(f"Bulk indexing failed: {str(e)}")
+
+    async def close(self) -> None:
+        """Close the aiohttp session (app shutdown)"""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+# Singleton instance
+async_opensearch_client = AsyncOpenSearchClient(opensearch_client)
@@ -0,0 +1,100 @@
+"""
+AWS Client Factory
+One boto3 session per region and one client per (service, region), shared
+by every client, repository and router in the process
+"""
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+from requests_aws4auth import AWS4Auth
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+_sessions: Dict[str, boto3.session.Session] = {}
+_clients: Dict[Tuple[str, str], Any] = {}
+_lock = threading.Lock()
+
+
+def _session_kwargs(region: str) -> Dict[str, str]:
+    """
+    Session arguments: explicit credentials from settings for local
+    development, otherwise boto3's default chain (IAM role in Lambda)
+    """
+    kwargs = {"region_name": region}
+    is_lambda = os.environ.get('AWS_LAMBDA_FUNCTION_NAME') is not None
+    if (not is_lambda and
+            settings.AWS_ACCESS_KEY_ID and settings.AWS_ACCESS_KEY_ID.strip() != "" and
+            settings.AWS_SECRET_ACCESS_KEY and settings.AWS_SECRET_ACCESS_KEY.strip() != ""):
+        kwargs["aws_access_key_id"] = settings.AWS_ACCESS_KEY_ID
+        kwargs["aws_secret_access_key"] = settings.AWS_SECRET_ACCESS_KEY
+    return kwargs
+
+
+def client_config() -> Config:
+    """Connection pool, keep-alive, timeouts and retries for every AWS client"""
+    return Config(
+        max_pool_connections=settings.AWS_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=settings.AWS_TCP_KEEPALIVE,
+        connect_timeout=settings.AWS_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=settings.AWS_READ_TIMEOUT_SECONDS,
+        retries={"mode": settings.AWS_RETRY_MODE, "total_max_attempts": settings.AWS_MAX_ATTEMPTS}
+    )
+
+
+def get_session(region: Optional[str] = None) -> boto3.session.Session:
+    """Shared session for region (settings.AWS_REGION by default)"""
+    region = region or settings.AWS_REGION
+    session = _sessions.get(region)
+    if session is None:
+        with _lock:
+            session = _sessions.get(region)
+            if session is None:
+                session = boto3.session.Session(**_session_kwargs(region))
+                _sessions[region] = session
+    return session
+
+
+def get_client(service: str, region: Optional[str] = None) -> Any:
+    """
+    Shared client for (service, region)
+
+    boto3 clients are thread-safe, so one client and its connection pool
+    serve all threads and, in Lambda, every warm invocation. Sessions are
+    not, which is why clients are only ever created under the lock.
+    """
+    region = region or settings.AWS_REGION
+    client = _clients.get((service, region))
+    if client is None:
+        session = get_session(region)
+        with _lock:
+            client = _clients.get((service, region))
+            if client is None:
+                client = session.client(service, config=client_config())
+                _clients[(service, region)] = client
+                logger.info(f"Created shared {service} client for {region}")
+    return client
+
+
+def get_credentials(region: Optional[str] = None):
+    """
+    Credentials of the shared session
+
+    For IAM roles these are botocore RefreshableCredentials: they are
+    refreshed on access, shortly before they expire, never up front.
+    """
+    return get_session(region).get_credentials()
+
+
+def aws4auth(service: str, region: Optional[str] = None) -> AWS4Auth:
+    """SigV4 request signer (requests) that picks up refreshed credentials on every request"""
+    region = region or settings.AWS_REGION
+    credentials = get_credentials(region)
+    if credentials is None:
+        raise ValueError("No AWS credentials found. Please set AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY in .env file or configure AWS credentials.")
+    return AWS4Auth(refreshable_credentials=credentials, region=region, service=service)
@@ -1,14 +1,15 @@
 """
 AWS Bedrock Client for Embeddings and LLM Reranking
 """
-import boto3
 import json
 from typing import List, Dict, Any
 from botocore.exceptions import ClientError
 
+from app.clients.aws_factory import get_client
 from app.core.config import settings
 from app.core.logging import get_logger
 from app.core.exceptions import EmbeddingError, RerankError
+from app.core.tracing import traced
 
 logger = get_logger(__name__)
 
@@ -21,42 +22,12 @@ class BedrockClient:
             self.client = None
             logger.info("BedrockClient initialized in MOCK mode")
         else:
-            # In Lambda, always use IAM role - don't pass credentials
-            # boto3 will automatically use the Lambda execution role
-            # Only use explicit credentials if we're NOT in Lambda environment
-            import os
-            
-            # Check if we're in Lambda (Lambda sets AWS_LAMBDA_FUNCTION_NAME)
-            is_lambda = os.environ.get('AWS_LAMBDA_FUNCTION_NAME') is not None
-            
-            if is_lambda:
-                # In Lambda: Use IAM role only - don't pass any credentials
-                self.client = boto3.client(
-                    'bedrock-runtime',
-                    region_name=settings.BEDROCK_REGION
-                )
-                logger.info(f"BedrockClient initialized using IAM role (Lambda) for region: {settings.BEDROCK_REGION}")
-            else:
-                # Local dev: Use explicit credentials if provided
-                client_kwargs = {
-                    'service_name': 'bedrock-runtime',
-                    'region_name': settings.BEDROCK_REGION
-                }
-                
-                # Only add credentials if explicitly provided (for local dev)
-                if (settings.AWS_ACCESS_KEY_ID and 
-                    settings.AWS_SECRET_ACCESS_KEY and 
-                    settings.AWS_ACCESS_KEY_ID.strip() != "" and 
-                    settings.AWS_SECRET_ACCESS_KEY.strip() != ""):
-                    client_kwargs['aws_access_key_id'] = settings.AWS_ACCESS_KEY_ID
-                    client_kwargs['aws_secret_access_key'] = settings.AWS_SECRET_ACCESS_KEY
-                    logger.info(f"BedrockClient initialized with explicit credentials for region: {settings.BEDROCK_REGION}")
-                else:
-                    # Use default credentials (from ~/.aws/credentials or environment)
-                    logger.info(f"BedrockClient initialized using default credentials for region: {settings.BEDROCK_REGION}")
-                
-                self.client = boto3.client(**client_kwargs)
+            # Shared pooled client: IAM role in Lambda, explicit credentials
+            # from settings (or the default chain) for local development
+            self.client = get_client('bedrock-runtime', settings.BEDROCK_REGION)
+            logger.info(f"BedrockClient initialized for region: {settings.BEDROCK_REGION}")
     
+    @traced("generate_embedding")
     def generate_embedding(self, text: str) -> List[float]:
         """
         Generate embedding for text using Bedrock
@@ -128,6 +99,7 @@ class BedrockClient:
             logger.error(f"Bedrock embedding error: {e}")
             raise EmbeddingError(f"Failed to generate embedding: {str(e)}")
     
+    @traced("rerank_candidates")
     def rerank_candidates(
         self,
         query: str,
@@ -0,0 +1,88 @@
+"""
+Mock Job Store
+Local persistence for the mock jobs_index: JSON snapshot + append-only JSONL log
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, List
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class MockJobStore:
+    """
+    Write-ahead log for jobs indexed in mock mode
+
+    Every indexed job is appended as one JSON line, so a write costs O(1)
+    no matter how many jobs exist. Once the log holds compact_every
+    entries it is folded into the snapshot (a JSON array, written to a
+    temporary file and swapped in) and truncated. Loading replays the log
+    over the snapshot; log entries replace snapshot jobs with the same
+    _id, so a crash between swapping the snapshot and truncating the log
+    does not duplicate jobs.
+    """
+
+    def __init__(self, snapshot_path: str, compact_every: int):
+        self.snapshot_path = snapshot_path
+        self.log_path = f"{os.path.splitext(snapshot_path)[0]}.wal.jsonl"
+        self.compact_every = compact_every
+        self.pending = 0  # log entries not yet folded into the snapshot
+        self._lock = threading.Lock()
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Jobs from the snapshot with the log replayed on top"""
+        jobs: List[Dict[str, Any]] = []
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+                if isinstance(snapshot, list):
+                    jobs = snapshot
+            except (OSError, json.JSONDecodeError) as e:
+                logger.error(f"MOCK: Failed to read job snapshot {self.snapshot_path}: {e}")
+
+        positions = {job.get('_id'): i for i, job in enumerate(jobs) if job.get('_id') is not None}
+        replayed = 0
+        if os.path.exists(self.log_path):
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        job = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn last line from an interrupted append
+                        logger.warning(f"MOCK: Skipping unreadable entry in {self.log_path}")
+                        continue
+                    replayed += 1
+                    position = positions.get(job.get('_id'))
+                    if position is None:
+                        positions[job.get('_id')] = len(jobs)
+                        jobs.append(job)
+                    else:
+                        jobs[position] = job
+
+        self.pending = replayed
+        if jobs:
+            logger.info(f"MOCK: Loaded {len(jobs)} jobs ({replayed} from the log)")
+        return jobs
+
+    def append(self, job: Dict[str, Any]) -> None:
+        """Append one indexed job to the log"""
+        line = json.dumps(job, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+            self.pending += 1
+
+    def compact(self, jobs: List[Dict[str, Any]]) -> None:
+        """Write jobs as the new snapshot and truncate the log"""
+        with self._lock:
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(jobs, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.snapshot_path)
+            open(self.log_path, 'w').close()
+            self.pending = 0
+        logger.info(f"MOCK: Compacted {len(jobs)} jobs into {self.snapshot_path}")
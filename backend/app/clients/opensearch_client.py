@@ -1,20 +1,152 @@
 """
 OpenSearch Client for Vector Search
 """
-from opensearchpy import OpenSearch, RequestsHttpConnection
-from typing import List, Dict, Any, Optional
+from opensearchpy import OpenSearch, RequestsHttpConnection, helpers
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import json
+import threading
+import time
 from datetime import datetime
-import boto3
-from requests_aws4auth import AWS4Auth
 
+from app.clients.aws_factory import aws4auth
+from app.clients.mock_job_store import MockJobStore
 from app.core.config import settings
 from app.core.logging import get_logger
 from app.core.exceptions import OpenSearchError
+from app.core.tracing import traced
+from app.core.cache import GenerationalLRUCache, quantized_vector_hash
 
 logger = get_logger(__name__)
 
 
+def parse_opensearch_endpoint() -> Tuple[str, int, str]:
+    """Host, port and signing region of settings.OPENSEARCH_ENDPOINT"""
+    # Parse endpoint URL properly
+    endpoint = settings.OPENSEARCH_ENDPOINT
+    # Remove protocol
+    host = endpoint.replace('https://', '').replace('http://', '')
+    # Remove port if included in URL
+    if ':' in host:
+        host, port_str = host.rsplit(':', 1)
+        try:
+            port = int(port_str)
+        except ValueError:
+            port = 443 if endpoint.startswith('https://') else 80
+    else:
+        port = 443 if endpoint.startswith('https://') else 80
+    
+    # Extract region from endpoint or use configured region
+    # OpenSearch endpoint format: search-xxx.REGION.es.amazonaws.com
+    if '.es.amazonaws.com' in host or '.aoss.amazonaws.com' in host:
+        # Extract region from hostname
+        parts = host.split('.')
+        if len(parts) >= 2:
+            # Find region in hostname (e.g., ap-southeast-2, us-east-1)
+            opensearch_region = settings.AWS_REGION  # Default
+            for part in parts:
+                if part.startswith('ap-') or part.startswith('us-') or part.startswith('eu-') or part.startswith('sa-') or part.startswith('ca-') or part.startswith('cn-'):
+                    opensearch_region = part
+                    break
+        else:
+            opensearch_region = settings.AWS_REGION
+    else:
+        opensearch_region = settings.AWS_REGION
+    return host, port, opensearch_region
+
+
+def build_knn_query(
+    query_vector: List[float],
+    top_k: int,
+    filters: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """kNN search body on the embeddings field, optionally filtered"""
+    knn = {
+        "knn": {
+            "embeddings": {
+                "vector": query_vector,
+                "k": top_k
+            }
+        }
+    }
+    return {
+        "size": top_k,
+        "query": {"bool": {"must": [knn], "filter": filters}} if filters else knn,
+        "_source": True
+    }
+
+
+def hits_to_results(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Search hits as their _source with _score and _id added"""
+    results = []
+    for hit in response['hits']['hits']:
+        result = hit['_source']
+        result['_score'] = hit['_score']
+        result['_id'] = hit['_id']
+        results.append(result)
+    return results
+
+
+def search_cache_key(query_vector: List[float], top_k: int, filters: Optional[Dict[str, Any]]) -> str:
+    return "|".join([
+        quantized_vector_hash(query_vector, settings.VECTOR_SEARCH_CACHE_PRECISION),
+        str(top_k),
+        json.dumps(filters, sort_keys=True) if filters else ""
+    ])
+
+
+def msearch_batches(
+    index_name: str,
+    queries: List[Tuple[int, Dict[str, Any]]]
+) -> Iterator[Tuple[List[int], str]]:
+    """
+    Split (position, query) pairs into _msearch NDJSON bodies
+    
+    A batch holds at most OPENSEARCH_MSEARCH_MAX_QUERIES queries and
+    OPENSEARCH_MSEARCH_MAX_BYTES of NDJSON (a single larger query is
+    sent on its own). Yields the positions in each batch with its body.
+    """
+    header = json.dumps({"index": index_name})
+    positions: List[int] = []
+    lines: List[str] = []
+    size = 0
+    for position, query in queries:
+        body = json.dumps(
+            build_knn_query(query["query_vector"], query.get("top_k", 50), query.get("filters")),
+            separators=(",", ":")
+        )
+        entry = f"{header}\n{body}\n"
+        entry_size = len(entry.encode("utf-8"))
+        if positions and (len(positions) >= settings.OPENSEARCH_MSEARCH_MAX_QUERIES or
+                          size + entry_size > settings.OPENSEARCH_MSEARCH_MAX_BYTES):
+            yield positions, "".join(lines)
+            positions, lines, size = [], [], 0
+        positions.append(position)
+        lines.append(entry)
+        size += entry_size
+    if positions:
+        yield positions, "".join(lines)
+
+
+def msearch_outcome(item: Dict[str, Any]) -> Dict[str, Any]:
+    """One _msearch response item as {results, error}"""
+    if "error" in item:
+        error = item["error"]
+        reason = error.get("reason", str(error)) if isinstance(error, dict) else str(error)
+        return {"results": [], "error": reason}
+    return {"results": hits_to_results(item), "error": None}
+
+
+def write_alias_name(index_name: str) -> str:
+    """Write alias of a managed index (see app/services/index_management_service.py)"""
+    return f"{index_name}{settings.OPENSEARCH_WRITE_ALIAS_SUFFIX}"
+
+
+def bulk_actions(index_name: str, documents: Dict[str, Dict[str, Any]]):
+    """helpers.bulk index actions for doc_id -> document"""
+    for doc_id, document in documents.items():
+        yield {"_op_type": "index", "_index": index_name, "_id": doc_id, "_source": document}
+
+
 class OpenSearchClient:
     """OpenSearch client for vector search operations"""
     
@@ -25,124 +157,123 @@ class OpenSearchClient:
     }
     
     def __init__(self):
+        # Result cache for vector_search; lives as long as the process (or warm Lambda container)
+        self.search_cache = GenerationalLRUCache(
+            max_bytes=settings.VECTOR_SEARCH_CACHE_MAX_BYTES,
+            ttl_seconds=settings.VECTOR_SEARCH_CACHE_TTL_SECONDS
+        )
+        
+        # index name -> (write target, resolved at)
+        self._write_targets: Dict[str, Tuple[str, float]] = {}
+        self._write_targets_lock = threading.Lock()
+        
         if settings.USE_MOCK:
             self.client = None
-            # Load jobs from S3 on initialization
-            self._load_jobs_from_s3()
+            # Indexed jobs survive restarts through a snapshot + write-ahead log
+            self.job_store = MockJobStore(settings.MOCK_JOB_STORE_PATH, settings.MOCK_JOB_STORE_COMPACT_EVERY)
+            self._load_mock_jobs()
             logger.info("OpenSearchClient initialized in MOCK mode")
         else:
-            # Parse endpoint URL properly
-            endpoint = settings.OPENSEARCH_ENDPOINT
-            # Remove protocol
-            host = endpoint.replace('https://', '').replace('http://', '')
-            # Remove port if included in URL
-            if ':' in host:
-                host, port_str = host.rsplit(':', 1)
-                try:
-                    port = int(port_str)
-                except ValueError:
-                    port = 443 if endpoint.startswith('https://') else 80
-            else:
-                port = 443 if endpoint.startswith('https://') else 80
+            host, port, opensearch_region = parse_opensearch_endpoint()
             
-            # Extract region from endpoint or use configured region
-            # OpenSearch endpoint format: search-xxx.REGION.es.amazonaws.com
-            if '.es.amazonaws.com' in host or '.aoss.amazonaws.com' in host:
-                # Extract region from hostname
-                parts = host.split('.')
-                if len(parts) >= 2:
-                    # Find region in hostname (e.g., ap-southeast-2, us-east-1)
-                    opensearch_region = settings.AWS_REGION  # Default
-                    for part in parts:
-                        if part.startswith('ap-') or part.startswith('us-') or part.startswith('eu-') or part.startswith('sa-') or part.startswith('ca-') or part.startswith('cn-'):
-                            opensearch_region = part
-                            break
-                else:
-                    opensearch_region = settings.AWS_REGION
-            else:
-                opensearch_region = settings.AWS_REGION
-            
-            # Use credentials from settings (loaded from .env) instead of default boto3 session
-            # This ensures we use the credentials specified in .env file
-            if settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY:
-                # Use credentials from settings (.env)
-                awsauth = AWS4Auth(
-                    settings.AWS_ACCESS_KEY_ID,
-                    settings.AWS_SECRET_ACCESS_KEY,
-                    opensearch_region,
-                    'es'
-                )
-            else:
-                # Fallback to default boto3 session (for Lambda/EC2 with IAM roles)
-                credentials = boto3.Session().get_credentials()
-                if credentials:
-                    awsauth = AWS4Auth(
-                        credentials.access_key,
-                        credentials.secret_key,
-                        opensearch_region,
-                        'es',
-                        session_token=credentials.token
-                    )
-                else:
-                    raise ValueError("No AWS credentials found. Please set AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY in .env file or configure AWS credentials.")
+            # SigV4 signing with the shared session's credentials (explicit ones
+            # from settings locally, the IAM role in Lambda), refreshed lazily
+            awsauth = aws4auth('es', opensearch_region)
             
             self.client = OpenSearch(
                 hosts=[{'host': host, 'port': port}],
                 http_auth=awsauth,
                 use_ssl=settings.OPENSEARCH_USE_SSL,
                 verify_certs=settings.OPENSEARCH_VERIFY_CERTS,
-                connection_class=RequestsHttpConnection
+                connection_class=RequestsHttpConnection,
+                pool_maxsize=settings.AWS_MAX_POOL_CONNECTIONS,
+                timeout=settings.AWS_READ_TIMEOUT_SECONDS
             )
             logger.info(f"OpenSearchClient initialized for endpoint: {settings.OPENSEARCH_ENDPOINT} (using IAM authentication)")
     
-    def _load_jobs_from_s3(self):
-        """Load jobs from S3 into mock storage"""
-        if not settings.USE_MOCK:
-            return
-        
+    def _load_mock_jobs(self):
+        """Load jobs into mock storage: the job store, else the jobs/ files via S3Client"""
         try:
-            from app.clients.s3_client import s3_client
-            jobs_data = s3_client.load_jobs_data()
+            jobs_data = self.job_store.load()
+            if not jobs_data:
+                from app.clients.s3_client import s3_client
+                jobs_data = s3_client.load_jobs_data()
+            OpenSearchClient._mock_data_storage["jobs_index"] = jobs_data
             if jobs_data:
-                OpenSearchClient._mock_data_storage["jobs_index"] = jobs_data
-                logger.info(f"Loaded {len(jobs_data)} jobs from S3 into mock storage")
+                logger.info(f"Loaded {len(jobs_data)} jobs into mock storage")
             else:
-                # Clear mock storage if no jobs found in S3
-                OpenSearchClient._mock_data_storage["jobs_index"] = []
-                logger.info("No jobs found in S3, cleared mock storage")
+                logger.info("No stored jobs found, mock storage is empty")
         except Exception as e:
-            logger.error(f"Failed to load jobs from S3: {e}")
+            logger.error(f"Failed to load jobs: {e}")
             # Clear mock storage on error
             OpenSearchClient._mock_data_storage["jobs_index"] = []
     
-    def _save_jobs_to_s3(self):
-        """Save jobs from mock storage to S3"""
-        if not settings.USE_MOCK:
-            return
+    def _persist_mock_job(self, job: Dict[str, Any]) -> None:
+        """Append an indexed job to the job store, compacting every MOCK_JOB_STORE_COMPACT_EVERY writes"""
+        try:
+            self.job_store.append(job)
+            if self.job_store.pending >= self.job_store.compact_every:
+                self.compact_mock_jobs()
+        except Exception as e:
+            logger.error(f"Failed to persist job: {e}")
+    
+    def compact_mock_jobs(self) -> None:
+        """Fold the job store's log into its snapshot (mock mode only)"""
+        if settings.USE_MOCK:
+            self.job_store.compact(OpenSearchClient._mock_data_storage.get("jobs_index", []))
+    
+    def invalidate_index(self, index_name: str) -> None:
+        """Invalidate cached search results for an index after a write"""
+        generation = self.search_cache.bump(index_name)
+        logger.debug(f"Search cache generation for {index_name} is now {generation}")
+    
+    def write_target(self, index_name: str) -> str:
+        """
+        Where writes to index_name go: its write alias when the index is
+        managed with versioned indices, else index_name itself
         
+        Resolved at most every OPENSEARCH_ALIAS_CACHE_SECONDS, which is how
+        long the reindex tool waits after moving a write alias before it
+        starts copying, so no process is still writing to the old index.
+        """
+        if settings.USE_MOCK:
+            return index_name
+        cached = self._write_targets.get(index_name)
+        if cached and time.monotonic() - cached[1] < settings.OPENSEARCH_ALIAS_CACHE_SECONDS:
+            return cached[0]
+        alias = write_alias_name(index_name)
         try:
-            from app.clients.s3_client import s3_client
-            jobs_data = OpenSearchClient._mock_data_storage.get("jobs_index", [])
-            if jobs_data:
-                s3_client.save_jobs_data(jobs_data)
+            target = alias if self.client.indices.exists_alias(name=alias) else index_name
         except Exception as e:
-            logger.error(f"Failed to save jobs to S3: {e}")
+            logger.warning(f"Could not resolve write alias {alias}: {e}")
+            target = cached[0] if cached else index_name
+        with self._write_targets_lock:
+            self._write_targets[index_name] = (target, time.monotonic())
+        return target
     
     def create_index_if_not_exists(self, index_name: str, mapping: Dict[str, Any]) -> bool:
-        """Create index if it doesn't exist"""
+        """
+        Create index if it doesn't exist
+        
+        New indices are created versioned ({index_name}_v1) behind a read
+        alias (index_name) and a write alias, so later mapping changes can
+        be rolled out with the reindex tool without downtime.
+        """
+        self.invalidate_index(index_name)
         if settings.USE_MOCK:
             if index_name not in OpenSearchClient._mock_data_storage:
                 OpenSearchClient._mock_data_storage[index_name] = []
             logger.info(f"MOCK: Created/verified index {index_name}")
-            # Save to S3 after creating index (for jobs only)
-            if index_name == "jobs_index":
-                self._save_jobs_to_s3()
             return True
         
         try:
             if not self.client.indices.exists(index=index_name):
-                self.client.indices.create(index=index_name, body=mapping)
-                logger.info(f"Created index: {index_name}")
+                versioned = f"{index_name}_v1"
+                self.client.indices.create(index=versioned, body={
+                    **mapping,
+                    "aliases": {index_name: {}, write_alias_name(index_name): {}}
+                })
+                logger.info(f"Created index: {versioned} (aliases {index_name}, {write_alias_name(index_name)})")
             else:
                 logger.info(f"Index {index_name} already exists")
             return True
@@ -151,7 +282,8 @@ class OpenSearchClient:
             raise OpenSearchError(f"Failed to create index: {str(e)}")
     
     def index_document(self, index_name: str, doc_id: str, document: Dict[str, Any]) -> bool:
-        """Index a document"""
+        """Index a document (returns once it is searchable)"""
+        self.invalidate_index(index_name)
         if settings.USE_MOCK:
             # Make a copy to avoid modifying the original
             doc_copy = document.copy()
@@ -160,19 +292,63 @@ class OpenSearchClient:
                 OpenSearchClient._mock_data_storage[index_name] = []
             OpenSearchClient._mock_data_storage[index_name].append(doc_copy)
             logger.info(f"MOCK: Indexed document {doc_id} in {index_name} (total: {len(OpenSearchClient._mock_data_storage[index_name])})")
-            # Save to S3 after indexing (for jobs only)
+            # Persist jobs (one log append, not a rewrite of every job)
             if index_name == "jobs_index":
-                self._save_jobs_to_s3()
+                self._persist_mock_job(doc_copy)
             return True
         
         try:
-            self.client.index(index=index_name, id=doc_id, body=document)
+            # wait_for returns once the document is searchable, so the bump
+            # below also drops results cached by searches that ran before the
+            # next refresh and never saw the write
+            self.client.index(
+                index=self.write_target(index_name), id=doc_id, body=document, refresh="wait_for"
+            )
+            self.invalidate_index(index_name)
             logger.info(f"Indexed document {doc_id} in {index_name}")
             return True
         except Exception as e:
             logger.error(f"Error indexing document: {e}")
             raise OpenSearchError(f"Failed to index document: {str(e)}")
     
+    def bulk(self, index_name: str, documents: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Index many documents (doc_id -> document) in OPENSEARCH_BULK_CHUNK_SIZE batches
+        
+        Returns:
+            dict with keys: indexed, failed
+        """
+        self.invalidate_index(index_name)
+        if settings.USE_MOCK:
+            storage = OpenSearchClient._mock_data_storage.setdefault(index_name, [])
+            for doc_id, document in documents.items():
+                doc_copy = document.copy()
+                doc_copy['_id'] = doc_id
+                storage.append(doc_copy)
+                if index_name == "jobs_index":
+                    self._persist_mock_job(doc_copy)
+            logger.info(f"MOCK: Bulk indexed {len(documents)} documents in {index_name} (total: {len(storage)})")
+            return {"indexed": len(documents), "failed": 0}
+        
+        try:
+            indexed, errors = helpers.bulk(
+                self.client,
+                bulk_actions(self.write_target(index_name), documents),
+                chunk_size=settings.OPENSEARCH_BULK_CHUNK_SIZE,
+                raise_on_error=False,
+                refresh="wait_for"
+            )
+            # Documents are searchable now (see index_document)
+            self.invalidate_index(index_name)
+            for error in errors[:5]:
+                logger.warning(f"Bulk index error in {index_name}: {error}")
+            logger.info(f"Bulk indexed {indexed} documents in {index_name} ({len(errors)} failed)")
+            return {"indexed": indexed, "failed": len(errors)}
+        except Exception as e:
+            logger.error(f"Error in bulk indexing: {e}")
+            raise OpenSearchError(f"Bulk indexing failed: {str(e)}")
+    
+    @traced("vector_search")
     def vector_search(
         self,
         index_name: str,
@@ -192,6 +368,28 @@ class OpenSearchClient:
         Returns:
             List of search results with scores
         """
+        if not settings.VECTOR_SEARCH_CACHE_ENABLED:
+            return self._vector_search_uncached(index_name, query_vector, top_k, filters)
+        
+        cache_key = search_cache_key(query_vector, top_k, filters)
+        cached = self.search_cache.get(index_name, cache_key)
+        if cached is not None:
+            logger.info(f"Vector search cache hit for {index_name} (top_k={top_k})")
+            return cached
+        
+        generation = self.search_cache.generation(index_name)
+        results = self._vector_search_uncached(index_name, query_vector, top_k, filters)
+        self.search_cache.put(index_name, cache_key, results, generation=generation)
+        return results
+    
+    def _vector_search_uncached(
+        self,
+        index_name: str,
+        query_vector: List[float],
+        top_k: int,
+        filters: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Run the vector search against OpenSearch (or mock storage)"""
         if settings.USE_MOCK:
             # Mock vector search - return mock results
             logger.info(f"MOCK: Vector search in {index_name} (top_k={top_k}, available: {len(self._mock_data_storage.get(index_name, []))})")
@@ -206,40 +404,8 @@ class OpenSearchClient:
             return results_copy
         
         try:
-            query = {
-                "size": top_k,
-                "query": {
-                    "knn": {
-                        "embeddings": {
-                            "vector": query_vector,
-                            "k": top_k
-                        }
-                    }
-                },
-                "_source": True
-            }
-            
-            if filters:
-                query["query"]["bool"] = {
-                    "must": [
-                        {"knn": {
-                            "embeddings": {
-                                "vector": query_vector,
-                                "k": top_k
-                            }
-                        }}
-                    ],
-                    "filter": filters
-                }
-            
-            response = self.client.search(index=index_name, body=query)
-            
-            results = []
-            for hit in response['hits']['hits']:
-                result = hit['_source']
-                result['_score'] = hit['_score']
-                result['_id'] = hit['_id']
-                results.append(result)
+            response = self.client.search(index=index_name, body=build_knn_query(query_vector, top_k, filters))
+            results = hits_to_results(response)
             
             logger.info(f"Vector search returned {len(results)} results")
             return results
@@ -248,6 +414,89 @@ class OpenSearchClient:
             logger.error(f"Error in vector search: {e}")
             raise OpenSearchError(f"Vector search failed: {str(e)}")
     
+    @traced("vector_search")
+    def vector_search_many(self, index_name: str, queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run several vector searches in as few round trips as possible
+        
+        Cached queries are answered from the result cache; the rest go to
+        OpenSearch as _msearch batches (see msearch_batches). A failed
+        query, or a failed batch, does not fail the others.
+        
+        Args:
+            index_name: Name of the index to search
+            queries: dicts with vector_search's arguments: query_vector,
+                top_k (default 50) and filters (optional)
+            
+        Returns:
+            One dict per query, in order, with keys: results (as returned by
+            vector_search) and error (None, or why that query failed)
+        """
+        outcomes, pending, generation = self._cached_outcomes(index_name, queries)
+        
+        if settings.USE_MOCK:
+            for position in pending:
+                query = queries[position]
+                outcomes[position] = {
+                    "results": self._vector_search_uncached(index_name, query["query_vector"], query.get("top_k", 50), query.get("filters")),
+                    "error": None
+                }
+        else:
+            for positions, body in msearch_batches(index_name, [(position, queries[position]) for position in pending]):
+                try:
+                    items = self.client.msearch(body=body, index=index_name)["responses"]
+                except Exception as e:
+                    logger.error(f"Error in multi-search batch of {len(positions)}: {e}")
+                    items = [{"error": {"reason": f"Vector search failed: {str(e)}"}}] * len(positions)
+                for position, item in zip(positions, items):
+                    outcomes[position] = msearch_outcome(item)
+        
+        self._cache_outcomes(index_name, queries, outcomes, pending, generation)
+        return outcomes
+    
+    def _cached_outcomes(
+        self,
+        index_name: str,
+        queries: List[Dict[str, Any]]
+    ) -> Tuple[List[Optional[Dict[str, Any]]], List[int], int]:
+        """Outcomes served from the cache, positions still to search, and the cache generation"""
+        outcomes: List[Optional[Dict[str, Any]]] = [None] * len(queries)
+        generation = self.search_cache.generation(index_name)
+        pending = []
+        for position, query in enumerate(queries):
+            cached = None
+            if settings.VECTOR_SEARCH_CACHE_ENABLED:
+                cached = self.search_cache.get(
+                    index_name, search_cache_key(query["query_vector"], query.get("top_k", 50), query.get("filters"))
+                )
+            if cached is not None:
+                outcomes[position] = {"results": cached, "error": None}
+            else:
+                pending.append(position)
+        if len(pending) < len(queries):
+            logger.info(f"Vector search cache hits for {len(queries) - len(pending)} of {len(queries)} queries in {index_name}")
+        return outcomes, pending, generation
+    
+    def _cache_outcomes(
+        self,
+        index_name: str,
+        queries: List[Dict[str, Any]],
+        outcomes: List[Dict[str, Any]],
+        pending: List[int],
+        generation: int
+    ) -> None:
+        if not settings.VECTOR_SEARCH_CACHE_ENABLED:
+            return
+        for position in pending:
+            if outcomes[position]["error"] is None:
+                query = queries[position]
+                self.search_cache.put(
+                    index_name,
+                    search_cache_key(query["query_vector"], query.get("top_k", 50), query.get("filters")),
+                    outcomes[position]["results"],
+                    generation=generation
+                )
+    
     def get_document(self, index_name: str, doc_id: str) -> Optional[Dict[str, Any]]:
         """Get a document by ID"""
         if settings.USE_MOCK:
@@ -0,0 +1,255 @@
+"""
+Queue Client for background work
+SQS in production, SQLite or in-memory queues for local development
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Dict, List
+
+from botocore.exceptions import ClientError
+
+from app.clients.aws_factory import get_client
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class QueueMessage:
+    """A received message; pass it back to delete() or release()"""
+
+    def __init__(self, body: Dict[str, Any], receipt: str, receive_count: int):
+        self.body = body
+        self.receipt = receipt
+        self.receive_count = receive_count
+
+
+class InMemoryQueue:
+    """
+    Process-local queue with SQS-like semantics
+
+    Received messages stay invisible until deleted or until the visibility
+    timeout runs out, after which they are delivered again.
+    """
+
+    def __init__(self, visibility_timeout: int):
+        self.visibility_timeout = visibility_timeout
+        self._ready: "deque[tuple]" = deque()  # (visible_at, message_id, body, receive_count)
+        self._in_flight: Dict[str, tuple] = {}  # receipt -> (deadline, message_id, body, receive_count)
+        self._condition = threading.Condition()
+
+    def send(self, body: Dict[str, Any], delay_seconds: int = 0) -> str:
+        message_id = str(uuid.uuid4())
+        with self._condition:
+            self._ready.append((time.time() + delay_seconds, message_id, body, 0))
+            self._condition.notify()
+        return message_id
+
+    def receive(self, max_messages: int = 1, wait_seconds: int = 0) -> List[QueueMessage]:
+        deadline = time.time() + wait_seconds
+        with self._condition:
+            while True:
+                self._requeue_expired()
+                now = time.time()
+                messages = []
+                for entry in list(self._ready):
+                    if len(messages) >= max_messages:
+                        break
+                    visible_at, message_id, body, receive_count = entry
+                    if visible_at > now:
+                        continue
+                    self._ready.remove(entry)
+                    receipt = str(uuid.uuid4())
+                    self._in_flight[receipt] = (now + self.visibility_timeout, message_id, body, receive_count + 1)
+                    messages.append(QueueMessage(body, receipt, receive_count + 1))
+                if messages or now >= deadline:
+                    return messages
+                self._condition.wait(timeout=min(1.0, deadline - now))
+
+    def delete(self, message: QueueMessage) -> None:
+        with self._condition:
+            self._in_flight.pop(message.receipt, None)
+
+    def release(self, message: QueueMessage, delay_seconds: int = 0) -> None:
+        with self._condition:
+            entry = self._in_flight.pop(message.receipt, None)
+            if entry:
+                _, message_id, body, receive_count = entry
+                self._ready.append((time.time() + delay_seconds, message_id, body, receive_count))
+                self._condition.notify()
+
+    def _requeue_expired(self) -> None:
+        now = time.time()
+        for receipt, (deadline, message_id, body, receive_count) in list(self._in_flight.items()):
+            if deadline <= now:
+                del self._in_flight[receipt]
+                self._ready.append((now, message_id, body, receive_count))
+
+
+class SQLiteQueue:
+    """
+    Durable local queue backed by a SQLite file
+
+    Survives restarts and can be shared by several local worker processes.
+    """
+
+    def __init__(self, path: str, visibility_timeout: int):
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                " id TEXT PRIMARY KEY,"
+                " body TEXT NOT NULL,"
+                " visible_at REAL NOT NULL,"
+                " receive_count INTEGER NOT NULL DEFAULT 0,"
+                " receipt TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS messages_visible_at ON messages (visible_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def send(self, body: Dict[str, Any], delay_seconds: int = 0) -> str:
+        message_id = str(uuid.uuid4())
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO messages (id, body, visible_at) VALUES (?, ?, ?)",
+                (message_id, json.dumps(body, ensure_ascii=False), time.time() + delay_seconds)
+            )
+        return message_id
+
+    def receive(self, max_messages: int = 1, wait_seconds: int = 0) -> List[QueueMessage]:
+        deadline = time.time() + wait_seconds
+        while True:
+            messages = self._claim(max_messages)
+            if messages or time.time() >= deadline:
+                return messages
+            time.sleep(min(0.5, max(0.0, deadline - time.time())))
+
+    def _claim(self, max_messages: int) -> List[QueueMessage]:
+        now = time.time()
+        conn = self._connect()
+        try:
+            # IMMEDIATE takes the write lock up front so two workers never claim the same row
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT id, body, receive_count FROM messages WHERE visible_at <= ? ORDER BY visible_at LIMIT ?",
+                (now, max_messages)
+            ).fetchall()
+            messages = []
+            for message_id, body, receive_count in rows:
+                receipt = f"{message_id}:{uuid.uuid4()}"
+                conn.execute(
+                    "UPDATE messages SET visible_at = ?, receive_count = ?, receipt = ? WHERE id = ?",
+                    (now + self.visibility_timeout, receive_count + 1, receipt, message_id)
+                )
+                messages.append(QueueMessage(json.loads(body), receipt, receive_count + 1))
+            conn.execute("COMMIT")
+            return messages
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def delete(self, message: QueueMessage) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM messages WHERE receipt = ?", (message.receipt,))
+
+    def release(self, message: QueueMessage, delay_seconds: int = 0) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE messages SET visible_at = ?, receipt = NULL WHERE receipt = ?",
+                (time.time() + delay_seconds, message.receipt)
+            )
+
+
+class SQSQueue:
+    """Amazon SQS queue (standard queue; messages are JSON bodies)"""
+
+    # SQS caps long polling at 20s, batches at 10 and delays at 15 minutes
+    MAX_WAIT_SECONDS = 20
+    MAX_BATCH = 10
+    MAX_DELAY_SECONDS = 900
+
+    def __init__(self, queue_url: str, visibility_timeout: int):
+        self.queue_url = queue_url
+        self.visibility_timeout = visibility_timeout
+        self.client = get_client('sqs')
+
+    def send(self, body: Dict[str, Any], delay_seconds: int = 0) -> str:
+        response = self.client.send_message(
+            QueueUrl=self.queue_url,
+            MessageBody=json.dumps(body, ensure_ascii=False),
+            DelaySeconds=min(int(delay_seconds), self.MAX_DELAY_SECONDS)
+        )
+        return response["MessageId"]
+
+    def receive(self, max_messages: int = 1, wait_seconds: int = 0) -> List[QueueMessage]:
+        response = self.client.receive_message(
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=min(max_messages, self.MAX_BATCH),
+            WaitTimeSeconds=min(wait_seconds, self.MAX_WAIT_SECONDS),
+            VisibilityTimeout=self.visibility_timeout,
+            AttributeNames=["ApproximateReceiveCount"]
+        )
+        return [
+            QueueMessage(
+                json.loads(m["Body"]),
+                m["ReceiptHandle"],
+                int(m.get("Attributes", {}).get("ApproximateReceiveCount", 1))
+            )
+            for m in response.get("Messages", [])
+        ]
+
+    def delete(self, message: QueueMessage) -> None:
+        self.client.delete_message(QueueUrl=self.queue_url, ReceiptHandle=message.receipt)
+
+    def release(self, message: QueueMessage, delay_seconds: int = 0) -> None:
+        try:
+            self.client.change_message_visibility(
+                QueueUrl=self.queue_url,
+                ReceiptHandle=message.receipt,
+                VisibilityTimeout=min(int(delay_seconds), 43200)
+            )
+        except ClientError as e:
+            # The message becomes visible again on its own when the timeout runs out
+            logger.warning(f"Could not release SQS message: {e}")
+
+
+def queue_backend() -> str:
+    """Configured queue backend, resolving 'auto' to sqs when a queue URL is set"""
+    backend = settings.INGESTION_QUEUE_BACKEND.lower()
+    if backend == "auto":
+        backend = "sqs" if settings.INGESTION_QUEUE_URL else "sqlite"
+    return backend
+
+
+_queue_instance = None
+_queue_lock = threading.Lock()
+
+
+def get_queue_client():
+    """Get or create the ingestion queue (lazy initialization)"""
+    global _queue_instance
+    if _queue_instance is None:
+        with _queue_lock:
+            if _queue_instance is None:
+                backend = queue_backend()
+                visibility_timeout = settings.INGESTION_VISIBILITY_TIMEOUT_SECONDS
+                if backend == "sqs":
+                    _queue_instance = SQSQueue(settings.INGESTION_QUEUE_URL, visibility_timeout)
+                elif backend == "sqlite":
+                    _queue_instance = SQLiteQueue(os.path.abspath(settings.INGESTION_SQLITE_PATH), visibility_timeout)
+                else:
+                    _queue_instance = InMemoryQueue(visibility_timeout)
+                logger.info(f"Ingestion queue initialized ({backend})")
+    return _queue_instance
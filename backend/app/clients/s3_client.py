@@ -1,60 +1,60 @@
 """
 S3 Client for file storage
 """
-import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
-from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterator, List, BinaryIO, Tuple
 import uuid
 import json
 from datetime import datetime
 import os
 
+from app.clients.storage_backends import backend_name, get_storage_backend
+from app.core import codecs
 from app.core.config import settings
 from app.core.logging import get_logger
 from app.core.exceptions import FileProcessingError
+from app.core.tracing import traced
 
 logger = get_logger(__name__)
 
 
 class S3Client:
-    """S3 client for uploading and retrieving files"""
+    """
+    S3 client for uploading and retrieving files
+    
+    Objects go through the storage backend chosen by settings.STORAGE_BACKEND:
+    S3 itself, or a local directory / in-memory store with the same API,
+    so mock mode runs exactly the code paths used against S3.
+    """
+    
+    # Bumped on every resume index write so in-process readers (the resume
+    # catalog) see their own uploads without waiting for a refresh
+    resume_index_generation = 0
     
     def __init__(self):
-        if settings.USE_MOCK:
-            self.client = None
-            logger.info("S3Client initialized in MOCK mode")
-        else:
-            # Use IAM role credentials if no explicit credentials provided
-            # This allows Lambda to use its IAM role automatically
-            client_kwargs = {
-                'service_name': 's3',
-                'region_name': settings.AWS_REGION
-            }
-            
-            # In Lambda, always use IAM role (don't pass credentials)
-            # Only use explicit credentials for local development
-            is_lambda = os.environ.get('AWS_LAMBDA_FUNCTION_NAME') is not None
-            
-            if is_lambda:
-                # Lambda environment - use IAM role, don't pass credentials
-                logger.info(f"S3Client initialized using IAM role for bucket: {settings.S3_BUCKET_NAME} (Lambda environment)")
-            else:
-                # Local development - only add credentials if explicitly provided
-                # Check for both None and empty string
-                if (settings.AWS_ACCESS_KEY_ID and 
-                    settings.AWS_SECRET_ACCESS_KEY and 
-                    settings.AWS_ACCESS_KEY_ID.strip() != "" and 
-                    settings.AWS_SECRET_ACCESS_KEY.strip() != ""):
-                    client_kwargs['aws_access_key_id'] = settings.AWS_ACCESS_KEY_ID
-                    client_kwargs['aws_secret_access_key'] = settings.AWS_SECRET_ACCESS_KEY
-                    logger.info(f"S3Client initialized with explicit credentials for bucket: {settings.S3_BUCKET_NAME}")
-                else:
-                    # Use default credentials (from ~/.aws/credentials or environment)
-                    logger.info(f"S3Client initialized using default credentials for bucket: {settings.S3_BUCKET_NAME}")
-            
-            self.client = boto3.client(**client_kwargs)
+        # Shared pooled S3 client (IAM role in Lambda, explicit credentials
+        # from settings for local development) or an offline backend
+        self.client = get_storage_backend()
+        logger.info(f"S3Client initialized for bucket: {settings.S3_BUCKET_NAME} ({backend_name()} storage)")
+        
+        # Multipart settings for streamed uploads (s3transfer)
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD_MB * 1024 * 1024,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNK_MB * 1024 * 1024,
+            max_concurrency=settings.S3_UPLOAD_CONCURRENCY,
+            use_threads=True
+        )
     
-    def upload_file(self, file_content: bytes, file_name: str, content_type: str = "application/octet-stream") -> dict:
+    @traced("s3_upload")
+    def upload_file(
+        self,
+        file_content: bytes,
+        file_name: str,
+        content_type: str = "application/octet-stream",
+        extra_metadata: Optional[Dict[str, str]] = None
+    ) -> dict:
         """
         Upload file to S3
         
@@ -62,29 +62,16 @@ class S3Client:
         All resumes stored in Candidate folder with original filename
         
         Returns:
-            dict with keys: file_id, s3_url, s3_key
+            dict with keys: file_id, s3_url, s3_key, bucket, etag
         """
-        if settings.USE_MOCK:
-            # Mock response
-            file_id = str(uuid.uuid4())
-            # Structure: resumes/Candidate/{original_filename}
-            s3_key = f"{settings.S3_PREFIX}Candidate/{file_name}"
-            s3_url = f"s3://{settings.S3_BUCKET_NAME}/{s3_key}"
-            logger.info(f"MOCK: Uploaded file {file_name} to {s3_url}")
-            return {
-                "file_id": file_id,
-                "s3_url": s3_url,
-                "s3_key": s3_key,
-                "bucket": settings.S3_BUCKET_NAME
-            }
-        
         try:
             file_id = str(uuid.uuid4())
             # Structure: resumes/Candidate/{original_filename}
             # Use original filename, all resumes in Candidate folder
             s3_key = f"{settings.S3_PREFIX}Candidate/{file_name}"
+            previous_id = self._stored_resume_id(s3_key)
             
-            self.client.put_object(
+            put_response = self.client.put_object(
                 Bucket=settings.S3_BUCKET_NAME,
                 Key=s3_key,
                 Body=file_content,
@@ -92,29 +79,90 @@ class S3Client:
                 Metadata={
                     "uploaded_at": datetime.utcnow().isoformat(),
                     "original_filename": file_name,
-                    "resume_id": file_id
+                    "resume_id": file_id,
+                    **(extra_metadata or {})
                 }
             )
             
             s3_url = f"s3://{settings.S3_BUCKET_NAME}/{s3_key}"
+            etag = put_response.get("ETag", "").strip('"')
+            self.index_resume(file_id, s3_key, len(file_content), etag, file_name, extra_metadata)
+            self._supersede(previous_id, file_id)
             logger.info(f"Uploaded file {file_name} to {s3_url} (resume_id: {file_id})")
             
             return {
                 "file_id": file_id,
                 "s3_url": s3_url,
                 "s3_key": s3_key,
-                "bucket": settings.S3_BUCKET_NAME
+                "bucket": settings.S3_BUCKET_NAME,
+                "etag": etag
             }
         except ClientError as e:
             logger.error(f"S3 upload error: {e}")
             raise FileProcessingError(f"Failed to upload file to S3: {str(e)}")
     
+    @traced("s3_upload")
+    def upload_fileobj(
+        self,
+        fileobj: BinaryIO,
+        file_name: str,
+        content_type: str = "application/octet-stream",
+        extra_metadata: Optional[Dict[str, str]] = None
+    ) -> dict:
+        """
+        Stream a file object to S3 without reading it into memory
+        
+        Large files go up as a concurrent multipart upload in
+        S3_MULTIPART_CHUNK_MB parts, so memory use is bounded by
+        chunk size x concurrency rather than by file size. Same key
+        layout and return value as upload_file. The ETag is read back with
+        a HEAD; a multipart ETag is not a content hash, but it still
+        changes whenever the object does.
+        """
+        file_id = str(uuid.uuid4())
+        # Structure: resumes/Candidate/{original_filename}
+        s3_key = f"{settings.S3_PREFIX}Candidate/{file_name}"
+        s3_url = f"s3://{settings.S3_BUCKET_NAME}/{s3_key}"
+        
+        try:
+            previous_id = self._stored_resume_id(s3_key)
+            size = fileobj.seek(0, os.SEEK_END)
+            fileobj.seek(0)
+            self.client.upload_fileobj(
+                fileobj,
+                settings.S3_BUCKET_NAME,
+                s3_key,
+                ExtraArgs={
+                    "ContentType": content_type,
+                    "Metadata": {
+                        "uploaded_at": datetime.utcnow().isoformat(),
+                        "original_filename": file_name,
+                        "resume_id": file_id,
+                        **(extra_metadata or {})
+                    }
+                },
+                Config=self.transfer_config
+            )
+            head = self.head_file(s3_key)
+            etag = head.get("ETag", "").strip('"') if head else ""
+            self.index_resume(file_id, s3_key, size, etag, file_name, extra_metadata)
+            self._supersede(previous_id, file_id)
+            logger.info(f"Streamed file {file_name} to {s3_url} (resume_id: {file_id})")
+            
+            return {
+                "file_id": file_id,
+                "s3_url": s3_url,
+                "s3_key": s3_key,
+                "bucket": settings.S3_BUCKET_NAME,
+                "etag": etag
+            }
+        except ClientError as e:
+            logger.error(f"S3 streaming upload error: {e}")
+            raise FileProcessingError(f"Failed to upload file to S3: {str(e)}")
+    
+    @traced("s3_get")
     def get_file(self, s3_key: str) -> Optional[bytes]:
         """Retrieve file from S3"""
-        if settings.USE_MOCK:
-            logger.info(f"MOCK: Retrieved file from {s3_key}")
-            return b"mock file content"
-        
         try:
             response = self.client.get_object(
                 Bucket=settings.S3_BUCKET_NAME,
@@ -125,12 +173,19 @@ class S3Client:
             logger.error(f"S3 get error: {e}")
             return None
     
+    @traced("s3_head")
+    def head_file(self, s3_key: str) -> Optional[Dict[str, Any]]:
+        """HEAD a stored file (ETag, ContentLength, Metadata), or None if it does not exist"""
+        try:
+            return self.client.head_object(Bucket=settings.S3_BUCKET_NAME, Key=s3_key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey"):
+                logger.error(f"S3 head error: {e}")
+            return None
+    
+    @traced("s3_delete")
     def delete_file(self, s3_key: str) -> bool:
         """Delete file from S3"""
-        if settings.USE_MOCK:
-            logger.info(f"MOCK: Deleted file {s3_key}")
-            return True
-        
         try:
             self.client.delete_object(
                 Bucket=settings.S3_BUCKET_NAME,
@@ -142,39 +197,245 @@ class S3Client:
             logger.error(f"S3 delete error: {e}")
             return False
     
-    def save_jobs_data(self, jobs_data: List[Dict[str, Any]]) -> bool:
-        """Save jobs data to S3 (for mock mode persistence)"""
-        s3_key = f"{settings.S3_PREFIX}jobs_data.json"
-        
-        if settings.USE_MOCK:
-            # In mock mode, save to local file
-            local_file = "jobs_data.json"
-            try:
-                with open(local_file, 'w', encoding='utf-8') as f:
-                    json.dump(jobs_data, f, ensure_ascii=False, indent=2)
-                logger.info(f"MOCK: Saved {len(jobs_data)} jobs to {local_file}")
-                return True
-            except Exception as e:
-                logger.error(f"MOCK: Failed to save jobs data: {e}")
-                return False
-        
+    def list_objects(self, prefix: str) -> Iterator[Dict[str, Any]]:
+        """Yield Key, Size, ETag and LastModified of every object under prefix (all pages)"""
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=settings.S3_BUCKET_NAME, Prefix=prefix):
+            yield from page.get('Contents', [])
+    
+    @traced("s3_put")
+    def _put_encoded(
+        self,
+        s3_key: str,
+        body: bytes,
+        codec: str,
+        content_type: str,
+        metadata: Optional[Dict[str, str]] = None
+    ) -> bool:
+        """Store an encoded body with its codec recorded in the object metadata"""
+        extra_args = {}
+        encoding = codecs.content_encoding(codec)
+        if encoding:
+            extra_args['ContentEncoding'] = encoding
         try:
-            data_json = json.dumps(jobs_data, ensure_ascii=False, indent=2).encode('utf-8')
             self.client.put_object(
                 Bucket=settings.S3_BUCKET_NAME,
                 Key=s3_key,
-                Body=data_json,
-                ContentType='application/json',
-                Metadata={
-                    "saved_at": datetime.utcnow().isoformat(),
-                    "total_jobs": str(len(jobs_data))
-                }
+                Body=body,
+                ContentType=content_type,
+                Metadata={**(metadata or {}), codecs.CODEC_METADATA_KEY: codec},
+                **extra_args
             )
-            logger.info(f"Saved {len(jobs_data)} jobs to S3: {s3_key}")
             return True
         except ClientError as e:
-            logger.error(f"S3 save jobs error: {e}")
+            logger.error(f"S3 put error for {s3_key}: {e}")
+            return False
+    
+    @traced("s3_get")
+    def _get_encoded(self, s3_key: str) -> Optional[Tuple[bytes, Optional[str]]]:
+        """Body and recorded codec of an object (codec is None when not recorded), or None if missing"""
+        try:
+            response = self.client.get_object(
+                Bucket=settings.S3_BUCKET_NAME,
+                Key=s3_key
+            )
+            return response['Body'].read(), response.get('Metadata', {}).get(codecs.CODEC_METADATA_KEY)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') not in ('NoSuchKey', '404'):
+                logger.error(f"S3 get error for {s3_key}: {e}")
+            return None
+    
+    def put_json(
+        self,
+        s3_key: str,
+        data: Any,
+        metadata: Optional[Dict[str, str]] = None,
+        compress: bool = False
+    ) -> bool:
+        """
+        Store a JSON document (indexes, records, sidecars) under s3_key
+        
+        compress=True uses the preferred storage codec (zstd or gzip); small
+        records that are read often are cheaper left uncompressed.
+        """
+        body, codec = codecs.encode_json(data, None if compress else codecs.IDENTITY)
+        return self._put_encoded(s3_key, body, codec, 'application/json', metadata)
+    
+    def get_json(self, s3_key: str) -> Optional[Any]:
+        """Load a JSON document stored with put_json, or None if it does not exist"""
+        stored = self._get_encoded(s3_key)
+        return codecs.decode_json(*stored) if stored is not None else None
+    
+    def put_text(self, s3_key: str, text: str, metadata: Optional[Dict[str, str]] = None) -> bool:
+        """Store compressed UTF-8 text under s3_key"""
+        body, codec = codecs.encode_text(text)
+        return self._put_encoded(s3_key, body, codec, 'text/plain; charset=utf-8', metadata)
+    
+    def get_text(self, s3_key: str) -> Optional[str]:
+        """Load text stored with put_text, or None if it does not exist"""
+        stored = self._get_encoded(s3_key)
+        return codecs.decode_text(*stored) if stored is not None else None
+    
+    def put_vector(
+        self,
+        s3_key: str,
+        vector: List[float],
+        metadata: Optional[Dict[str, str]] = None,
+        codec: Optional[str] = None
+    ) -> bool:
+        """Store a vector packed as f16 or f32 (settings.STORAGE_VECTOR_CODEC by default)"""
+        body, codec = codecs.encode_vector(vector, codec)
+        return self._put_encoded(
+            s3_key, body, codec, 'application/octet-stream',
+            {**(metadata or {}), "dimension": str(len(vector))}
+        )
+    
+    def get_vector(self, s3_key: str, codec: Optional[str] = None) -> Optional[List[float]]:
+        """
+        Load a vector stored with put_vector, or None if it does not exist
+        
+        codec is only needed for vectors stored without codec metadata
+        and not in the default codec.
+        """
+        stored = self._get_encoded(s3_key)
+        if stored is None:
+            return None
+        body, recorded = stored
+        return codecs.decode_vector(body, recorded or codec or settings.STORAGE_VECTOR_CODEC)
+    
+    @staticmethod
+    def resume_index_key(resume_id: str) -> str:
+        """Index entry of a resume: {S3_PREFIX}_index/{resume_id}.json"""
+        return f"{settings.S3_PREFIX}_index/{resume_id}.json"
+    
+    def index_resume(
+        self,
+        resume_id: str,
+        s3_key: str,
+        size: int,
+        etag: str,
+        file_name: str,
+        metadata: Optional[Dict[str, str]] = None,
+        uploaded_at: Optional[str] = None
+    ) -> bool:
+        """
+        Record where a resume is stored (id -> key, size, etag, content hash)
+        
+        Lets get_resume_from_s3 find a resume with one GET instead of
+        scanning the Candidate folder with HEAD requests. A failed write
+        only costs that lookup, so it is logged rather than raised.
+        """
+        now = datetime.utcnow().isoformat()
+        indexed = self.put_json(self.resume_index_key(resume_id), {
+            "resume_id": resume_id,
+            "s3_key": s3_key,
+            "file_name": file_name,
+            "size": size,
+            "etag": etag,
+            "content_hash": (metadata or {}).get("content_sha256"),
+            "uploaded_at": uploaded_at or now,
+            "indexed_at": now
+        })
+        if indexed:
+            S3Client.resume_index_generation += 1
+        return indexed
+    
+    def unindex_resume(self, resume_id: str) -> bool:
+        """Remove a resume's index entry (its object was replaced or deleted)"""
+        try:
+            self.client.delete_object(Bucket=settings.S3_BUCKET_NAME, Key=self.resume_index_key(resume_id))
+        except ClientError as e:
+            logger.warning(f"Failed to remove index entry of resume {resume_id}: {e}")
             return False
+        S3Client.resume_index_generation += 1
+        return True
+    
+    def _stored_resume_id(self, s3_key: str) -> Optional[str]:
+        """Resume id of the object currently at s3_key (as rebuild_resume_index assigns it), if any"""
+        head = self.head_file(s3_key)
+        if head is None:
+            return None
+        return head.get('Metadata', {}).get('resume_id') or os.path.splitext(s3_key.split('/')[-1])[0]
+    
+    def _supersede(self, previous_id: Optional[str], resume_id: str) -> None:
+        """
+        Drop the index entry of the resume an upload overwrote
+        
+        Keys are file names, so uploading a file under an existing name
+        replaces the earlier resume's object; its entry would otherwise
+        keep pointing at the new content.
+        """
+        if previous_id and previous_id != resume_id:
+            self.unindex_resume(previous_id)
+            logger.info(f"Resume {previous_id} superseded by {resume_id} (same file name)")
+    
+    def lookup_resume(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        """Index entry written by index_resume, or None if the resume is not indexed"""
+        return self.get_json(self.resume_index_key(resume_id))
+    
+    def rebuild_resume_index(self, max_workers: int = 16) -> Dict[str, int]:
+        """
+        Index every resume already stored in the Candidate folder
+        
+        Reads each object's resume_id from its metadata (one HEAD per object,
+        run in parallel). Objects uploaded without one are indexed under their
+        file name stem, the id the S3-event Lambda gives them.
+        
+        Returns:
+            dict with keys: indexed, failed
+        """
+        counts = {"indexed": 0, "failed": 0}
+        def index_object(obj: Dict[str, Any]) -> str:
+            try:
+                head = self.client.head_object(Bucket=settings.S3_BUCKET_NAME, Key=obj['Key'])
+            except ClientError as e:
+                logger.warning(f"Failed to read metadata for {obj['Key']}: {e}")
+                return "failed"
+            metadata = head.get('Metadata', {})
+            file_name = obj['Key'].split('/')[-1]
+            indexed = self.index_resume(
+                metadata.get('resume_id') or os.path.splitext(file_name)[0],
+                obj['Key'],
+                obj.get('Size', head.get('ContentLength', 0)),
+                obj.get('ETag', '').strip('"'),
+                metadata.get('original_filename') or file_name,
+                metadata,
+                uploaded_at=metadata.get('uploaded_at') or (
+                    obj['LastModified'].isoformat() if obj.get('LastModified') else None
+                )
+            )
+            return "indexed" if indexed else "failed"
+        
+        candidate_prefix = f"{settings.S3_PREFIX}Candidate/"
+        objects = (obj for obj in self.list_objects(candidate_prefix) if not obj['Key'].endswith('/'))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for outcome in pool.map(index_object, objects):
+                counts[outcome] += 1
+        
+        logger.info(f"Rebuilt resume index: {counts}")
+        return counts
+    
+    def save_jobs_data(self, jobs_data: List[Dict[str, Any]]) -> bool:
+        """
+        Save all jobs as one {S3_PREFIX}jobs_data.json snapshot
+        
+        Stored compressed with the preferred storage codec; load and
+        get_json decode it transparently.
+        """
+        s3_key = f"{settings.S3_PREFIX}jobs_data.json"
+        
+        saved = self.put_json(
+            s3_key,
+            jobs_data,
+            metadata={
+                "saved_at": datetime.utcnow().isoformat(),
+                "total_jobs": str(len(jobs_data))
+            },
+            compress=True
+        )
+        if saved:
+            logger.info(f"Saved {len(jobs_data)} jobs to S3: {s3_key}")
+        return saved
     
     def load_jobs_data(self) -> List[Dict[str, Any]]:
         """
@@ -184,43 +445,6 @@ class S3Client:
         """
         jobs_prefix = f"{settings.S3_PREFIX}jobs/"
         
-        if settings.USE_MOCK:
-            # In mock mode, load from local directory
-            local_dir = "jobs"
-            jobs_data = []
-            
-            if os.path.exists(local_dir) and os.path.isdir(local_dir):
-                try:
-                    for filename in os.listdir(local_dir):
-                        if filename.endswith('.json'):
-                            file_path = os.path.join(local_dir, filename)
-                            try:
-                                with open(file_path, 'r', encoding='utf-8') as f:
-                                    job_data = json.load(f)
-                                    
-                                # Ensure it's a dict (single job object)
-                                if isinstance(job_data, dict):
-                                    jobs_data.append(job_data)
-                                elif isinstance(job_data, list):
-                                    # If file contains array, add all items
-                                    jobs_data.extend(job_data)
-                                    
-                            except json.JSONDecodeError as e:
-                                logger.warning(f"MOCK: Failed to parse {filename}: {e}")
-                                continue
-                            except Exception as e:
-                                logger.warning(f"MOCK: Error reading {filename}: {e}")
-                                continue
-                    
-                    logger.info(f"MOCK: Loaded {len(jobs_data)} jobs from {local_dir}/")
-                    return jobs_data
-                except Exception as e:
-                    logger.error(f"MOCK: Failed to load jobs from directory: {e}")
-                    return []
-            else:
-                logger.info(f"MOCK: Jobs directory not found: {local_dir}")
-                return []
-        
         try:
             # List all objects in resumes/jobs/ prefix
             jobs_data = []
@@ -243,8 +467,10 @@ class S3Client:
                             Bucket=settings.S3_BUCKET_NAME,
                             Key=s3_key
                         )
-                        content = response['Body'].read().decode('utf-8')
-                        job_data = json.loads(content)
+                        job_data = codecs.decode_json(
+                            response['Body'].read(),
+                            response.get('Metadata', {}).get(codecs.CODEC_METADATA_KEY)
+                        )
                         
                         # Each file should contain 1 job object (dict)
                         if isinstance(job_data, dict):
@@ -0,0 +1,424 @@
+"""
+Storage Backends
+Object storage behind S3Client: S3, a local directory or process memory
+"""
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from app.clients.aws_factory import get_client
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# S3 limits that the offline backends enforce, so bugs show up before deploying
+MAX_METADATA_BYTES = 2048
+MAX_KEYS_PER_PAGE = 1000
+
+
+def _client_error(code: str, message: str, operation: str, status: int) -> ClientError:
+    return ClientError(
+        {"Error": {"Code": code, "Message": message}, "ResponseMetadata": {"HTTPStatusCode": status}},
+        operation
+    )
+
+
+def _normalize_metadata(metadata: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """User metadata as S3 returns it: lower-cased keys, string values, 2 KB at most"""
+    normalized = {str(key).lower(): str(value) for key, value in (metadata or {}).items()}
+    size = sum(len(key.encode("utf-8")) + len(value.encode("utf-8")) for key, value in normalized.items())
+    if size > MAX_METADATA_BYTES:
+        raise _client_error("MetadataTooLarge", f"Metadata is {size} bytes, the limit is {MAX_METADATA_BYTES}", "PutObject", 400)
+    return normalized
+
+
+def multipart_etag(part_digests: List[bytes]) -> str:
+    """ETag S3 gives a multipart upload: MD5 of the part MD5s, dash, part count"""
+    return f"{hashlib.md5(b''.join(part_digests)).hexdigest()}-{len(part_digests)}"
+
+
+class StorageBackend(ABC):
+    """
+    The part of the boto3 S3 client API that S3Client uses
+
+    Offline backends implement put_object, get_object, head_object,
+    delete_object and list_objects_v2 with S3's response shapes and
+    errors (ClientError NoSuchKey / 404), so S3Client runs the same code
+    against them as against S3. Listing is in key order and paginated at
+    MaxKeys with opaque continuation tokens; ETags are the MD5 of the
+    body, or the multipart form for uploads above the multipart threshold.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def _store(self, bucket: str, key: str, body: bytes, meta: Dict[str, Any]) -> None:
+        """Write an object's body and metadata"""
+
+    @abstractmethod
+    def _load(self, bucket: str, key: str, with_body: bool) -> Optional[Tuple[Optional[bytes], Dict[str, Any]]]:
+        """Read an object's (body, metadata), or None if it does not exist; body may be None unless with_body"""
+
+    @abstractmethod
+    def _remove(self, bucket: str, key: str) -> None:
+        """Delete an object if it exists"""
+
+    @abstractmethod
+    def _keys(self, bucket: str, prefix: str) -> List[str]:
+        """Every key in bucket that starts with prefix"""
+
+    def put_object(
+        self,
+        Bucket: str,
+        Key: str,
+        Body: Any = b"",
+        ContentType: str = "binary/octet-stream",
+        Metadata: Optional[Dict[str, str]] = None,
+        ContentEncoding: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        body = Body.read() if hasattr(Body, "read") else (Body.encode("utf-8") if isinstance(Body, str) else bytes(Body))
+        return self._put(Bucket, Key, body, f'"{hashlib.md5(body).hexdigest()}"', ContentType, Metadata, ContentEncoding)
+
+    def _put(
+        self,
+        bucket: str,
+        key: str,
+        body: bytes,
+        etag: str,
+        content_type: Optional[str],
+        metadata: Optional[Dict[str, str]],
+        content_encoding: Optional[str]
+    ) -> Dict[str, Any]:
+        meta = {
+            "ETag": etag,
+            "ContentType": content_type or "binary/octet-stream",
+            "ContentEncoding": content_encoding,
+            "Metadata": _normalize_metadata(metadata),
+            "LastModified": datetime.now(timezone.utc).isoformat()
+        }
+        self._store(bucket, key, body, meta)
+        return {"ETag": etag}
+
+    def upload_fileobj(
+        self,
+        Fileobj: BinaryIO,
+        Bucket: str,
+        Key: str,
+        ExtraArgs: Optional[Dict[str, Any]] = None,
+        Callback: Any = None,
+        Config: Any = None
+    ) -> None:
+        """Store a file object; above Config.multipart_threshold the ETag is the multipart one"""
+        extra = ExtraArgs or {}
+        chunk_size = getattr(Config, "multipart_chunksize", 8 * 1024 * 1024)
+        threshold = getattr(Config, "multipart_threshold", 8 * 1024 * 1024)
+        parts: List[bytes] = []
+        digests: List[bytes] = []
+        while True:
+            part = Fileobj.read(chunk_size)
+            if not part:
+                break
+            parts.append(part)
+            digests.append(hashlib.md5(part).digest())
+            if Callback:
+                Callback(len(part))
+        body = b"".join(parts)
+        if len(body) >= threshold:
+            etag = f'"{multipart_etag(digests)}"'
+        else:
+            etag = f'"{hashlib.md5(body).hexdigest()}"'
+        self._put(Bucket, Key, body, etag, extra.get("ContentType"), extra.get("Metadata"), extra.get("ContentEncoding"))
+
+    def _response(self, key: str, meta: Dict[str, Any], size: int) -> Dict[str, Any]:
+        response = {
+            "ContentLength": size,
+            "ContentType": meta["ContentType"],
+            "ETag": meta["ETag"],
+            "LastModified": datetime.fromisoformat(meta["LastModified"]),
+            "Metadata": dict(meta["Metadata"])
+        }
+        if meta.get("ContentEncoding"):
+            response["ContentEncoding"] = meta["ContentEncoding"]
+        return response
+
+    def get_object(self, Bucket: str, Key: str, **kwargs) -> Dict[str, Any]:
+        stored = self._load(Bucket, Key, with_body=True)
+        if stored is None:
+            raise _client_error("NoSuchKey", "The specified key does not exist.", "GetObject", 404)
+        body, meta = stored
+        response = self._response(Key, meta, len(body))
+        response["Body"] = io.BytesIO(body)
+        return response
+
+    def head_object(self, Bucket: str, Key: str, **kwargs) -> Dict[str, Any]:
+        stored = self._load(Bucket, Key, with_body=False)
+        if stored is None:
+            # HEAD responses have no body, so S3 reports the bare status code
+            raise _client_error("404", "Not Found", "HeadObject", 404)
+        _, meta = stored
+        return self._response(Key, meta, meta["Size"])
+
+    def delete_object(self, Bucket: str, Key: str, **kwargs) -> Dict[str, Any]:
+        # Like S3, deleting a missing key succeeds
+        self._remove(Bucket, Key)
+        return {}
+
+    @staticmethod
+    def _encode_token(key: str) -> str:
+        return base64.urlsafe_b64encode(key.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def _decode_token(token: str) -> str:
+        try:
+            return base64.urlsafe_b64decode(token.encode("ascii")).decode("utf-8")
+        except Exception:
+            raise _client_error("InvalidArgument", "The continuation token provided is incorrect", "ListObjectsV2", 400)
+
+    def list_objects_v2(
+        self,
+        Bucket: str,
+        Prefix: str = "",
+        MaxKeys: int = MAX_KEYS_PER_PAGE,
+        ContinuationToken: Optional[str] = None,
+        StartAfter: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        max_keys = max(0, min(MaxKeys, MAX_KEYS_PER_PAGE))
+        after = self._decode_token(ContinuationToken) if ContinuationToken else StartAfter
+        keys = sorted(self._keys(Bucket, Prefix))
+        if after is not None:
+            keys = [key for key in keys if key > after]
+
+        contents = []
+        for key in keys[:max_keys]:
+            stored = self._load(Bucket, key, with_body=False)
+            if stored is None:  # Deleted while listing
+                continue
+            _, meta = stored
+            contents.append({
+                "Key": key,
+                "Size": meta["Size"],
+                "ETag": meta["ETag"],
+                "LastModified": datetime.fromisoformat(meta["LastModified"]),
+                "StorageClass": "STANDARD"
+            })
+
+        truncated = len(keys) > max_keys
+        page = {
+            "Name": Bucket,
+            "Prefix": Prefix,
+            "MaxKeys": max_keys,
+            "KeyCount": len(contents),
+            "IsTruncated": truncated
+        }
+        if contents:
+            page["Contents"] = contents
+        if truncated:
+            page["NextContinuationToken"] = self._encode_token(keys[max_keys - 1])
+        if ContinuationToken:
+            page["ContinuationToken"] = ContinuationToken
+        return page
+
+    def get_paginator(self, operation_name: str) -> "ListObjectsV2Paginator":
+        if operation_name != "list_objects_v2":
+            raise NotImplementedError(f"{self.name} storage backend has no paginator for {operation_name}")
+        return ListObjectsV2Paginator(self)
+
+
+class ListObjectsV2Paginator:
+    """list_objects_v2 paginator (PaginationConfig PageSize, MaxItems and StartingToken)"""
+
+    def __init__(self, backend: StorageBackend):
+        self.backend = backend
+
+    def paginate(self, PaginationConfig: Optional[Dict[str, Any]] = None, **kwargs) -> Iterator[Dict[str, Any]]:
+        config = PaginationConfig or {}
+        kwargs.setdefault("MaxKeys", config.get("PageSize", MAX_KEYS_PER_PAGE))
+        remaining = config.get("MaxItems")
+        token = config.get("StartingToken")
+        while True:
+            if token:
+                kwargs["ContinuationToken"] = token
+            if remaining is not None:
+                kwargs["MaxKeys"] = min(kwargs["MaxKeys"], remaining)
+            page = self.backend.list_objects_v2(**kwargs)
+            yield page
+            if remaining is not None:
+                remaining -= page["KeyCount"]
+                if remaining <= 0:
+                    return
+            token = page.get("NextContinuationToken")
+            if not page["IsTruncated"] or not token:
+                return
+
+
+class InMemoryBackend(StorageBackend):
+    """Objects held in process memory; shared by every S3Client in the process"""
+
+    name = "memory"
+
+    def __init__(self):
+        self._buckets: Dict[str, Dict[str, Tuple[bytes, Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def _store(self, bucket: str, key: str, body: bytes, meta: Dict[str, Any]) -> None:
+        with self._lock:
+            self._buckets.setdefault(bucket, {})[key] = (body, {**meta, "Size": len(body)})
+
+    def _load(self, bucket: str, key: str, with_body: bool) -> Optional[Tuple[Optional[bytes], Dict[str, Any]]]:
+        return self._buckets.get(bucket, {}).get(key)
+
+    def _remove(self, bucket: str, key: str) -> None:
+        with self._lock:
+            self._buckets.get(bucket, {}).pop(key, None)
+
+    def _keys(self, bucket: str, prefix: str) -> List[str]:
+        with self._lock:
+            return [key for key in self._buckets.get(bucket, {}) if key.startswith(prefix)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class LocalDirectoryBackend(StorageBackend):
+    """
+    Objects stored as files under root/<bucket>/<key>
+
+    ETag, content type, encoding and user metadata live in a JSON file per
+    object under root/<bucket>/.s3meta/, written before the body is
+    swapped in; files without one (copied in by hand) get an MD5 ETag and
+    their mtime. Unlike S3, a key cannot also be a "folder" of other keys
+    ("a" and "a/b"), and keys ending in "/" are rejected.
+    """
+
+    name = "local"
+    META_DIR = ".s3meta"
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self._lock = threading.Lock()
+
+    def _path(self, bucket: str, key: str, meta: bool = False) -> str:
+        if not key or key.endswith("/"):
+            raise _client_error("InvalidArgument", f"Local storage cannot store key {key!r}", "PutObject", 400)
+        bucket_dir = os.path.join(self.root, bucket)
+        base = os.path.join(bucket_dir, self.META_DIR) if meta else bucket_dir
+        path = os.path.normpath(os.path.join(base, key + (".json" if meta else "")))
+        if not path.startswith(base + os.sep):
+            raise _client_error("InvalidArgument", f"Key {key!r} escapes the bucket directory", "PutObject", 400)
+        return path
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _store(self, bucket: str, key: str, body: bytes, meta: Dict[str, Any]) -> None:
+        with self._lock:
+            self._write(self._path(bucket, key, meta=True), json.dumps(meta).encode("utf-8"))
+            self._write(self._path(bucket, key), body)
+
+    def _load(self, bucket: str, key: str, with_body: bool) -> Optional[Tuple[Optional[bytes], Dict[str, Any]]]:
+        path = self._path(bucket, key)
+        try:
+            if with_body:
+                with open(path, "rb") as f:
+                    body = f.read()
+                size = len(body)
+            else:
+                body = None
+                size = os.path.getsize(path)
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            return None
+
+        try:
+            with open(self._path(bucket, key, meta=True), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (FileNotFoundError, NotADirectoryError, json.JSONDecodeError):
+            if body is None:
+                with open(path, "rb") as f:
+                    body_for_etag = f.read()
+            else:
+                body_for_etag = body
+            meta = {
+                "ETag": f'"{hashlib.md5(body_for_etag).hexdigest()}"',
+                "ContentType": "binary/octet-stream",
+                "ContentEncoding": None,
+                "Metadata": {},
+                "LastModified": datetime.fromtimestamp(os.path.getmtime(path), timezone.utc).isoformat()
+            }
+        meta["Size"] = size
+        return body, meta
+
+    def _remove(self, bucket: str, key: str) -> None:
+        with self._lock:
+            for path in (self._path(bucket, key), self._path(bucket, key, meta=True)):
+                try:
+                    os.remove(path)
+                except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+                    pass
+
+    def _keys(self, bucket: str, prefix: str) -> List[str]:
+        bucket_dir = os.path.join(self.root, bucket)
+        # Only walk the directory the prefix points into
+        start = os.path.join(bucket_dir, os.path.dirname(prefix)) if "/" in prefix else bucket_dir
+        keys = []
+        for directory, subdirs, files in os.walk(start):
+            if directory == bucket_dir:
+                subdirs[:] = [d for d in subdirs if d != self.META_DIR]
+            for file_name in files:
+                if ".tmp-" in file_name:
+                    continue
+                key = os.path.relpath(os.path.join(directory, file_name), bucket_dir).replace(os.sep, "/")
+                if key.startswith(prefix):
+                    keys.append(key)
+        return keys
+
+
+_backend: Optional[Any] = None
+_backend_lock = threading.Lock()
+
+
+def backend_name() -> str:
+    """settings.STORAGE_BACKEND with "auto" resolved (memory in mock mode, else s3)"""
+    name = settings.STORAGE_BACKEND.lower()
+    if name == "auto":
+        return "memory" if settings.USE_MOCK else "s3"
+    return name
+
+
+def get_storage_backend() -> Any:
+    """
+    Shared backend for S3Client: the pooled boto3 S3 client, or an
+    offline backend with the same API
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = backend_name()
+                if name == "s3":
+                    _backend = get_client('s3')
+                elif name == "local":
+                    _backend = LocalDirectoryBackend(settings.STORAGE_LOCAL_DIR)
+                    logger.info(f"Using local storage backend at {_backend.root}")
+                elif name == "memory":
+                    _backend = InMemoryBackend()
+                    logger.info("Using in-memory storage backend")
+                else:
+                    raise ValueError(f"Unknown storage backend: {settings.STORAGE_BACKEND}")
+    return _backend
@@ -0,0 +1,118 @@
+"""
+Result Cache
+Byte-budgeted LRU cache with per-namespace generation counters
+"""
+import hashlib
+import json
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def quantized_vector_hash(vector: List[float], precision: int = 4) -> str:
+    """
+    Hash a query vector after rounding each component
+
+    Rounding makes embeddings that differ only by float noise share a key.
+    """
+    scale = 10 ** precision
+    packed = struct.pack(f"<{len(vector)}q", *(int(round(x * scale)) for x in vector))
+    return hashlib.sha1(packed).hexdigest()
+
+
+class GenerationalLRUCache:
+    """
+    Thread-safe LRU cache bounded by the total size of its values
+
+    Every entry belongs to a namespace (e.g. an index name). Bumping the
+    namespace generation makes all of its entries stale at once, which is
+    how writes invalidate cached search results.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float = 0):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[int, float, bytes]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def generation(self, namespace: str) -> int:
+        """Current generation of a namespace"""
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def bump(self, namespace: str) -> int:
+        """Invalidate every entry of a namespace and return the new generation"""
+        with self._lock:
+            generation = self._generations.get(namespace, 0) + 1
+            self._generations[namespace] = generation
+            for entry_key in [k for k in self._entries if k[0] == namespace]:
+                self._drop(entry_key)
+            return generation
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return a fresh copy of a cached value, or None on miss"""
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                self.misses += 1
+                return None
+            generation, stored_at, payload = entry
+            expired = self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds
+            if generation != self._generations.get(namespace, 0) or expired:
+                self._drop((namespace, key))
+                self.misses += 1
+                return None
+            self._entries.move_to_end((namespace, key))
+            self.hits += 1
+        # Values are stored serialized so callers can mutate what they get back
+        return json.loads(payload)
+
+    def put(self, namespace: str, key: str, value: Any, generation: Optional[int] = None) -> bool:
+        """
+        Store a value
+
+        Pass the generation observed before computing the value so a write
+        that raced with the computation does not get cached as fresh.
+        """
+        payload = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        if len(payload) > self.max_bytes:
+            return False
+        with self._lock:
+            current = self._generations.get(namespace, 0)
+            if generation is not None and generation != current:
+                return False
+            if (namespace, key) in self._entries:
+                self._drop((namespace, key))
+            self._entries[(namespace, key)] = (current, time.monotonic(), payload)
+            self._current_bytes += len(payload)
+            while self._current_bytes > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+            return True
+
+    def clear(self) -> None:
+        """Drop every entry (generations are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of cache counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "generations": dict(self._generations),
+            }
+
+    def _drop(self, entry_key: Tuple[str, str]) -> None:
+        _, _, payload = self._entries.pop(entry_key)
+        self._current_bytes -= len(payload)
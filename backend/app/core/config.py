@@ -72,7 +72,99 @@ class Settings(BaseSettings):
     
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 60
+
+    # Shared AWS clients (app/clients/aws_factory.py)
+    AWS_MAX_POOL_CONNECTIONS: int = 50
+    AWS_TCP_KEEPALIVE: bool = True
+    AWS_CONNECT_TIMEOUT_SECONDS: int = 5
+    AWS_READ_TIMEOUT_SECONDS: int = 60
+    AWS_RETRY_MODE: str = "standard"  # legacy | standard | adaptive
+    AWS_MAX_ATTEMPTS: int = 5  # Including the first attempt
+    
+    # OpenSearch bulk indexing, multi-search and the async client (app/clients/async_opensearch_client.py)
+    OPENSEARCH_BULK_CHUNK_SIZE: int = 500  # Documents per _bulk request
+    OPENSEARCH_MSEARCH_MAX_QUERIES: int = 50  # kNN queries per _msearch request
+    OPENSEARCH_MSEARCH_MAX_BYTES: int = 4 * 1024 * 1024  # NDJSON bytes per _msearch request
+    OPENSEARCH_ASYNC_ENABLED: bool = True  # aiohttp client when aiohttp is installed, else the sync client in threads
+    
+    # Versioned indices behind read/write aliases (app/services/index_management_service.py)
+    OPENSEARCH_WRITE_ALIAS_SUFFIX: str = "_write"
+    OPENSEARCH_ALIAS_CACHE_SECONDS: int = 30  # How long clients reuse a resolved write alias
+    OPENSEARCH_REINDEX_WORKERS: int = 4  # parallel_bulk threads
+    OPENSEARCH_REINDEX_CHUNK_SIZE: int = 500  # Documents per scroll page and _bulk request
+    
+    # Full-index export (app/services/index_export_service.py)
+    OPENSEARCH_EXPORT_SLICES: int = 4  # Parallel point-in-time slices
+    OPENSEARCH_EXPORT_PAGE_SIZE: int = 1000  # Documents per search_after page
+    OPENSEARCH_EXPORT_KEEP_ALIVE: str = "10m"  # Point in time kept alive between pages
+    
+    # Vector search result cache
+    VECTOR_SEARCH_CACHE_ENABLED: bool = True
+    VECTOR_SEARCH_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    VECTOR_SEARCH_CACHE_TTL_SECONDS: int = 300  # Bounds staleness from writes made by other processes
+    VECTOR_SEARCH_CACHE_PRECISION: int = 4  # Decimal places kept when hashing query vectors
+
+    # Document extraction worker pool
+    EXTRACTION_USE_PROCESS_POOL: bool = True
+    EXTRACTION_WORKERS: int = 0  # 0 = one worker per CPU
+    EXTRACTION_TIMEOUT_SECONDS: int = 30
+    EXTRACTION_CHECKOUT_TIMEOUT_SECONDS: int = 60  # Wait for a free worker before failing the extraction
+    EXTRACTION_MAX_MEMORY_MB: int = 512
+    EXTRACTION_MAX_TASKS_PER_WORKER: int = 50
+    EXTRACTION_START_METHOD: str = "forkserver"
+    # Characters parsed before embedding starts (embeddings only use the first ~2048)
+    EMBEDDING_TEXT_BUDGET: int = 8192
+
+    # Streamed (multipart) uploads to S3
+    S3_MULTIPART_THRESHOLD_MB: int = 8
+    S3_MULTIPART_CHUNK_MB: int = 8
+    S3_UPLOAD_CONCURRENCY: int = 4
     
+    # Ingestion jobs (background bulk upload / sync)
+    INGESTION_QUEUE_BACKEND: str = "auto"  # sqs | sqlite | memory; auto = sqs when INGESTION_QUEUE_URL is set
+    INGESTION_QUEUE_URL: str = ""
+    INGESTION_SQLITE_PATH: str = "ingestion_queue.db"
+    INGESTION_LOCAL_WORKERS: int = 2  # In-process consumers started with the app for sqlite/memory queues
+    INGESTION_MAX_ATTEMPTS: int = 3
+    INGESTION_VISIBILITY_TIMEOUT_SECONDS: int = 300
+    INGESTION_RETRY_BACKOFF_SECONDS: int = 10
+    
+    # Mock mode job persistence (snapshot + write-ahead log)
+    MOCK_JOB_STORE_PATH: str = "jobs_data.json"
+    MOCK_JOB_STORE_COMPACT_EVERY: int = 500  # Log entries folded into the snapshot at a time
+    
+    # Object storage behind S3Client (app/clients/storage_backends.py)
+    STORAGE_BACKEND: str = "auto"  # s3 | local | memory; auto = memory when USE_MOCK, else s3
+    STORAGE_LOCAL_DIR: str = "local_storage"  # local backend root, one directory per bucket
+    
+    # Stored object codecs (app/core/codecs.py)
+    STORAGE_CODEC: str = "auto"  # auto (zstd when installed, else gzip) | zstd | gzip | identity
+    STORAGE_GZIP_LEVEL: int = 6
+    STORAGE_ZSTD_LEVEL: int = 3
+    STORAGE_VECTOR_CODEC: str = "f16"  # f16 | f32
+    
+    # Resume catalog behind /api/resumes/list
+    RESUME_CATALOG_TTL_SECONDS: int = 10  # How long a process reuses its catalog before re-listing the index
+    RESUME_LIST_MAX_LIMIT: int = 500
+    
+    # Per-stage request tracing (app/core/tracing.py, /api/metrics)
+    TRACING_ENABLED: bool = True
+    TRACING_SERVER_TIMING: bool = True  # Send the stage breakdown as a Server-Timing header
+    TRACING_WINDOW_SECONDS: int = 300  # Latency samples older than this drop out of the percentiles
+    TRACING_WINDOW_SAMPLES: int = 2048  # Most recent samples kept per stage
+
+    # Log shipping (app/core/logging.py)
+    LOG_SHIPPING: str = "auto"  # stdout | cloudwatch; auto = stdout in Lambda (already shipped from there) or mock mode, else cloudwatch
+    LOG_CLOUDWATCH_GROUP: str = "/aws/lambda/resume-matching-api"
+    LOG_CLOUDWATCH_STREAM: str = "app"
+    LOG_QUEUE_MAX_RECORDS: int = 10000  # Records waiting to ship; new records are dropped beyond this
+    LOG_BATCH_MAX_RECORDS: int = 500  # Ship once this many records are queued...
+    LOG_BATCH_MAX_BYTES: int = 512 * 1024  # ...or this many bytes (PutLogEvents takes up to 1 MiB)...
+    LOG_FLUSH_INTERVAL_SECONDS: float = 5.0  # ...or once the oldest queued record is this old
+    LOG_SAMPLE_ABOVE: float = 0.5  # Queue fill from which records below WARNING are sampled
+    LOG_SAMPLE_RATE: float = 0.1  # Share of those records kept while sampling
+    LOG_SHUTDOWN_TIMEOUT_SECONDS: float = 5.0  # How long flush and shutdown wait for queued records to ship
+
     # Pydantic v2 settings config
     # BaseSettings reads from os.environ automatically
     # We also specify env_file as backup, but load_dotenv() above should populate os.environ
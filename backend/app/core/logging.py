@@ -3,20 +3,284 @@ Structured Logging Configuration
 Sends logs to CloudWatch when deployed, console when local
 """
 import logging
-import sys
 import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
 from pythonjsonlogger import jsonlogger
-import watchtower
+
+from app.core.config import settings
+
+
+class CloudWatchBatchHandler(logging.Handler):
+    """
+    Ships log records to CloudWatch Logs from a background thread
+
+    emit() only formats the record and appends it to a bounded in-memory
+    queue, so logging never waits on the network. The shipper thread sends
+    one PutLogEvents batch as soon as batch_records records or batch_bytes
+    are queued, or once the oldest queued record is flush_interval seconds
+    old. Under pressure records are shed rather than blocking the caller:
+    from sample_above of the queue filled on, only sample_rate of the
+    records below WARNING are kept, and a full queue drops new records.
+    Shed and undeliverable records are counted and reported in the stream
+    with the next batch.
+    """
+
+    # PutLogEvents limits
+    MAX_BATCH_RECORDS = 10000
+    MAX_BATCH_BYTES = 1024 * 1024
+    MAX_EVENT_BYTES = 256 * 1024
+    EVENT_OVERHEAD_BYTES = 26
+    SEND_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        log_group: str,
+        log_stream: str,
+        max_records: int,
+        batch_records: int,
+        batch_bytes: int,
+        flush_interval: float,
+        sample_above: float,
+        sample_rate: float,
+        shutdown_timeout: float
+    ):
+        super().__init__()
+        self.log_group = log_group
+        self.log_stream = log_stream
+        self.max_records = max(1, max_records)
+        self.batch_records = max(1, min(batch_records, self.MAX_BATCH_RECORDS))
+        self.batch_bytes = max(self.MAX_EVENT_BYTES, min(batch_bytes, self.MAX_BATCH_BYTES))
+        self.flush_interval = flush_interval
+        self.sample_above = sample_above
+        self.sample_rate = sample_rate
+        self.shutdown_timeout = shutdown_timeout
+
+        # (queued at, event, size) in arrival order
+        self._events: Deque[Tuple[float, Dict[str, Any], int]] = deque()
+        self._queued_bytes = 0
+        self._queue_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._drained = threading.Event()
+        self._flushing = False
+        self._closed = False
+        self._random = random.Random()
+        self._client = None
+        self._stream_ready = False
+
+        self.shipped = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.failed_batches = 0
+        self._reported = (0, 0)  # dropped, sampled_out already reported in the stream
+
+        self._thread = threading.Thread(target=self._run, name="cloudwatch-log-shipper", daemon=True)
+        self._thread.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if threading.current_thread() is self._thread:
+            return  # botocore logging about our own PutLogEvents calls
+        try:
+            with self._queue_lock:
+                fill = len(self._events) / self.max_records
+                if self._closed or fill >= 1:
+                    self.dropped += 1
+                    return
+                if record.levelno < logging.WARNING and fill >= self.sample_above and \
+                        self._random.random() >= self.sample_rate:
+                    self.sampled_out += 1
+                    return
+
+            event, size = self._event(record)
+            with self._queue_lock:
+                self._events.append((time.monotonic(), event, size))
+                self._queued_bytes += size
+                if len(self._events) >= self.batch_records or self._queued_bytes >= self.batch_bytes:
+                    self._wake.set()
+        except Exception:
+            self.handleError(record)
+
+    def _event(self, record: logging.LogRecord) -> Tuple[Dict[str, Any], int]:
+        """PutLogEvents event for record (cut to the event size limit) and its billed size"""
+        encoded = self.format(record).encode("utf-8")[:self.MAX_EVENT_BYTES - self.EVENT_OVERHEAD_BYTES]
+        message = encoded.decode("utf-8", "ignore")
+        return {"timestamp": int(record.created * 1000), "message": message}, len(encoded) + self.EVENT_OVERHEAD_BYTES
+
+    def _due(self) -> bool:
+        if not self._events:
+            return False
+        return (
+            self._flushing or self._closed or
+            len(self._events) >= self.batch_records or
+            self._queued_bytes >= self.batch_bytes or
+            time.monotonic() - self._events[0][0] >= self.flush_interval
+        )
+
+    def _run(self) -> None:
+        while True:
+            with self._queue_lock:
+                timeout = self.flush_interval
+                if self._events:
+                    timeout = max(0.0, self._events[0][0] + self.flush_interval - time.monotonic())
+            self._wake.wait(timeout)
+            self._wake.clear()
+            while True:
+                with self._queue_lock:
+                    if not self._due():
+                        break
+                    batch = self._take_batch()
+                self._send(batch)
+            with self._queue_lock:
+                if not self._events:
+                    self._flushing = False
+                    self._drained.set()
+                    if self._closed:
+                        return
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        """Pop the oldest events that fit in one batch (queue lock held)"""
+        batch = []
+        size = 0
+        dropped, sampled_out = self.dropped, self.sampled_out
+        if (dropped, sampled_out) != self._reported:
+            notice = logging.LogRecord(
+                __name__, logging.WARNING, __file__, 0,
+                "Log shipping lost records: %d dropped, %d sampled out since the last report",
+                (dropped - self._reported[0], sampled_out - self._reported[1]), None
+            )
+            self._reported = (dropped, sampled_out)
+            event, size = self._event(notice)
+            batch.append(event)
+
+        taken = 0
+        while self._events and len(batch) < self.batch_records:
+            _, event, event_size = self._events[0]
+            if batch and size + event_size > self.batch_bytes:
+                break
+            self._events.popleft()
+            batch.append(event)
+            size += event_size
+            taken += event_size
+        self._queued_bytes -= taken
+        # Events from several threads can interleave; PutLogEvents wants them in order
+        batch.sort(key=lambda event: event["timestamp"])
+        return batch
+
+    def _logs_client(self):
+        if self._client is None:
+            # Imported here: the client factory itself logs through this module
+            from app.clients.aws_factory import get_client
+            self._client = get_client("logs")
+        return self._client
+
+    def _ensure_stream(self) -> None:
+        client = self._logs_client()
+        try:
+            client.create_log_stream(logGroupName=self.log_group, logStreamName=self.log_stream)
+        except ClientError as e:
+            code = e.response["Error"]["Code"]
+            if code == "ResourceNotFoundException":
+                try:
+                    client.create_log_group(logGroupName=self.log_group)
+                except ClientError as group_error:
+                    if group_error.response["Error"]["Code"] != "ResourceAlreadyExistsException":
+                        raise
+                client.create_log_stream(logGroupName=self.log_group, logStreamName=self.log_stream)
+            elif code != "ResourceAlreadyExistsException":
+                raise
+        self._stream_ready = True
+
+    def _send(self, batch: List[Dict[str, Any]]) -> None:
+        error: Optional[Exception] = None
+        for attempt in range(self.SEND_ATTEMPTS):
+            try:
+                if not self._stream_ready:
+                    self._ensure_stream()
+                self._logs_client().put_log_events(
+                    logGroupName=self.log_group,
+                    logStreamName=self.log_stream,
+                    logEvents=batch
+                )
+                with self._queue_lock:
+                    self.shipped += len(batch)
+                return
+            except ClientError as e:
+                if e.response["Error"]["Code"] == "DataAlreadyAcceptedException":
+                    return
+                if e.response["Error"]["Code"] == "ResourceNotFoundException":
+                    self._stream_ready = False
+                error = e
+            except Exception as e:
+                error = e
+            if attempt + 1 < self.SEND_ATTEMPTS and not self._closed:
+                time.sleep(0.5 * 2 ** attempt)
+        with self._queue_lock:
+            self.failed_batches += 1
+            self.dropped += len(batch)
+        # Not through logging: this handler would only queue it again
+        sys.stderr.write(f"CloudWatch log shipping failed, {len(batch)} records dropped: {error}\n")
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Ship everything queued, waiting up to timeout (shutdown_timeout by default)"""
+        with self._queue_lock:
+            if not self._events or not self._thread.is_alive():
+                return
+            self._drained.clear()
+            self._flushing = True
+        self._wake.set()
+        self._drained.wait(self.shutdown_timeout if timeout is None else timeout)
+
+    def close(self) -> None:
+        with self._queue_lock:
+            already_closed = self._closed
+            self._closed = True
+        if not already_closed:
+            self._wake.set()
+            self._thread.join(self.shutdown_timeout)
+        super().close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._queue_lock:
+            return {
+                "queued": len(self._events),
+                "queued_bytes": self._queued_bytes,
+                "shipped": self.shipped,
+                "dropped": self.dropped,
+                "sampled_out": self.sampled_out,
+                "failed_batches": self.failed_batches
+            }
+
+
+def log_shipping_target() -> str:
+    """
+    settings.LOG_SHIPPING with "auto" resolved: stdout in Lambda (which
+    already sends stdout to CloudWatch) and in mock mode, else cloudwatch
+    """
+    target = settings.LOG_SHIPPING.lower()
+    if target != "auto":
+        return target
+    if os.environ.get("AWS_LAMBDA_FUNCTION_NAME") or os.getenv("USE_MOCK", "true").lower() == "true":
+        return "stdout"
+    return "cloudwatch"
 
 
 def setup_logging():
     """Setup structured logging with CloudWatch support"""
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
-    
-    # Remove existing handlers
+
+    # Remove existing handlers (stopping the shipper thread of a previous setup)
+    for handler in root_logger.handlers:
+        if isinstance(handler, CloudWatchBatchHandler):
+            handler.close()
     root_logger.handlers = []
-    
+
     # Console handler with JSON formatter
     console_handler = logging.StreamHandler(sys.stdout)
     json_formatter = jsonlogger.JsonFormatter(
@@ -24,25 +288,30 @@ def setup_logging():
     )
     console_handler.setFormatter(json_formatter)
     root_logger.addHandler(console_handler)
-    
-    # CloudWatch handler (only if not in mock mode and AWS credentials available)
-    if os.getenv("USE_MOCK", "true").lower() != "true":
+
+    # CloudWatch handler: batched in the background, never on the request path
+    if log_shipping_target() == "cloudwatch":
         try:
-            cloudwatch_handler = watchtower.CloudWatchLogHandler(
-                log_group_name="/aws/lambda/resume-matching-api",
-                stream_name="app",
-                use_queues=False
+            cloudwatch_handler = CloudWatchBatchHandler(
+                log_group=settings.LOG_CLOUDWATCH_GROUP,
+                log_stream=settings.LOG_CLOUDWATCH_STREAM,
+                max_records=settings.LOG_QUEUE_MAX_RECORDS,
+                batch_records=settings.LOG_BATCH_MAX_RECORDS,
+                batch_bytes=settings.LOG_BATCH_MAX_BYTES,
+                flush_interval=settings.LOG_FLUSH_INTERVAL_SECONDS,
+                sample_above=settings.LOG_SAMPLE_ABOVE,
+                sample_rate=settings.LOG_SAMPLE_RATE,
+                shutdown_timeout=settings.LOG_SHUTDOWN_TIMEOUT_SECONDS
             )
             cloudwatch_handler.setFormatter(json_formatter)
             root_logger.addHandler(cloudwatch_handler)
         except Exception as e:
             # If CloudWatch setup fails, continue with console logging
             logging.warning(f"CloudWatch logging not available: {e}")
-    
+
     return root_logger
 
 
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance"""
     return logging.getLogger(name)
-
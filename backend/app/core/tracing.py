@@ -0,0 +1,189 @@
+"""
+Request Tracing
+Timed spans per request stage, Server-Timing headers and rolling latency percentiles
+"""
+import asyncio
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, FrozenSet, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class Trace:
+    """
+    Stage timings of one request
+
+    Each stage keeps a call count and total milliseconds, so a stage run
+    several times (one S3 read per resume, say) reports its sum. Spans
+    started in worker threads (asyncio.to_thread copies the context)
+    land on the same trace.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, milliseconds: float) -> None:
+        with self._lock:
+            count, total = self.stages.get(name, (0, 0.0))
+            self.stages[name] = (count + 1, total + milliseconds)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self, total_ms: float) -> str:
+        """Server-Timing header value, e.g. generate_embedding;dur=212.4, total;dur=903.1"""
+        with self._lock:
+            stages = list(self.stages.items())
+        entries = [
+            f'{name};dur={total:.1f}' + (f';desc="x{count}"' if count > 1 else "")
+            for name, (count, total) in stages
+        ]
+        entries.append(f"total;dur={total_ms:.1f}")
+        return ", ".join(entries)
+
+    def breakdown(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: {"count": count, "ms": round(total, 1)} for name, (count, total) in self.stages.items()}
+
+
+class RollingPercentiles:
+    """
+    Recent latencies per name with their p50/p95/p99
+
+    Keeps up to max_samples samples per name, dropping those older than
+    window_seconds, so the percentiles follow current behaviour.
+    """
+
+    def __init__(self, window_seconds: float, max_samples: int):
+        self.window_seconds = window_seconds
+        self.max_samples = max_samples
+        self._samples: Dict[str, Deque[Tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, milliseconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.max_samples)
+            samples.append((time.monotonic(), milliseconds))
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        cutoff = time.monotonic() - self.window_seconds
+        with self._lock:
+            for samples in self._samples.values():
+                while samples and samples[0][0] < cutoff:
+                    samples.popleft()
+            values = {name: sorted(ms for _, ms in samples) for name, samples in self._samples.items() if samples}
+        return {name: self._summary(latencies) for name, latencies in sorted(values.items())}
+
+    @staticmethod
+    def _summary(latencies: list) -> Dict[str, float]:
+        def percentile(p: float) -> float:
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 1)
+        return {
+            "count": len(latencies),
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(latencies[-1], 1)
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+latency_stats = RollingPercentiles(settings.TRACING_WINDOW_SECONDS, settings.TRACING_WINDOW_SAMPLES)
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+# Spans open in this context; a nested span with the same name (the async
+# client delegating to the sync one) is timed once, by the outermost
+_open_spans: ContextVar[FrozenSet[str]] = ContextVar("open_spans", default=frozenset())
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str):
+    """Time a stage into the current request's trace and the rolling percentiles"""
+    open_spans = _open_spans.get()
+    if not settings.TRACING_ENABLED or name in open_spans:
+        yield
+        return
+    token = _open_spans.set(open_spans | {name})
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        milliseconds = (time.perf_counter() - start) * 1000
+        _open_spans.reset(token)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(name, milliseconds)
+        latency_stats.record(name, milliseconds)
+
+
+def traced(name: str) -> Callable:
+    """Decorator form of span for functions and coroutines"""
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+async def tracing_middleware(request, call_next):
+    """
+    Trace each HTTP request
+
+    Adds the stage breakdown as a Server-Timing header, logs it as one
+    structured record and feeds the request total into latency_stats
+    (under "<METHOD> <route>"; requests no route matched, such as scans
+    for random paths, share "<METHOD> <unmatched>").
+    """
+    if not settings.TRACING_ENABLED:
+        return await call_next(request)
+
+    trace = Trace()
+    token = _current_trace.set(trace)
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        _current_trace.reset(token)
+        total_ms = trace.elapsed_ms()
+        route = request.scope.get("route")
+        name = f"{request.method} {route.path if route is not None else '<unmatched>'}"
+        latency_stats.record(name, total_ms)
+        logger.info("request timing", extra={
+            "request": name,
+            "status_code": status_code,
+            "duration_ms": round(total_ms, 1),
+            "stages": trace.breakdown()
+        })
+
+    if settings.TRACING_SERVER_TIMING:
+        response.headers["Server-Timing"] = trace.server_timing(total_ms)
+    return response
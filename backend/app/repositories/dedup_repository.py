@@ -0,0 +1,84 @@
+"""
+Dedup Repository
+Content-addressed lookup from a file's sha256 to the resume it was first uploaded as
+"""
+from typing import Dict, Any, Optional, Union, BinaryIO
+from datetime import datetime
+import hashlib
+
+from app.clients.s3_client import s3_client
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class DedupRepository:
+    """
+    Repository for content-hash dedup records
+
+    One small JSON record per distinct file content, stored under
+    {S3_PREFIX}_dedup/{sha256}.json. The record points at the resume id
+    and S3 key of the first upload; the extracted text and embedding live
+    in that resume's OpenSearch document. Later uploads of the same bytes
+    resolve to that resume instead of being stored again, as long as the
+    object under its key still holds this content.
+    """
+
+    def __init__(self):
+        self.s3 = s3_client
+
+    @staticmethod
+    def content_hash(file_content: Union[bytes, BinaryIO]) -> str:
+        """sha256 hex digest of file content (bytes, or a seekable file object read in chunks)"""
+        if isinstance(file_content, (bytes, bytearray)):
+            return hashlib.sha256(file_content).hexdigest()
+        digest = hashlib.sha256()
+        file_content.seek(0)
+        for chunk in iter(lambda: file_content.read(1024 * 1024), b""):
+            digest.update(chunk)
+        file_content.seek(0)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _record_key(content_hash: str) -> str:
+        return f"{settings.S3_PREFIX}_dedup/{content_hash}.json"
+
+    def lookup(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the dedup record for a content hash, if this content was seen before
+
+        Uploads are keyed by file name, so the object a record points at
+        may since have been replaced by another file of the same name (or
+        deleted). The record is only returned while the object's
+        content_sha256 metadata still matches; otherwise the content is
+        treated as new and its next upload rewrites the record.
+        """
+        record = self.s3.get_json(self._record_key(content_hash))
+        if not record:
+            return None
+        head = self.s3.head_file(record["s3_key"])
+        if not head or head.get("Metadata", {}).get("content_sha256") != content_hash:
+            logger.info(f"Dedup record for {content_hash[:12]} is stale ({record['s3_key']} no longer holds this content)")
+            return None
+        return record
+
+    def record(self, content_hash: str, resume_id: str, s3_key: str, file_name: str) -> Dict[str, Any]:
+        """Record the first upload of a piece of content"""
+        record = {
+            "content_hash": content_hash,
+            "resume_id": resume_id,
+            "s3_key": s3_key,
+            "file_name": file_name,
+            "created_at": datetime.utcnow().isoformat()
+        }
+        self.s3.put_json(self._record_key(content_hash), record)
+        return record
+
+    @staticmethod
+    def log_duplicate(record: Dict[str, Any], file_name: str) -> None:
+        """Note that the same content was uploaded again (possibly under another name)"""
+        logger.info(f"Deduplicated upload {file_name} -> resume {record['resume_id']}")
+
+
+dedup_repository = DedupRepository()
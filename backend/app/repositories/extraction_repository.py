@@ -0,0 +1,78 @@
+"""
+Extraction Repository
+Persisted text extraction results (sidecars) so stored resumes are parsed once
+"""
+from typing import Dict, Any, Optional
+from datetime import datetime
+
+from app.clients.s3_client import s3_client
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.file_processor import EXTRACTOR_VERSION
+
+logger = get_logger(__name__)
+
+
+class ExtractionRepository:
+    """
+    Repository for extraction sidecars
+
+    Each stored resume gets a compressed JSON sidecar holding the normalized
+    text, page count, section offsets and extractor version, at
+    {S3_PREFIX}_extracted/{path under S3_PREFIX}.json (the codec is in the
+    object metadata, not the key). The sidecars live
+    under their own prefix so listings of Candidate/ and S3 upload events
+    never see them. The Lambda reads and writes the same objects.
+    """
+
+    def __init__(self):
+        self.s3 = s3_client
+
+    @staticmethod
+    def sidecar_key(s3_key: str) -> str:
+        """Sidecar location for a stored file"""
+        relative = s3_key[len(settings.S3_PREFIX):] if s3_key.startswith(settings.S3_PREFIX) else s3_key
+        return f"{settings.S3_PREFIX}_extracted/{relative}.json"
+
+    def load(self, s3_key: str, etag: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the persisted extraction of a stored file
+
+        Returns None when there is no sidecar, it was written by another
+        extractor version, or (when etag is given) the file changed since.
+        """
+        sidecar = self.s3.get_json(self.sidecar_key(s3_key))
+        if not sidecar:
+            return None
+        if sidecar.get("extractor_version") != EXTRACTOR_VERSION:
+            logger.info(f"Extraction sidecar for {s3_key} is from extractor {sidecar.get('extractor_version')}, re-extracting")
+            return None
+        if etag and sidecar.get("source_etag") and sidecar["source_etag"] != etag.strip('"'):
+            logger.info(f"Extraction sidecar for {s3_key} is stale, re-extracting")
+            return None
+        return sidecar
+
+    def save(
+        self,
+        s3_key: str,
+        document: Dict[str, Any],
+        etag: Optional[str] = None,
+        size: Optional[int] = None
+    ) -> bool:
+        """Persist a complete extraction (budget-truncated extractions are not stored)"""
+        if not document.get("complete", True):
+            return False
+        sidecar = {
+            "text": document["text"],
+            "page_count": document["page_count"],
+            "sections": document["sections"],
+            "extractor_version": document.get("extractor_version", EXTRACTOR_VERSION),
+            "source_key": s3_key,
+            "source_etag": (etag or "").strip('"'),
+            "source_size": size,
+            "extracted_at": datetime.utcnow().isoformat()
+        }
+        return self.s3.put_json(self.sidecar_key(s3_key), sidecar, compress=True)
+
+
+extraction_repository = ExtractionRepository()
@@ -0,0 +1,155 @@
+"""
+Ingestion Job Repository
+Status and per-item results of background ingestion jobs
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime
+import threading
+import uuid
+
+from app.clients.s3_client import s3_client
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class IngestionJobRepository:
+    """
+    Repository for ingestion job state
+
+    A job is one JSON object at {S3_PREFIX}_ingestion/{job_id}/job.json plus
+    one object per item under items/. Workers only ever write their own
+    item, so any number of them can report progress without coordinating.
+
+    Polling a job lists its items/ prefix (one request per 1000 items) and
+    GETs only the item objects whose ETag changed since this process last
+    read them; the job object itself never changes and is read once.
+    """
+
+    ITEM_STATUSES = ("queued", "processing", "retrying", "succeeded", "failed")
+    CACHED_JOBS = 64
+
+    def __init__(self):
+        self.s3 = s3_client
+        # job_id -> (job object, item key -> (ETag, state)), least recently polled first
+        self._cache: "OrderedDict[str, Tuple[Dict[str, Any], Dict[str, Tuple[str, Dict[str, Any]]]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"{settings.S3_PREFIX}_ingestion/{job_id}/job.json"
+
+    @staticmethod
+    def _items_prefix(job_id: str) -> str:
+        return f"{settings.S3_PREFIX}_ingestion/{job_id}/items/"
+
+    @classmethod
+    def _item_key(cls, job_id: str, index: int) -> str:
+        return f"{cls._items_prefix(job_id)}{index:06d}.json"
+
+    def create_job(self, kind: str, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Create a job
+
+        Args:
+            kind: Job type (e.g. "resume_upload", "job_sync")
+            items: One summary dict per item (file name, job id, ...)
+        """
+        job = {
+            "job_id": str(uuid.uuid4()),
+            "kind": kind,
+            "total": len(items),
+            "items": items,
+            "created_at": datetime.utcnow().isoformat()
+        }
+        self.s3.put_json(self._job_key(job["job_id"]), job)
+        logger.info(f"Created ingestion job {job['job_id']} ({kind}, {len(items)} items)")
+        return job
+
+    def update_item(
+        self,
+        job_id: str,
+        index: int,
+        status: str,
+        attempts: int = 0,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """Record the state of one item"""
+        self.s3.put_json(self._item_key(job_id, index), {
+            "index": index,
+            "status": status,
+            "attempts": attempts,
+            "result": result,
+            "error": error,
+            "updated_at": datetime.utcnow().isoformat()
+        })
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Job with per-item state and progress counters
+
+        Items without a state object yet are reported as queued.
+        """
+        with self._cache_lock:
+            cached = self._cache.get(job_id)
+        if cached:
+            job, known = cached
+        else:
+            job = self.s3.get_json(self._job_key(job_id))
+            if not job:
+                return None
+            known = {}
+
+        listed = {
+            obj["Key"]: obj.get("ETag", "").strip('"')
+            for obj in self.s3.list_objects(self._items_prefix(job_id))
+        }
+        changed = [key for key, etag in listed.items() if key not in known or known[key][0] != etag]
+        current = {key: known[key] for key in listed if key not in changed}
+        if changed:
+            with ThreadPoolExecutor(max_workers=min(16, len(changed))) as pool:
+                for key, state in zip(changed, pool.map(self.s3.get_json, changed)):
+                    if state:
+                        current[key] = (listed[key], state)
+
+        with self._cache_lock:
+            self._cache[job_id] = (job, current)
+            self._cache.move_to_end(job_id)
+            while len(self._cache) > self.CACHED_JOBS:
+                self._cache.popitem(last=False)
+
+        total = job["total"]
+        states = [current.get(self._item_key(job_id, index), (None, None))[1] for index in range(total)]
+
+        items = []
+        counts = {status: 0 for status in self.ITEM_STATUSES}
+        for index, (summary, state) in enumerate(zip(job["items"], states)):
+            state = state or {"index": index, "status": "queued", "attempts": 0, "result": None, "error": None}
+            counts[state["status"]] = counts.get(state["status"], 0) + 1
+            items.append({**summary, **state})
+
+        done = counts["succeeded"] + counts["failed"]
+        if done == total:
+            status = "completed" if counts["failed"] == 0 else "completed_with_errors"
+        elif done or counts["processing"] or counts["retrying"]:
+            status = "running"
+        else:
+            status = "queued"
+
+        return {
+            "job_id": job_id,
+            "kind": job["kind"],
+            "status": status,
+            "created_at": job["created_at"],
+            "total": total,
+            "progress": round(done / total, 4) if total else 1.0,
+            "counts": counts,
+            "items": items
+        }
+
+
+ingestion_job_repository = IngestionJobRepository()
@@ -7,8 +7,10 @@ from datetime import datetime
 import uuid
 
 from app.clients.opensearch_client import opensearch_client
+from app.clients.async_opensearch_client import async_opensearch_client
 from app.clients.bedrock_client import bedrock_client
 from app.core.logging import get_logger
+from app.core.exceptions import EmbeddingError
 
 logger = get_logger(__name__)
 
@@ -20,6 +22,7 @@ class JobRepository:
     
     def __init__(self):
         self.opensearch = opensearch_client
+        self.async_opensearch = async_opensearch_client
         self.bedrock = bedrock_client
     
     def create_job(
@@ -75,9 +78,75 @@ class JobRepository:
             logger.error(f"Error creating job: {e}")
             raise
     
+    def ensure_index(self) -> None:
+        """Create jobs_index with its kNN mapping if it does not exist"""
+        index_mapping = {
+            "mappings": {
+                "properties": {
+                    "id": {"type": "keyword"},
+                    "title": {"type": "text"},
+                    "description": {"type": "text"},
+                    "text_excerpt": {"type": "text"},
+                    "embeddings": {
+                        "type": "knn_vector",
+                        "dimension": 1024
+                    },
+                    "metadata": {"type": "object"},
+                    "created_at": {"type": "date"}
+                }
+            }
+        }
+        self.opensearch.create_index_if_not_exists(self.INDEX_NAME, index_mapping)
+    
+    def sync_job(self, job_data: Dict[str, Any], require_embedding: bool = False) -> Optional[str]:
+        """
+        Index one job record loaded from S3, embedding it if needed
+        
+        Args:
+            job_data: The job record
+            require_embedding: Raise EmbeddingError instead of indexing the
+                job without an embedding (callers that retry failed items)
+        
+        Returns:
+            The job id, or None when the record has no id
+        """
+        job_id = job_data.get("_id") or job_data.get("job_id") or job_data.get("id")
+        if not job_id:
+            return None
+        
+        # Remove _id if present (it's used as doc_id parameter)
+        document = {k: v for k, v in job_data.items() if k != "_id"}
+        if "id" not in document:
+            document["id"] = job_id
+        
+        # Generate embedding if not already present
+        if "embeddings" not in document or not document.get("embeddings"):
+            logger.info(f"Generating embedding for job {job_id}")
+            full_text = f"{document.get('title', '')}\n{document.get('description', '')}"
+            try:
+                embedding = self.bedrock.generate_embedding(full_text)
+                document["embeddings"] = embedding
+                logger.info(f"Generated embedding for job {job_id} (dimension: {len(embedding)})")
+            except Exception as e:
+                logger.error(f"Failed to generate embedding for job {job_id}: {e}")
+                if require_embedding:
+                    raise EmbeddingError(f"Failed to generate embedding for job {job_id}: {str(e)}")
+                # Continue without embedding (will be skipped in vector search)
+        
+        self.opensearch.index_document(
+            index_name=self.INDEX_NAME,
+            doc_id=str(job_id),
+            document=document
+        )
+        return str(job_id)
+    
     def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get job by ID"""
         return self.opensearch.get_document(self.INDEX_NAME, job_id)
+    
+    async def get_job_async(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get job by ID without blocking the event loop"""
+        return await self.async_opensearch.get_document(self.INDEX_NAME, job_id)
 
 
 job_repository = JobRepository()
@@ -0,0 +1,220 @@
+"""
+Resume Catalog Repository
+Listing of all stored resumes, built from the resume index
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+import base64
+import hashlib
+import json
+import threading
+import time
+
+from app.clients.s3_client import s3_client, S3Client
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class ResumeCatalogRepository:
+    """
+    Repository for the resume catalog
+
+    The catalog is the set of resume index entries ({S3_PREFIX}_index/).
+    Refreshing it lists the index prefix (one request per 1000 resumes) and
+    only GETs entries whose ETag changed since the last snapshot, which is
+    kept at {S3_PREFIX}_catalog/resumes.json so fresh processes start warm.
+    The folders the entries point into are listed too: an entry whose
+    object is gone is not shown, and of several entries for one key (an
+    older upload under the same file name) only the newest is.
+    """
+
+    SORT_FIELDS = ("created_at", "name", "size")
+
+    def __init__(self):
+        self.s3 = s3_client
+        self._lock = threading.Lock()
+        self._entries: List[Dict[str, Any]] = []
+        self._visible: List[Dict[str, Any]] = []
+        self._sources: Dict[str, str] = {}  # index key -> ETag of the entry object
+        self._version = ""
+        self._loaded_at = 0.0
+        self._generation = -1
+
+    @staticmethod
+    def _snapshot_key() -> str:
+        return f"{settings.S3_PREFIX}_catalog/resumes.json"
+
+    def catalog(self) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        All catalog entries and a version string that changes with them
+
+        Reuses the in-process copy for RESUME_CATALOG_TTL_SECONDS, or until
+        this process writes to the resume index.
+        """
+        with self._lock:
+            stale = time.time() - self._loaded_at >= settings.RESUME_CATALOG_TTL_SECONDS
+            if stale or self._generation != S3Client.resume_index_generation:
+                self._refresh()
+            return self._visible, self._version
+
+    def _refresh(self) -> None:
+        generation = S3Client.resume_index_generation
+        if not self._sources:
+            snapshot = self.s3.get_json(self._snapshot_key())
+            if snapshot:
+                self._sources = snapshot.get("sources", {})
+                self._entries = snapshot.get("entries", [])
+
+        index_prefix = f"{settings.S3_PREFIX}_index/"
+        listed = {
+            obj["Key"]: obj.get("ETag", "").strip('"')
+            for obj in self.s3.list_objects(index_prefix)
+            if obj["Key"].endswith(".json")
+        }
+        by_key = {self.s3.resume_index_key(entry["resume_id"]): entry for entry in self._entries}
+        changed = [key for key, etag in listed.items() if self._sources.get(key) != etag or key not in by_key]
+
+        if changed:
+            with ThreadPoolExecutor(max_workers=min(16, len(changed))) as pool:
+                for key, entry in zip(changed, pool.map(self.s3.get_json, changed)):
+                    if entry:
+                        by_key[key] = entry
+                    else:
+                        listed.pop(key, None)
+
+        dirty = bool(changed) or listed.keys() != self._sources.keys()
+        self._sources = listed
+        self._entries = [by_key[key] for key in sorted(listed) if key in by_key]
+
+        stored = self._stored_objects(self._entries)
+        self._visible = self._current_entries(self._entries, stored)
+        self._version = hashlib.sha1(
+            json.dumps([sorted(listed.items()), sorted(stored.items())]).encode("utf-8")
+        ).hexdigest()[:16]
+        self._loaded_at = time.time()
+        self._generation = generation
+
+        if dirty:
+            self.s3.put_json(
+                self._snapshot_key(),
+                {"sources": self._sources, "entries": self._entries},
+                compress=True
+            )
+            logger.info(f"Resume catalog refreshed: {len(self._entries)} resumes, {len(changed)} entries read")
+
+    def _stored_objects(self, entries: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Key -> ETag of every object in the folders the entries point into"""
+        folders = {entry["s3_key"].rsplit("/", 1)[0] + "/" for entry in entries if "/" in entry["s3_key"]}
+        return {
+            obj["Key"]: obj.get("ETag", "").strip('"')
+            for folder in sorted(folders)
+            for obj in self.s3.list_objects(folder)
+        }
+
+    @staticmethod
+    def _current_entries(entries: List[Dict[str, Any]], stored: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Entries whose object still exists, the newest per key"""
+        newest: Dict[str, Dict[str, Any]] = {}
+        for entry in entries:
+            key = entry["s3_key"]
+            if key not in stored:
+                continue
+            current = newest.get(key)
+            if current is None or (entry.get("uploaded_at") or "", entry.get("indexed_at") or "") > (
+                current.get("uploaded_at") or "", current.get("indexed_at") or ""
+            ):
+                newest[key] = entry
+        return [entry for entry in entries if newest.get(entry["s3_key"]) is entry]
+
+    @staticmethod
+    def _to_item(entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "resume_id": entry["resume_id"],
+            "name": entry.get("file_name") or entry["s3_key"].split("/")[-1],
+            "s3_key": entry["s3_key"],
+            "s3_url": f"s3://{settings.S3_BUCKET_NAME}/{entry['s3_key']}",
+            "created_at": entry.get("uploaded_at") or entry.get("indexed_at", ""),
+            "size": entry.get("size", 0)
+        }
+
+    @staticmethod
+    def encode_cursor(sort_key: List[Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(sort_key).encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> List[Any]:
+        """Raises ValueError for cursors not produced by encode_cursor"""
+        try:
+            sort_key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        except Exception:
+            raise ValueError("Invalid cursor")
+        if not isinstance(sort_key, list) or len(sort_key) != 2:
+            raise ValueError("Invalid cursor")
+        return sort_key
+
+    def list_resumes(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        sort: str = "created_at",
+        order: str = "desc",
+        q: Optional[str] = None,
+        file_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        One page of the catalog
+
+        Args:
+            limit: Page size; None returns every matching resume
+            cursor: next_cursor of the previous page (same sort and filters)
+            sort: created_at, name or size
+            order: asc or desc
+            q: Case-insensitive substring of the file name
+            file_type: File extension, e.g. "pdf"
+
+        Returns:
+            dict with keys: resumes, total (matching resumes), next_cursor, version
+        """
+        if sort not in self.SORT_FIELDS:
+            raise ValueError(f"sort must be one of {', '.join(self.SORT_FIELDS)}")
+        entries, version = self.catalog()
+
+        items = [self._to_item(entry) for entry in entries]
+        if q:
+            needle = q.casefold()
+            items = [item for item in items if needle in item["name"].casefold()]
+        if file_type:
+            suffix = "." + file_type.lower().lstrip(".")
+            items = [item for item in items if item["name"].lower().endswith(suffix)]
+
+        def sort_key(item: Dict[str, Any]) -> List[Any]:
+            value = item["name"].casefold() if sort == "name" else item[sort]
+            return [value, item["resume_id"]]
+
+        reverse = order == "desc"
+        items.sort(key=sort_key, reverse=reverse)
+        total = len(items)
+
+        if cursor:
+            after = self.decode_cursor(cursor)
+            try:
+                items = [item for item in items if (sort_key(item) < after if reverse else sort_key(item) > after)]
+            except TypeError:
+                raise ValueError("Invalid cursor")
+
+        next_cursor = None
+        if limit is not None and len(items) > limit:
+            items = items[:limit]
+            next_cursor = self.encode_cursor(sort_key(items[-1]))
+
+        return {
+            "resumes": items,
+            "total": total,
+            "next_cursor": next_cursor,
+            "version": version
+        }
+
+
+resume_catalog_repository = ResumeCatalogRepository()
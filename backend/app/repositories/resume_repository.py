@@ -2,16 +2,22 @@
 Resume Repository
 Data access layer for resume operations
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union, BinaryIO
+import os
 from datetime import datetime
 import uuid
 
 from app.clients.opensearch_client import opensearch_client
+from app.clients.async_opensearch_client import async_opensearch_client
 from app.clients.s3_client import s3_client
 from app.clients.bedrock_client import bedrock_client
 from app.services.file_processor import file_processor
+from app.services.extraction_service import extraction_service
+from app.repositories.dedup_repository import dedup_repository
+from app.repositories.extraction_repository import extraction_repository
+from app.core.config import settings
 from app.core.logging import get_logger
-from app.core.exceptions import OpenSearchError, EmbeddingError
+from app.core.exceptions import OpenSearchError, EmbeddingError, FileProcessingError
 
 logger = get_logger(__name__)
 
@@ -23,9 +29,13 @@ class ResumeRepository:
     
     def __init__(self):
         self.opensearch = opensearch_client
+        self.async_opensearch = async_opensearch_client
         self.s3 = s3_client
         self.bedrock = bedrock_client
         self.file_processor = file_processor
+        self.extraction = extraction_service
+        self.dedup = dedup_repository
+        self.extractions = extraction_repository
     
     def create_resume(
         self,
@@ -44,18 +54,90 @@ class ResumeRepository:
         Returns:
             Created resume document
         """
+        # Identical bytes seen before resolve to the existing resume
+        content_hash = self.dedup.content_hash(file_content)
+        record = self.dedup.lookup(content_hash)
+        if record:
+            duplicate = self._resolve_duplicate(record, file_name)
+            if duplicate:
+                return duplicate
+        
+        # Extract in the worker pool so a bad file cannot block this thread.
+        # Only the first pages are needed to embed; the rest is parsed meanwhile.
+        partial = self.extraction.extract_preview(file_content, file_name, settings.EMBEDDING_TEXT_BUDGET)
+        embedding = self.bedrock.generate_embedding(partial.text)
+        return self._create_resume_from_extraction(
+            file_content, file_name, partial.full_document(), metadata,
+            embedding=embedding, content_hash=content_hash, dedup_record=record
+        )
+    
+    def _resolve_duplicate(self, record: Dict[str, Any], file_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Answer an upload of already-seen content from the existing resume
+        
+        Nothing is written. Returns None when the content is
+        in S3 but was never processed (e.g. uploaded via upload_to_s3), so
+        the caller still extracts and embeds it.
+        """
+        existing = self.get_resume(record["resume_id"])
+        if not existing or not existing.get("embeddings"):
+            return None
+        
+        self.dedup.log_duplicate(record, file_name)
+        return {
+            "resume_id": record["resume_id"],
+            "s3_url": existing.get("s3_url", f"s3://{settings.S3_BUCKET_NAME}/{record['s3_key']}"),
+            "name": file_name,
+            "created_at": existing.get("created_at", record["created_at"]),
+            "deduplicated": True
+        }
+    
+    def _create_resume_from_extraction(
+        self,
+        file_content: Union[bytes, BinaryIO],
+        file_name: str,
+        extraction: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]] = None,
+        embedding: Optional[List[float]] = None,
+        content_hash: Optional[str] = None,
+        dedup_record: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Upload, embed and index a resume that is already extracted"""
         try:
-            # 1. Upload to S3
-            upload_result = self.s3.upload_file(file_content, file_name)
+            text = extraction["text"]
+            content_hash = content_hash or self.dedup.content_hash(file_content)
+            
+            # 1. Upload to S3 (content already stored under a dedup record is reused)
+            if dedup_record:
+                upload_result = {
+                    "file_id": dedup_record["resume_id"],
+                    "s3_key": dedup_record["s3_key"],
+                    "s3_url": f"s3://{settings.S3_BUCKET_NAME}/{dedup_record['s3_key']}"
+                }
+            else:
+                if isinstance(file_content, (bytes, bytearray)):
+                    upload_result = self.s3.upload_file(
+                        file_content, file_name, extra_metadata={"content_sha256": content_hash}
+                    )
+                else:
+                    # Spooled upload: stream it to S3 as a multipart upload
+                    upload_result = self.s3.upload_fileobj(
+                        file_content, file_name, extra_metadata={"content_sha256": content_hash}
+                    )
+                self.dedup.record(content_hash, upload_result["file_id"], upload_result["s3_key"], file_name)
             resume_id = upload_result["file_id"]
             
-            # 2. Extract text
-            text = self.file_processor.extract_text(file_content, file_name)
+            # Persist the extraction so later reads of this file skip parsing
+            self.extractions.save(
+                upload_result["s3_key"], extraction, etag=upload_result.get("etag"),
+                size=self._content_size(file_content)
+            )
             
-            # 3. Generate embedding
-            embedding = self.bedrock.generate_embedding(text)
+            # 2. Generate embedding (unless the caller already did)
+            if embedding is None:
+                embedding = self.bedrock.generate_embedding(text)
             
-            # 4. Create document
+            # 3. Create document
             document = {
                 "id": resume_id,
                 "name": file_name,
@@ -65,10 +147,11 @@ class ResumeRepository:
                 "metadata": metadata or {},
                 "s3_url": upload_result["s3_url"],
                 "s3_key": upload_result["s3_key"],
+                "content_hash": content_hash,
                 "created_at": datetime.utcnow().isoformat()
             }
             
-            # 5. Index in OpenSearch
+            # 4. Index in OpenSearch
             self.opensearch.index_document(
                 index_name=self.INDEX_NAME,
                 doc_id=resume_id,
@@ -80,13 +163,29 @@ class ResumeRepository:
                 "resume_id": resume_id,
                 "s3_url": upload_result["s3_url"],
                 "name": file_name,
-                "created_at": document["created_at"]
+                "created_at": document["created_at"],
+                "deduplicated": dedup_record is not None
             }
             
         except Exception as e:
             logger.error(f"Error creating resume: {e}")
             raise
     
+    @staticmethod
+    def _content_size(file_content: Union[bytes, BinaryIO]) -> int:
+        if isinstance(file_content, (bytes, bytearray)):
+            return len(file_content)
+        size = file_content.seek(0, os.SEEK_END)
+        file_content.seek(0)
+        return size
+    
+    @staticmethod
+    def _read_content(file_content: Union[bytes, BinaryIO]) -> bytes:
+        if isinstance(file_content, (bytes, bytearray)):
+            return file_content
+        file_content.seek(0)
+        return file_content.read()
+    
     def bulk_create_resumes(
         self,
         files: List[tuple]  # List of (file_content, file_name) tuples
@@ -94,30 +193,150 @@ class ResumeRepository:
         """
         Bulk create resumes
         
+        file_content may be bytes or a seekable file object (e.g. an
+        UploadFile spool). File objects are hashed in chunks, read only
+        when an extraction worker is free to take them, and streamed to
+        S3, so peak memory is bounded by the number of workers rather
+        than by the size of the batch.
+        
         Args:
             files: List of (file_content, file_name) tuples
             
         Returns:
             List of created resume documents
         """
-        results = []
-        for file_content, file_name in files:
+        results = [None] * len(files)
+        hashes = [self.dedup.content_hash(file_content) for file_content, _ in files]
+        first_index_by_hash = {}
+        dedup_records = {}
+        to_extract = []
+        
+        # Resolve content seen in earlier uploads (or earlier in this batch) before extracting
+        for index, (_, file_name) in enumerate(files):
+            content_hash = hashes[index]
+            if content_hash in first_index_by_hash:
+                continue
+            first_index_by_hash[content_hash] = index
+            record = self.dedup.lookup(content_hash)
+            if record:
+                duplicate = self._resolve_duplicate(record, file_name)
+                if duplicate:
+                    results[index] = duplicate
+                    continue
+                dedup_records[index] = record
+            to_extract.append(index)
+        
+        # Extraction runs on all cores; results arrive in completion order.
+        # Contents are read lazily, one per free worker.
+        pending = ((self._read_content(files[i][0]), files[i][1]) for i in to_extract)
+        for extracted in self.extraction.extract_many(pending):
+            index = to_extract[extracted["index"]]
+            file_content, file_name = files[index]
+            if extracted["error"]:
+                logger.error(f"Error extracting resume {file_name}: {extracted['error']}")
+                results[index] = {
+                    "error": f"File processing error: {extracted['error']}",
+                    "file_name": file_name
+                }
+                continue
             try:
-                result = self.create_resume(file_content, file_name)
-                results.append(result)
+                results[index] = self._create_resume_from_extraction(
+                    file_content, file_name, extracted["document"],
+                    content_hash=hashes[index], dedup_record=dedup_records.get(index)
+                )
             except Exception as e:
                 logger.error(f"Error creating resume {file_name}: {e}")
-                results.append({
+                results[index] = {
                     "error": str(e),
                     "file_name": file_name
-                })
+                }
+        
+        # Repeats within this batch share the result of the first copy
+        for index, (_, file_name) in enumerate(files):
+            first = results[first_index_by_hash[hashes[index]]]
+            if results[index] is not None:
+                continue
+            if "error" in first:
+                results[index] = {**first, "file_name": file_name}
+                continue
+            record = self.dedup.lookup(hashes[index])
+            if record:
+                self.dedup.log_duplicate(record, file_name)
+            results[index] = {**first, "name": file_name, "deduplicated": True}
         
         return results
     
+    def stage_resume(self, file_content: Union[bytes, BinaryIO], file_name: str) -> Dict[str, Any]:
+        """
+        Store an upload in S3 for background processing
+        
+        Content seen before comes back as a finished (deduplicated) result.
+        Anything else is uploaded and returned as {"staged": True, ...};
+        process_staged_resume finishes it later.
+        """
+        content_hash = self.dedup.content_hash(file_content)
+        record = self.dedup.lookup(content_hash)
+        if record:
+            duplicate = self._resolve_duplicate(record, file_name)
+            if duplicate:
+                return duplicate
+        else:
+            metadata = {"content_sha256": content_hash}
+            if isinstance(file_content, (bytes, bytearray)):
+                upload_result = self.s3.upload_file(file_content, file_name, extra_metadata=metadata)
+            else:
+                upload_result = self.s3.upload_fileobj(file_content, file_name, extra_metadata=metadata)
+            record = self.dedup.record(content_hash, upload_result["file_id"], upload_result["s3_key"], file_name)
+        
+        return {
+            "staged": True,
+            "resume_id": record["resume_id"],
+            "s3_key": record["s3_key"],
+            "content_hash": content_hash,
+            "name": file_name
+        }
+    
+    def process_staged_resume(self, content_hash: str, file_name: str) -> Dict[str, Any]:
+        """
+        Extract, embed and index a resume stored by stage_resume
+        
+        Safe to retry: a resume that is already indexed is returned as is.
+        """
+        record = self.dedup.lookup(content_hash)
+        if not record:
+            raise FileProcessingError(f"No staged upload for {file_name}")
+        
+        existing = self.get_resume(record["resume_id"])
+        if existing and existing.get("embeddings"):
+            return {
+                "resume_id": record["resume_id"],
+                "s3_url": existing.get("s3_url", f"s3://{settings.S3_BUCKET_NAME}/{record['s3_key']}"),
+                "name": file_name,
+                "created_at": existing.get("created_at", record["created_at"]),
+                "deduplicated": False
+            }
+        
+        file_content = self.s3.get_file(record["s3_key"])
+        if file_content is None:
+            raise FileProcessingError(f"Staged upload {record['s3_key']} not found in S3")
+        
+        partial = self.extraction.extract_preview(file_content, file_name, settings.EMBEDDING_TEXT_BUDGET)
+        embedding = self.bedrock.generate_embedding(partial.text)
+        result = self._create_resume_from_extraction(
+            file_content, file_name, partial.full_document(),
+            embedding=embedding, content_hash=content_hash, dedup_record=record
+        )
+        result["deduplicated"] = False
+        return result
+    
     def get_resume(self, resume_id: str) -> Optional[Dict[str, Any]]:
         """Get resume by ID"""
         return self.opensearch.get_document(self.INDEX_NAME, resume_id)
     
+    async def get_resume_async(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        """Get resume by ID without blocking the event loop"""
+        return await self.async_opensearch.get_document(self.INDEX_NAME, resume_id)
+    
     def get_resume_from_s3(self, resume_id: str) -> Optional[Dict[str, Any]]:
         """
         Get resume from S3 and process it (extract text, generate embedding)
@@ -134,48 +353,33 @@ class ResumeRepository:
             # 2. If not in OpenSearch, get from S3 and process
             logger.info(f"Resume {resume_id} not in OpenSearch, processing from S3...")
             
-            # Get S3 key from resume_id (assuming format: resumes/{resume_id}/filename)
-            # We need to find the file in S3
             from app.core.config import settings
             
-            # Use s3_client if available, otherwise use boto3 directly
-            if hasattr(self.s3, 'client') and self.s3.client:
-                s3_client_boto = self.s3.client
-            else:
-                import boto3
-                s3_client_boto = boto3.client('s3', region_name=settings.AWS_REGION)
-            
-            # Get file from Candidate folder (structure: resumes/Candidate/{filename})
-            # We need to find the file by resume_id in metadata or by searching
-            # Since we store resume_id in metadata, we'll search in Candidate folder
-            candidate_prefix = f"{settings.S3_PREFIX}Candidate/"
-            
-            # List all files in Candidate folder and find by resume_id in metadata
-            response = s3_client_boto.list_objects_v2(
-                Bucket=settings.S3_BUCKET_NAME,
-                Prefix=candidate_prefix
-            )
+            # Storage backend behind s3_client (pooled S3 client, or local/in-memory offline)
+            s3_client_boto = self.s3.client
             
+            # Look the object up in the resume index (one GET, see S3Client.index_resume)
             s3_key = None
             file_name = None
+            etag = None
             
-            if 'Contents' in response:
-                for obj in response['Contents']:
-                    # Check metadata for resume_id
-                    try:
-                        obj_metadata = s3_client_boto.head_object(
-                            Bucket=settings.S3_BUCKET_NAME,
-                            Key=obj['Key']
-                        )
-                        metadata = obj_metadata.get('Metadata', {})
-                        if metadata.get('resume_id') == resume_id:
-                            s3_key = obj['Key']
-                            file_name = obj['Key'].split('/')[-1]
-                            break
-                    except:
-                        continue
-            
-            # If not found by metadata, try to get from OpenSearch document if available
+            entry = self.s3.lookup_resume(resume_id)
+            if entry:
+                s3_key = entry['s3_key']
+                file_name = entry.get('file_name') or s3_key.split('/')[-1]
+                # The key may since hold another upload of the same name (or nothing):
+                # then this entry is stale, rather than a reason to index that content here
+                head = self.s3.head_file(s3_key)
+                stored_id = (head or {}).get('Metadata', {}).get('resume_id')
+                etag = (head or {}).get('ETag', '').strip('"') or None
+                if head is None or (stored_id and stored_id != resume_id) or (
+                    entry.get('etag') and etag and entry['etag'] != etag
+                ):
+                    logger.warning(f"Index entry of resume {resume_id} is stale ({s3_key} was replaced or deleted)")
+                    self.s3.unindex_resume(resume_id)
+                    return None
+            
+            # If not indexed, try to get from OpenSearch document if available
             if not s3_key:
                 # Try to get s3_key from OpenSearch document
                 resume_doc = self.opensearch.get_document(self.INDEX_NAME, resume_id)
@@ -183,21 +387,29 @@ class ResumeRepository:
                     s3_key = resume_doc['s3_key']
                     file_name = s3_key.split('/')[-1]
                 else:
-                    logger.error(f"Resume {resume_id} not found in S3 Candidate folder")
+                    logger.error(f"Resume {resume_id} not found in the resume index")
                     return None
             
-            # Download file from S3
-            file_obj = s3_client_boto.get_object(
-                Bucket=settings.S3_BUCKET_NAME,
-                Key=s3_key
-            )
-            file_content = file_obj['Body'].read()
-            
-            # 3. Extract text
-            text = self.file_processor.extract_text(file_content, file_name)
-            
-            # 4. Generate embedding
-            embedding = self.bedrock.generate_embedding(text)
+            # 3. Use the persisted extraction when there is one; otherwise download and parse
+            extraction = self.extractions.load(s3_key, etag=etag)
+            if extraction:
+                text = extraction["text"]
+                embedding = self.bedrock.generate_embedding(text[:settings.EMBEDDING_TEXT_BUDGET])
+            else:
+                file_obj = s3_client_boto.get_object(
+                    Bucket=settings.S3_BUCKET_NAME,
+                    Key=s3_key
+                )
+                file_content = file_obj['Body'].read()
+                
+                # Extract the first pages and embed them while the rest is parsed
+                partial = self.extraction.extract_preview(file_content, file_name, settings.EMBEDDING_TEXT_BUDGET)
+                
+                # 4. Generate embedding
+                embedding = self.bedrock.generate_embedding(partial.text)
+                extraction = partial.full_document()
+                text = extraction["text"]
+                self.extractions.save(s3_key, extraction, etag=file_obj.get('ETag'), size=len(file_content))
             
             # 5. Create document
             document = {
@@ -0,0 +1,77 @@
+"""
+Ingestion Router
+Submits background ingestion jobs and reports their progress
+"""
+from fastapi import APIRouter, UploadFile, File, HTTPException, status
+from typing import List
+
+from app.services.ingestion_service import ingestion_service
+from app.repositories.ingestion_job_repository import ingestion_job_repository
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+router = APIRouter()
+
+
+def _accepted(job: dict) -> dict:
+    return {
+        "job_id": job["job_id"],
+        "kind": job["kind"],
+        "total": job["total"],
+        "status_url": f"/api/ingestion/{job['job_id']}"
+    }
+
+
+@router.post("/resumes", status_code=status.HTTP_202_ACCEPTED)
+async def submit_resume_ingestion(files: List[UploadFile] = File(...)):
+    """
+    Queue resumes for background processing
+    
+    Files are stored in S3 right away; extraction, embedding and indexing
+    run in ingestion workers. Poll status_url for progress.
+    """
+    try:
+        file_data = [(file.file, file.filename) for file in files if file.filename]
+        if not file_data:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No files provided"
+            )
+        
+        job = ingestion_service.submit_resume_upload(file_data)
+        return _accepted(job)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Resume ingestion submit error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to submit resume ingestion: {str(e)}"
+        )
+
+
+@router.post("/jobs/sync_from_s3", status_code=status.HTTP_202_ACCEPTED)
+async def submit_job_sync():
+    """Queue every job stored in S3 for embedding and indexing"""
+    try:
+        job = ingestion_service.submit_job_sync()
+        return _accepted(job)
+    except Exception as e:
+        logger.error(f"Job sync submit error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to submit job sync: {str(e)}"
+        )
+
+
+@router.get("/{job_id}")
+async def get_ingestion_status(job_id: str):
+    """Status, progress counters and per-item results of an ingestion job"""
+    job = ingestion_job_repository.get_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Ingestion job {job_id} not found"
+        )
+    return job
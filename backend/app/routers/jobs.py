@@ -2,6 +2,7 @@
 Job Router
 Handles job creation and search operations
 """
+import asyncio
 import json
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel
@@ -67,6 +68,7 @@ async def list_jobs():
                 if settings.USE_MOCK:
                     from app.clients.opensearch_client import opensearch_client
                     opensearch_client._mock_data_storage["jobs_index"] = []
+                    opensearch_client.invalidate_index("jobs_index")
                     logger.info("Cleared mock storage jobs_index")
         except Exception as s3_error:
             logger.error(f"Error loading jobs from S3: {s3_error}")
@@ -74,6 +76,7 @@ async def list_jobs():
             if settings.USE_MOCK:
                 from app.clients.opensearch_client import opensearch_client
                 opensearch_client._mock_data_storage["jobs_index"] = []
+                opensearch_client.invalidate_index("jobs_index")
                 logger.info("Cleared mock storage jobs_index due to error")
         
         logger.info(f"Listed {len(result)} jobs")
@@ -146,70 +149,25 @@ async def sync_jobs_from_s3():
             }
         
         # Ensure index exists
-        index_mapping = {
-            "mappings": {
-                "properties": {
-                    "id": {"type": "keyword"},
-                    "title": {"type": "text"},
-                    "description": {"type": "text"},
-                    "text_excerpt": {"type": "text"},
-                    "embeddings": {
-                        "type": "knn_vector",
-                        "dimension": 1024
-                    },
-                    "metadata": {"type": "object"},
-                    "created_at": {"type": "date"}
-                }
-            }
-        }
-        opensearch_client.create_index_if_not_exists("jobs_index", index_mapping)
+        job_repository.ensure_index()
         
         # Index each job to OpenSearch
         synced_count = 0
         skipped_count = 0
-        from app.clients.bedrock_client import bedrock_client
         
         for job_data in jobs_data:
             try:
-                # Extract job ID and document
-                job_id = job_data.get("_id") or job_data.get("job_id") or job_data.get("id")
-                
-                if not job_id:
+                if job_repository.sync_job(job_data):
+                    synced_count += 1
+                else:
                     skipped_count += 1
-                    continue
-                
-                # Prepare document for indexing
-                # Remove _id if present (it's used as doc_id parameter)
-                document = {k: v for k, v in job_data.items() if k != "_id"}
-                
-                # Ensure required fields exist
-                if "id" not in document:
-                    document["id"] = job_id
-                
-                # Generate embedding if not already present
-                if "embeddings" not in document or not document.get("embeddings"):
-                    logger.info(f"Generating embedding for job {job_id}")
-                    full_text = f"{document.get('title', '')}\n{document.get('description', '')}"
-                    try:
-                        embedding = bedrock_client.generate_embedding(full_text)
-                        document["embeddings"] = embedding
-                        logger.info(f"Generated embedding for job {job_id} (dimension: {len(embedding)})")
-                    except Exception as e:
-                        logger.error(f"Failed to generate embedding for job {job_id}: {e}")
-                        # Continue without embedding (will be skipped in vector search)
-                
-                # Index to OpenSearch
-                opensearch_client.index_document(
-                    index_name="jobs_index",
-                    doc_id=str(job_id),
-                    document=document
-                )
-                synced_count += 1
-                
             except Exception as e:
                 logger.error(f"Failed to sync job {job_data.get('_id', job_data.get('job_id', 'unknown'))}: {e}")
                 skipped_count += 1
         
+        # Drop cached searches once the whole batch is visible
+        opensearch_client.invalidate_index("jobs_index")
+        
         logger.info(f"Synced {synced_count} jobs from S3 to OpenSearch (skipped: {skipped_count})")
         return {
             "message": f"Successfully synced {synced_count} jobs from S3 to OpenSearch",
@@ -238,12 +196,12 @@ async def search_jobs_by_resume(request: SearchByResumeRequest):
     """
     try:
         # Get resume (will fetch from S3 and process if needed)
-        resume = resume_repository.get_resume(request.resume_id)
+        resume = await resume_repository.get_resume_async(request.resume_id)
         
         # If not found in OpenSearch, try to get from S3 and process
         if not resume:
             logger.info(f"Resume {request.resume_id} not in OpenSearch, fetching from S3...")
-            resume = resume_repository.get_resume_from_s3(request.resume_id)
+            resume = await asyncio.to_thread(resume_repository.get_resume_from_s3, request.resume_id)
         
         if not resume:
             raise HTTPException(
@@ -261,7 +219,7 @@ async def search_jobs_by_resume(request: SearchByResumeRequest):
             )
         
         # Search jobs
-        results = matching_service.search_jobs_by_resume(
+        results = await matching_service.search_jobs_by_resume(
             resume_text=resume_text,
             resume_id=request.resume_id
         )
@@ -0,0 +1,23 @@
+"""
+Metrics Router
+"""
+from fastapi import APIRouter
+
+from app.core.config import settings
+from app.core.tracing import latency_stats
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    Rolling latency percentiles of this process
+
+    Per stage (extract_text, generate_embedding, vector_search,
+    rerank_candidates, s3_*) and per route ("POST /api/jobs/search").
+    """
+    return {
+        "window_seconds": settings.TRACING_WINDOW_SECONDS,
+        "latency": latency_stats.snapshot()
+    }
@@ -2,13 +2,14 @@
 Resume Router
 Handles resume upload and search operations
 """
-from fastapi import APIRouter, UploadFile, File, HTTPException, status, Query
+from fastapi import APIRouter, UploadFile, File, HTTPException, status, Query, Request, Response
 from fastapi.responses import JSONResponse
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel
 from datetime import datetime
+import asyncio
+import hashlib
 import os
-import uuid
 
 from app.repositories.resume_repository import resume_repository
 from app.services.matching_service import matching_service
@@ -24,6 +25,7 @@ class ResumeUploadResponse(BaseModel):
     s3_url: str
     name: str
     created_at: str
+    deduplicated: bool = False
 
 
 class BulkUploadResponse(BaseModel):
@@ -53,15 +55,31 @@ async def upload_resume_to_s3(file: UploadFile = File(...)):
         
         # Upload to S3 only (no processing)
         from app.clients.s3_client import s3_client
-        from datetime import datetime
+        from app.repositories.dedup_repository import dedup_repository
+        from app.core.config import settings
+        
+        # Same bytes already uploaded: point at the existing resume instead of storing again
+        content_hash = dedup_repository.content_hash(file_content)
+        record = dedup_repository.lookup(content_hash)
+        if record:
+            dedup_repository.log_duplicate(record, file.filename)
+            return {
+                "resume_id": record["resume_id"],
+                "s3_url": f"s3://{settings.S3_BUCKET_NAME}/{record['s3_key']}",
+                "name": file.filename,
+                "created_at": record["created_at"],
+                "deduplicated": True
+            }
         
         upload_result = s3_client.upload_file(
             file_content=file_content,
             file_name=file.filename,
-            content_type=file.content_type or "application/pdf"
+            content_type=file.content_type or "application/pdf",
+            extra_metadata={"content_sha256": content_hash}
         )
         
         resume_id = upload_result["file_id"]
+        dedup_repository.record(content_hash, resume_id, upload_result["s3_key"], file.filename)
         
         logger.info(f"Uploaded resume to S3: {resume_id}")
         return {
@@ -120,84 +138,48 @@ async def upload_resume(file: UploadFile = File(...)):
 
 
 @router.get("/list")
-async def list_resumes():
+async def list_resumes(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, description="Page size (all resumes when omitted)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    sort: Literal["created_at", "name", "size"] = Query("created_at"),
+    order: Literal["asc", "desc"] = Query("desc"),
+    q: Optional[str] = Query(None, description="Filter by file name substring"),
+    file_type: Optional[str] = Query(None, description="Filter by file extension, e.g. pdf")
+):
     """
-    List all resumes from S3
+    List resumes from the resume catalog
     
-    Returns list of resumes that have been uploaded to S3
+    Served from the resume index rather than one HEAD request per object.
+    Responses carry an ETag; a matching If-None-Match gets 304 Not Modified.
     """
     try:
-        from app.clients.s3_client import s3_client
+        from app.repositories.resume_catalog_repository import resume_catalog_repository
         from app.core.config import settings
-        import boto3
-        
-        # Use s3_client if available, otherwise use boto3 directly
-        if hasattr(s3_client, 'client') and s3_client.client:
-            s3_client_boto = s3_client.client
-        else:
-            s3_client_boto = boto3.client('s3', region_name=settings.AWS_REGION)
-        
-        # List all resume files from Candidate folder (structure: resumes/Candidate/{filename})
-        candidate_prefix = f"{settings.S3_PREFIX}Candidate/"
-        resumes = []
         
-        paginator = s3_client_boto.get_paginator('list_objects_v2')
-        pages = paginator.paginate(
-            Bucket=settings.S3_BUCKET_NAME,
-            Prefix=candidate_prefix
+        page = resume_catalog_repository.list_resumes(
+            limit=min(limit, settings.RESUME_LIST_MAX_LIMIT) if limit else None,
+            cursor=cursor,
+            sort=sort,
+            order=order,
+            q=q,
+            file_type=file_type
         )
         
-        for page in pages:
-            if 'Contents' in page:
-                for obj in page['Contents']:
-                    file_key = obj['Key']
-                    file_name = file_key.split('/')[-1]
-                    
-                    # Skip folders
-                    if file_key.endswith('/'):
-                        continue
-                    
-                    # Get file metadata to extract resume_id
-                    try:
-                        file_obj = s3_client_boto.head_object(
-                            Bucket=settings.S3_BUCKET_NAME,
-                            Key=file_key
-                        )
-                        
-                        # Get resume_id from metadata
-                        metadata = file_obj.get('Metadata', {})
-                        resume_id = metadata.get('resume_id', '')
-                        
-                        # If no resume_id in metadata, generate one from filename or use timestamp
-                        if not resume_id:
-                            # Try to extract from filename or generate new ID
-                            resume_id = str(uuid.uuid4())
-                            logger.warning(f"No resume_id in metadata for {file_key}, generated: {resume_id}")
-                        
-                        last_modified = file_obj.get('LastModified', '')
-                        if hasattr(last_modified, 'isoformat'):
-                            created_at = last_modified.isoformat()
-                        else:
-                            created_at = str(last_modified) if last_modified else datetime.utcnow().isoformat()
-                        
-                        resumes.append({
-                            "resume_id": resume_id,
-                            "name": file_name,
-                            "s3_key": file_key,
-                            "s3_url": f"s3://{settings.S3_BUCKET_NAME}/{file_key}",
-                            "created_at": created_at,
-                            "size": file_obj.get('ContentLength', 0)
-                        })
-                    except Exception as e:
-                        logger.warning(f"Failed to get metadata for {file_key}: {e}")
-                        continue
+        etag = '"' + hashlib.sha1(f"{page.pop('version')}?{request.url.query}".encode("utf-8")).hexdigest()[:20] + '"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match", "")
+        if if_none_match.strip() == "*" or etag in if_none_match:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
         
-        logger.info(f"Listed {len(resumes)} resumes from S3")
-        return {
-            "resumes": resumes,
-            "total": len(resumes)
-        }
+        logger.info(f"Listed {len(page['resumes'])} of {page['total']} resumes from the catalog")
+        return JSONResponse(content=page, headers=headers)
         
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"List resumes error: {e}")
         raise HTTPException(
@@ -220,12 +202,12 @@ async def bulk_upload_resumes(files: List[UploadFile] = File(...)):
                 detail="No files provided"
             )
         
-        # Read all files
+        # Hand over the spooled files themselves; contents are read lazily and
+        # streamed to S3, so memory does not grow with the size of the batch
         file_data = []
         for file in files:
             if file.filename:
-                content = await file.read()
-                file_data.append((content, file.filename))
+                file_data.append((file.file, file.filename))
         
         # Bulk create
         results = resume_repository.bulk_create_resumes(file_data)
@@ -266,7 +248,7 @@ async def search_resumes_by_job(
     try:
         # Get job description from repository
         from app.repositories.job_repository import job_repository
-        job = job_repository.get_job(job_id)
+        job = await job_repository.get_job_async(job_id)
         if not job:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -279,14 +261,15 @@ async def search_resumes_by_job(
         if request and request.resume_ids:
             resume_ids = request.resume_ids
             # Process resumes from S3 if needed
-            for resume_id in resume_ids:
-                resume = resume_repository.get_resume(resume_id)
-                if not resume:
+            async def ensure_processed(resume_id: str) -> None:
+                if not await resume_repository.get_resume_async(resume_id):
                     logger.info(f"Resume {resume_id} not in OpenSearch, fetching from S3...")
-                    resume = resume_repository.get_resume_from_s3(resume_id)
+                    await asyncio.to_thread(resume_repository.get_resume_from_s3, resume_id)
+            
+            await asyncio.gather(*(ensure_processed(resume_id) for resume_id in resume_ids))
         
         # Search resumes
-        results = matching_service.search_resumes_by_job(
+        results = await matching_service.search_resumes_by_job(
             job_description=job_description,
             job_id=job_id,
             resume_ids=resume_ids
@@ -0,0 +1,372 @@
+"""
+Extraction Service
+Runs text extraction in a pool of worker processes so a pathological
+document cannot pin the request thread or bloat the API process
+"""
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from contextlib import closing
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing.connection import wait
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.exceptions import FileProcessingError
+from app.core.tracing import traced
+
+logger = get_logger(__name__)
+
+_ERROR_PREFIX = "File processing error: "
+
+
+def _error_message(error: Exception) -> str:
+    """Error text without the FileProcessingError prefix, so it can be re-raised cleanly"""
+    message = str(getattr(error, "detail", error))
+    return message[len(_ERROR_PREFIX):] if message.startswith(_ERROR_PREFIX) else message
+
+
+def _current_memory_mb() -> Tuple[Optional[float], Optional[float]]:
+    """(virtual, resident) size of this process in MB, or None where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            vm_pages, rss_pages = f.read().split()[:2]
+        page_mb = os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+        return int(vm_pages) * page_mb, int(rss_pages) * page_mb
+    except (OSError, ValueError, AttributeError):
+        return None, None
+
+
+def _worker_main(conn, max_tasks: int, max_memory_mb: int) -> None:
+    """
+    Worker process loop
+
+    Receives (file_content, file_name, max_chars) tuples and replies with
+    (document, error, retiring), document being FileProcessor.extract_document output. The worker retires itself after max_tasks
+    documents or once its resident memory grows past max_memory_mb.
+    """
+    from app.services.file_processor import FileProcessor
+
+    vm_mb, _ = _current_memory_mb()
+    if vm_mb is not None and max_memory_mb > 0:
+        try:
+            import resource
+            limit = int((vm_mb + max_memory_mb) * 1024 * 1024)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, resource.getrlimit(resource.RLIMIT_AS)[1]))
+        except (ImportError, ValueError, OSError):
+            pass
+
+    tasks_done = 0
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+
+        file_content, file_name, max_chars = task
+        document, error = None, None
+        try:
+            document = FileProcessor.extract_document(file_content, file_name, max_chars=max_chars)
+        except MemoryError:
+            error = f"Memory limit of {max_memory_mb} MB exceeded"
+        except Exception as e:
+            error = _error_message(e)
+        del file_content
+
+        tasks_done += 1
+        _, rss_mb = _current_memory_mb()
+        retiring = tasks_done >= max_tasks or (rss_mb is not None and max_memory_mb > 0 and rss_mb > max_memory_mb)
+        conn.send((document, error, retiring))
+        if retiring:
+            return
+
+
+class _Worker:
+    """Handle on one worker process and its pipe"""
+
+    def __init__(self, context, max_tasks: int, max_memory_mb: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, max_tasks, max_memory_mb),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def stop(self, force: bool = False) -> None:
+        try:
+            if force:
+                self.process.kill()
+            else:
+                self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=5)
+        self.conn.close()
+
+
+class PartialExtraction:
+    """
+    Text extracted up to a budget, with the full text finishing in the background
+
+    Embedding only needs the beginning of a document, so callers can
+    start on `text` while the rest of the file is still being parsed.
+    """
+
+    def __init__(self, text: str, full_document_future: Future):
+        self.text = text
+        self._full_document_future = full_document_future
+
+    def full_document(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait for and return the complete extraction (text, page_count, sections, ...)"""
+        return self._full_document_future.result(timeout=timeout)
+
+    def full_text(self, timeout: Optional[float] = None) -> str:
+        """Wait for and return the complete text"""
+        return self.full_document(timeout=timeout)["text"]
+
+
+class ExtractionService:
+    """
+    Process-pool backed text extraction
+
+    Each document runs in a worker process with a wall-clock timeout and
+    a memory cap. Workers are recycled after a fixed number of documents
+    and replaced when they time out or crash. A caller holds a worker only
+    while one of its documents is being extracted, so a long batch shares
+    the pool with single extractions.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        max_tasks_per_worker: Optional[int] = None,
+        max_memory_mb: Optional[int] = None
+    ):
+        self.workers = workers or settings.EXTRACTION_WORKERS or os.cpu_count() or 1
+        self.timeout_seconds = timeout_seconds or settings.EXTRACTION_TIMEOUT_SECONDS
+        self.max_tasks_per_worker = max_tasks_per_worker or settings.EXTRACTION_MAX_TASKS_PER_WORKER
+        self.max_memory_mb = max_memory_mb if max_memory_mb is not None else settings.EXTRACTION_MAX_MEMORY_MB
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._checked_out: Set[_Worker] = set()
+        self._checked_out_lock = threading.Lock()
+        self._started = False
+        self._start_lock = threading.Lock()
+        self._context = None
+        self._background = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="extraction")
+
+    def _ensure_started(self) -> None:
+        """Start worker processes on first use (keeps import and Lambda init cheap)"""
+        if self._started:
+            return
+        with self._start_lock:
+            if self._started:
+                return
+            start_method = settings.EXTRACTION_START_METHOD
+            if start_method not in multiprocessing.get_all_start_methods():
+                start_method = "spawn"
+            self._context = multiprocessing.get_context(start_method)
+            for _ in range(self.workers):
+                self._idle.put(self._new_worker())
+            self._started = True
+            logger.info(f"Extraction pool started with {self.workers} workers ({start_method})")
+
+    def _new_worker(self) -> _Worker:
+        return _Worker(self._context, self.max_tasks_per_worker, self.max_memory_mb)
+
+    def _checkout(self, block: bool) -> Optional[_Worker]:
+        """
+        Take an idle worker
+
+        Blocking waits up to EXTRACTION_CHECKOUT_TIMEOUT_SECONDS, then
+        raises; otherwise returns None when no worker is free.
+        """
+        if not self._started:
+            raise FileProcessingError("Extraction pool is shut down")
+        try:
+            if block:
+                worker = self._idle.get(timeout=settings.EXTRACTION_CHECKOUT_TIMEOUT_SECONDS)
+            else:
+                worker = self._idle.get_nowait()
+        except queue.Empty:
+            if block:
+                raise FileProcessingError(
+                    f"No extraction worker free after {settings.EXTRACTION_CHECKOUT_TIMEOUT_SECONDS}s"
+                )
+            return None
+        with self._checked_out_lock:
+            self._checked_out.add(worker)
+        return worker
+
+    def _checkin(self, worker: _Worker) -> None:
+        """Return a checked-out worker to the pool (or stop it if the pool was shut down meanwhile)"""
+        with self._checked_out_lock:
+            self._checked_out.discard(worker)
+            started = self._started
+        if started:
+            self._idle.put(worker)
+        else:
+            worker.stop()
+
+    def _replace(self, worker: _Worker, force: bool = True) -> _Worker:
+        """Stop a checked-out worker and check out a fresh one in its place"""
+        worker.stop(force=force)
+        replacement = self._new_worker()
+        with self._checked_out_lock:
+            self._checked_out.discard(worker)
+            self._checked_out.add(replacement)
+        return replacement
+
+    def extract_many(
+        self,
+        files: Iterable[Tuple[bytes, str]],
+        max_chars: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Extract text from many files, yielding results as they finish
+
+        Input is consumed lazily, so at most one document per worker is
+        held in flight. A worker is checked out per document and returned
+        as soon as its result arrives, before the caller gets the result.
+        Each result is a dict with keys: index, file_name, text and
+        document (None on failure) and error (None on success).
+        """
+        if not settings.EXTRACTION_USE_PROCESS_POOL:
+            from app.services.file_processor import FileProcessor
+            for index, (file_content, file_name) in enumerate(files):
+                try:
+                    document, error = FileProcessor.extract_document(file_content, file_name, max_chars=max_chars), None
+                except Exception as e:
+                    document, error = None, _error_message(e)
+                yield self._result(index, file_name, document, error)
+            return
+
+        self._ensure_started()
+        pending = iter(enumerate(files))
+        busy: Dict[Any, Tuple[_Worker, int, str, float]] = {}
+        next_file: Optional[Tuple[int, Tuple[bytes, str]]] = None
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted:
+                    if next_file is None:
+                        try:
+                            next_file = next(pending)
+                        except StopIteration:
+                            exhausted = True
+                            break
+                    # Wait for a worker only when nothing of ours is in flight
+                    worker = self._checkout(block=not busy)
+                    if worker is None:
+                        break
+                    index, (file_content, file_name) = next_file
+                    next_file = None
+                    try:
+                        worker.conn.send((file_content, file_name, max_chars))
+                    except (OSError, ValueError):
+                        # Worker died while idle; start a fresh one for this document
+                        worker = self._replace(worker)
+                        worker.conn.send((file_content, file_name, max_chars))
+                    del file_content
+                    busy[worker.conn] = (worker, index, file_name, time.monotonic())
+
+                if not busy:
+                    break
+
+                oldest_start = min(started for _, _, _, started in busy.values())
+                wait_for = max(0.0, oldest_start + self.timeout_seconds - time.monotonic())
+                for conn in wait(list(busy), timeout=wait_for):
+                    worker, index, file_name, _ = busy.pop(conn)
+                    try:
+                        document, error, retiring = conn.recv()
+                    except (EOFError, OSError):
+                        document, error, retiring = None, "Extraction worker crashed", False
+                        worker = self._replace(worker)
+                    if retiring:
+                        worker = self._replace(worker, force=False)
+                    self._checkin(worker)
+                    yield self._result(index, file_name, document, error)
+
+                now = time.monotonic()
+                for conn, (worker, index, file_name, started) in list(busy.items()):
+                    if now - started >= self.timeout_seconds:
+                        del busy[conn]
+                        logger.warning(f"Extraction of {file_name} timed out after {self.timeout_seconds}s, recycling worker")
+                        self._checkin(self._replace(worker))
+                        yield self._result(index, file_name, None, f"Extraction timed out after {self.timeout_seconds}s")
+        finally:
+            # Generator closed early: in-flight replies would be stale, so replace those workers
+            for worker, _, _, _ in busy.values():
+                self._checkin(self._replace(worker))
+
+    @staticmethod
+    def _result(index: int, file_name: str, document: Optional[Dict[str, Any]], error: Optional[str]) -> Dict[str, Any]:
+        return {
+            "index": index,
+            "file_name": file_name,
+            "text": document["text"] if document else None,
+            "document": document,
+            "error": error
+        }
+
+    @traced("extract_text")
+    def extract_document(self, file_content: bytes, file_name: str, max_chars: Optional[int] = None) -> Dict[str, Any]:
+        """Extract text and section layout from a single file in the pool"""
+        with closing(self.extract_many([(file_content, file_name)], max_chars=max_chars)) as results:
+            result = next(results)
+        if result["error"]:
+            raise FileProcessingError(result["error"])
+        return result["document"]
+
+    def extract(self, file_content: bytes, file_name: str, max_chars: Optional[int] = None) -> str:
+        """Extract text from a single file in the pool, optionally stopping at a character budget"""
+        return self.extract_document(file_content, file_name, max_chars=max_chars)["text"]
+
+    def extract_preview(self, file_content: bytes, file_name: str, max_chars: int) -> PartialExtraction:
+        """
+        Extract the first max_chars of a file now and the full text in the background
+
+        The caller waits only for the first pages; the full extraction then
+        runs on another worker while the caller embeds the preview. Most
+        documents fit in max_chars: then the preview is the full document
+        and no second pass is made.
+        """
+        preview = self.extract_document(file_content, file_name, max_chars=max_chars)
+        if preview["complete"]:
+            full_document_future: Future = Future()
+            full_document_future.set_result(preview)
+        else:
+            full_document_future = self._background.submit(self.extract_document, file_content, file_name)
+        return PartialExtraction(preview["text"], full_document_future)
+
+    def shutdown(self) -> None:
+        """Stop all workers; those busy with a document are killed"""
+        if not self._started:
+            return
+        with self._checked_out_lock:
+            self._started = False
+            checked_out = list(self._checked_out)
+            self._checked_out.clear()
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+        # Their callers see the worker die and clean up the pipe
+        for worker in checked_out:
+            worker.process.kill()
+        logger.info("Extraction pool stopped")
+
+
+extraction_service = ExtractionService()
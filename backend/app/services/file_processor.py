@@ -3,73 +3,161 @@ File Processing Service
 Extracts text from PDF, DOCX, and TXT files
 """
 import io
-from typing import Optional
+import itertools
+import unicodedata
+from typing import Any, Dict, Iterator, Optional
+import PyPDF2
 from PyPDF2 import PdfReader
 from docx import Document
 
 from app.core.logging import get_logger
 from app.core.exceptions import FileProcessingError
+from app.core.tracing import traced
 
 logger = get_logger(__name__)
 
 
+# Bump when extraction output changes so persisted extractions are redone.
+# lambda_function.EXTRACTOR_VERSION must stay equal to this value.
+EXTRACTOR_VERSION = f"1/pypdf2-{PyPDF2.__version__}"
+
+
 class FileProcessor:
     """Service for processing uploaded files"""
-    
+
     @staticmethod
-    def extract_text(file_content: bytes, file_name: str) -> str:
+    def extract_text(
+        file_content: bytes,
+        file_name: str,
+        max_chars: Optional[int] = None,
+        max_sections: Optional[int] = None
+    ) -> str:
         """
         Extract text from file based on extension
-        
+
+        Parsing stops as soon as a budget is reached, so callers that only
+        need the beginning of a document (e.g. for embedding) never parse
+        the remaining pages.
+
         Args:
             file_content: File content as bytes
             file_name: Original file name
-            
+            max_chars: Optional character budget
+            max_sections: Optional section budget (pages for PDF, paragraphs for DOCX)
+
         Returns:
             Extracted text
         """
+        return FileProcessor.extract_document(file_content, file_name, max_chars, max_sections)["text"]
+
+    @staticmethod
+    @traced("extract_text")
+    def extract_document(
+        file_content: bytes,
+        file_name: str,
+        max_chars: Optional[int] = None,
+        max_sections: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract normalized text together with its section layout
+
+        Returns:
+            dict with keys: text, page_count, sections ([start, end] offsets
+            of each page/paragraph in text), extractor_version, complete
+            (False when a budget stopped extraction before the end)
+        """
         try:
-            file_ext = file_name.lower().split('.')[-1]
-            
-            if file_ext == 'pdf':
-                return FileProcessor._extract_from_pdf(file_content)
-            elif file_ext in ['docx', 'doc']:
-                return FileProcessor._extract_from_docx(file_content)
-            elif file_ext == 'txt':
-                return file_content.decode('utf-8', errors='ignore')
-            else:
-                raise FileProcessingError(f"Unsupported file type: {file_ext}")
-                
+            parts = []
+            total_chars = 0
+            complete = True
+            # One section past max_sections tells whether the limit cut anything off
+            sections_iter = FileProcessor.iter_text(
+                file_content, file_name, max_sections + 1 if max_sections is not None else None
+            )
+            for section in sections_iter:
+                if max_sections is not None and len(parts) >= max_sections:
+                    complete = False
+                    break
+                parts.append(FileProcessor.normalize(section))
+                total_chars += len(parts[-1]) + 1
+                if max_chars is not None and total_chars >= max_chars:
+                    # Incomplete only if there is more to read
+                    complete = next(sections_iter, None) is None
+                    break
+
+            raw = "\n".join(parts)
+            text = raw.strip()
+            lead = len(raw) - len(raw.lstrip())
+            sections = []
+            start = 0
+            for part in parts:
+                end = start + len(part)
+                sections.append([
+                    min(max(start - lead, 0), len(text)),
+                    min(max(end - lead, 0), len(text))
+                ])
+                start = end + 1
+
+            return {
+                "text": text,
+                "page_count": len(parts),
+                "sections": sections,
+                "extractor_version": EXTRACTOR_VERSION,
+                "complete": complete
+            }
+
         except Exception as e:
             logger.error(f"Error extracting text from {file_name}: {e}")
             raise FileProcessingError(f"Failed to extract text: {str(e)}")
-    
+
+    @staticmethod
+    def normalize(text: Optional[str]) -> str:
+        """NFC-normalize section text and drop NUL characters left by some PDF producers"""
+        return unicodedata.normalize("NFC", text or "").replace("\x00", "")
+
+    @staticmethod
+    def iter_text(file_content: bytes, file_name: str, max_sections: Optional[int] = None) -> Iterator[str]:
+        """
+        Lazily yield the text of a file section by section
+
+        Pages are parsed one at a time as the caller iterates; with
+        max_sections, sections past the limit are never read at all.
+        """
+        file_ext = file_name.lower().split('.')[-1]
+
+        if file_ext == 'pdf':
+            yield from FileProcessor._iter_pdf(file_content, max_sections)
+        elif file_ext in ['docx', 'doc']:
+            yield from itertools.islice(FileProcessor._iter_docx(file_content), max_sections)
+        elif file_ext == 'txt':
+            yield file_content.decode('utf-8', errors='ignore')
+        else:
+            raise FileProcessingError(f"Unsupported file type: {file_ext}")
+
     @staticmethod
-    def _extract_from_pdf(file_content: bytes) -> str:
-        """Extract text from PDF"""
+    def _iter_pdf(file_content: bytes, max_pages: Optional[int] = None) -> Iterator[str]:
+        """
+        Yield text from each PDF page
+
+        The reader is opened text-only: the page tree is walked on demand and
+        image XObjects are skipped without loading their data.
+        """
         try:
-            pdf_file = io.BytesIO(file_content)
-            reader = PdfReader(pdf_file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
+            reader = PdfReader(io.BytesIO(file_content), text_only=True)
+            for page in reader.iter_pages(max_pages):
+                yield page.extract_text()
         except Exception as e:
             raise FileProcessingError(f"PDF extraction error: {str(e)}")
-    
+
     @staticmethod
-    def _extract_from_docx(file_content: bytes) -> str:
-        """Extract text from DOCX"""
+    def _iter_docx(file_content: bytes) -> Iterator[str]:
+        """Yield text from each DOCX paragraph"""
         try:
-            doc_file = io.BytesIO(file_content)
-            doc = Document(doc_file)
-            text = ""
+            doc = Document(io.BytesIO(file_content))
             for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
+                yield paragraph.text
         except Exception as e:
             raise FileProcessingError(f"DOCX extraction error: {str(e)}")
 
 
 file_processor = FileProcessor()
-
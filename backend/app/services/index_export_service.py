@@ -0,0 +1,251 @@
+"""
+Index Export Service
+Full-index snapshots: document metadata as JSONL, vectors as float32 .npy
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from opensearchpy.exceptions import NotFoundError
+
+from app.clients.opensearch_client import opensearch_client
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.exceptions import OpenSearchError
+
+logger = get_logger(__name__)
+
+MANIFEST = "manifest.json"
+DOCUMENTS = "documents.jsonl"
+VECTORS = "vectors.npy"
+
+
+def _write_json_atomic(path: str, data: Any) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+    """
+    Documents and vectors of a finished snapshot
+
+    Vectors are memory-mapped, so opening a large snapshot is cheap; row
+    i belongs to document i. Documents without a vector have a zero row
+    and _has_vector false.
+    """
+    with open(os.path.join(path, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if not manifest.get("complete"):
+        raise ValueError(f"Snapshot {path} is incomplete; rerun the export to resume it")
+    with open(os.path.join(path, DOCUMENTS), encoding="utf-8") as f:
+        documents = [json.loads(line) for line in f]
+    vectors = np.load(os.path.join(path, VECTORS), mmap_mode="r")
+    return documents, vectors
+
+
+class IndexExportService:
+    """
+    Streams a whole index to a local snapshot directory
+
+    Reads go through a point in time with search_after, split into
+    parallel slices. Each slice appends to its own part files and
+    checkpoints its search_after and file sizes in the manifest after
+    every page, so an interrupted export resumes where it stopped (part
+    files are cut back to the last checkpoint first). Pages are sorted by
+    _id, which keeps the order stable when an expired point in time has
+    to be recreated on resume. Finished slices are merged into
+    documents.jsonl and vectors.npy.
+    """
+
+    def __init__(self):
+        self.opensearch = opensearch_client
+
+    @property
+    def client(self):
+        if self.opensearch.client is None:
+            raise OpenSearchError("Index export needs an OpenSearch cluster (USE_MOCK is set)")
+        return self.opensearch.client
+
+    def _dimension(self, index_name: str, vector_field: str) -> int:
+        mappings = self.client.indices.get_mapping(index=index_name)
+        for mapping in mappings.values():
+            field = mapping["mappings"].get("properties", {}).get(vector_field)
+            if field and field.get("dimension"):
+                return int(field["dimension"])
+        raise OpenSearchError(f"{index_name} has no knn_vector field {vector_field}")
+
+    def _open_pit(self, index_name: str) -> str:
+        response = self.client.create_pit(index=index_name, keep_alive=settings.OPENSEARCH_EXPORT_KEEP_ALIVE)
+        return response["pit_id"]
+
+    def export(
+        self,
+        index_name: str,
+        out_dir: str,
+        vector_field: str = "embeddings",
+        slices: Optional[int] = None,
+        page_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Export index_name into out_dir, resuming an unfinished export there
+
+        Returns the manifest (document count, dimension, timings).
+        """
+        slices = slices or settings.OPENSEARCH_EXPORT_SLICES
+        page_size = page_size or settings.OPENSEARCH_EXPORT_PAGE_SIZE
+        os.makedirs(out_dir, exist_ok=True)
+        manifest_path = os.path.join(out_dir, MANIFEST)
+
+        manifest = None
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("complete"):
+                logger.info(f"Snapshot in {out_dir} is already complete")
+                return manifest
+            if manifest["index"] != index_name or manifest["vector_field"] != vector_field:
+                raise ValueError(f"{out_dir} holds an export of {manifest['index']}.{manifest['vector_field']}")
+            logger.info(f"Resuming export of {index_name} into {out_dir}")
+
+        if manifest is None:
+            manifest = {
+                "index": index_name,
+                "vector_field": vector_field,
+                "dimension": self._dimension(index_name, vector_field),
+                "slices": [
+                    {"id": i, "search_after": None, "documents": 0, "jsonl_bytes": 0, "vector_bytes": 0, "done": False}
+                    for i in range(slices)
+                ],
+                "page_size": page_size,
+                "pit_id": None,
+                "started_at": datetime.utcnow().isoformat(),
+                "complete": False
+            }
+        if manifest["pit_id"] is None:
+            manifest["pit_id"] = self._open_pit(index_name)
+        _write_json_atomic(manifest_path, manifest)
+
+        lock = threading.Lock()
+        start = time.perf_counter()
+        pending = [state for state in manifest["slices"] if not state["done"]]
+        with ThreadPoolExecutor(max_workers=len(pending) or 1) as pool:
+            for future in [pool.submit(self._export_slice, manifest, state, out_dir, lock) for state in pending]:
+                future.result()
+
+        try:
+            self.client.delete_pit(body={"pit_id": [manifest["pit_id"]]})
+        except Exception as e:
+            logger.warning(f"Could not delete point in time: {e}")
+        self._merge(manifest, out_dir)
+        manifest["complete"] = True
+        manifest["documents"] = sum(state["documents"] for state in manifest["slices"])
+        manifest["finished_at"] = datetime.utcnow().isoformat()
+        manifest["seconds"] = round(time.perf_counter() - start, 1)
+        _write_json_atomic(manifest_path, manifest)
+        logger.info(f"Exported {manifest['documents']} documents from {index_name} into {out_dir}")
+        return manifest
+
+    def _pages(self, manifest: Dict[str, Any], state: Dict[str, Any], lock: threading.Lock) -> Iterator[List[Dict[str, Any]]]:
+        """Pages of one slice, from its checkpoint on"""
+        slice_count = len(manifest["slices"])
+        while True:
+            body = {
+                "size": manifest["page_size"],
+                "pit": {"id": manifest["pit_id"], "keep_alive": settings.OPENSEARCH_EXPORT_KEEP_ALIVE},
+                "sort": [{"_id": "asc"}],
+                "track_total_hits": False
+            }
+            if slice_count > 1:
+                body["slice"] = {"id": state["id"], "max": slice_count}
+            if state["search_after"] is not None:
+                body["search_after"] = state["search_after"]
+            try:
+                hits = self.client.search(body=body)["hits"]["hits"]
+            except NotFoundError as e:
+                # Expired while the export was stopped; the _id order carries over
+                with lock:
+                    if body["pit"]["id"] == manifest["pit_id"]:
+                        logger.warning(f"Point in time expired ({e}); opening a new one")
+                        manifest["pit_id"] = self._open_pit(manifest["index"])
+                continue
+            if not hits:
+                return
+            # The caller advances state["search_after"] once the page is written
+            yield hits
+
+    def _export_slice(self, manifest: Dict[str, Any], state: Dict[str, Any], out_dir: str, lock: threading.Lock) -> None:
+        jsonl_path = os.path.join(out_dir, f"part-{state['id']}.jsonl")
+        vector_path = os.path.join(out_dir, f"part-{state['id']}.f32")
+        vector_field = manifest["vector_field"]
+        dimension = manifest["dimension"]
+
+        # Drop anything written after the last checkpoint
+        for path, size in ((jsonl_path, state["jsonl_bytes"]), (vector_path, state["vector_bytes"])):
+            with open(path, "ab") as f:
+                f.truncate(size)
+
+        with open(jsonl_path, "ab") as documents, open(vector_path, "ab") as vectors:
+            for hits in self._pages(manifest, state, lock):
+                rows = np.zeros((len(hits), dimension), dtype=np.float32)
+                lines = []
+                for row, hit in enumerate(hits):
+                    source = hit.get("_source", {})
+                    vector = source.pop(vector_field, None)
+                    if vector:
+                        rows[row] = vector
+                    lines.append(json.dumps({"_id": hit["_id"], "_has_vector": bool(vector), **source}, ensure_ascii=False))
+                documents.write(("\n".join(lines) + "\n").encode("utf-8"))
+                vectors.write(rows.tobytes())
+                for f in (documents, vectors):
+                    f.flush()
+                    os.fsync(f.fileno())
+                with lock:
+                    state["search_after"] = hits[-1]["sort"]
+                    state["documents"] += len(hits)
+                    state["jsonl_bytes"] = documents.tell()
+                    state["vector_bytes"] = vectors.tell()
+                    _write_json_atomic(os.path.join(out_dir, MANIFEST), manifest)
+                    exported = sum(s["documents"] for s in manifest["slices"])
+                if exported // 10000 != (exported - len(hits)) // 10000:
+                    logger.info(f"Exported {exported} documents from {manifest['index']}")
+
+        with lock:
+            state["done"] = True
+            _write_json_atomic(os.path.join(out_dir, MANIFEST), manifest)
+
+    def _merge(self, manifest: Dict[str, Any], out_dir: str) -> None:
+        """Concatenate the part files into documents.jsonl and vectors.npy"""
+        total = sum(state["documents"] for state in manifest["slices"])
+        vectors = np.lib.format.open_memmap(
+            os.path.join(out_dir, VECTORS), mode="w+", dtype=np.float32, shape=(total, manifest["dimension"])
+        )
+        row = 0
+        with open(os.path.join(out_dir, DOCUMENTS), "wb") as documents:
+            for state in manifest["slices"]:
+                jsonl_path = os.path.join(out_dir, f"part-{state['id']}.jsonl")
+                vector_path = os.path.join(out_dir, f"part-{state['id']}.f32")
+                with open(jsonl_path, "rb") as part:
+                    while chunk := part.read(1 << 20):
+                        documents.write(chunk)
+                count = state["documents"]
+                if count:
+                    vectors[row:row + count] = np.fromfile(vector_path, dtype=np.float32).reshape(count, manifest["dimension"])
+                row += count
+        vectors.flush()
+        del vectors
+        for state in manifest["slices"]:
+            os.remove(os.path.join(out_dir, f"part-{state['id']}.jsonl"))
+            os.remove(os.path.join(out_dir, f"part-{state['id']}.f32"))
+
+
+# Singleton instance
+index_export_service = IndexExportService()
@@ -0,0 +1,395 @@
+"""
+Index Management Service
+Versioned OpenSearch indices behind aliases, and zero-downtime reindexing
+"""
+import copy
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from opensearchpy import helpers
+
+from app.clients.opensearch_client import opensearch_client, write_alias_name
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.exceptions import OpenSearchError
+
+logger = get_logger(__name__)
+
+# Extra wait after moving a write alias, on top of OPENSEARCH_ALIAS_CACHE_SECONDS
+ALIAS_SWITCH_MARGIN_SECONDS = 5
+
+
+def _index_setting(body: Dict[str, Any], name: str) -> Optional[Any]:
+    """An index setting from a create-index body (nested or dotted form)"""
+    index_settings = body.get("settings", {})
+    nested = index_settings.get("index", {})
+    for value in (nested.get(name), index_settings.get(f"index.{name}"), index_settings.get(name)):
+        if value is not None:
+            return value
+    return None
+
+
+def _without_load_settings(body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    body with refresh and replicas turned off for bulk loading
+
+    Refreshing and replicating every chunk while it is copied is wasted
+    work; both are restored once the copy is done.
+    """
+    body = copy.deepcopy(body)
+    index_settings = body.setdefault("settings", {})
+    for name in ("refresh_interval", "number_of_replicas"):
+        index_settings.pop(f"index.{name}", None)
+        index_settings.pop(name, None)
+    nested = index_settings.setdefault("index", {})
+    nested["refresh_interval"] = "-1"
+    nested["number_of_replicas"] = 0
+    return body
+
+
+class IndexManagementService:
+    """
+    Versioned indices (jobs_index_v1, jobs_index_v2, ...) behind aliases
+
+    The read alias (jobs_index) is what searches use; the write alias
+    (jobs_index_write) is what the app and the Lambda index into. A mapping
+    change is rolled out by reindex: build the next version, copy every
+    document into it (embeddings included, so nothing is re-embedded),
+    then move the read alias in a single atomic update. Searches never see
+    a missing or half-filled index, and rollback is another alias move.
+    """
+
+    def __init__(self):
+        self.opensearch = opensearch_client
+
+    @property
+    def client(self):
+        if self.opensearch.client is None:
+            raise OpenSearchError("Index management needs an OpenSearch cluster (USE_MOCK is set)")
+        return self.opensearch.client
+
+    @staticmethod
+    def versioned_name(alias: str, version: int) -> str:
+        return f"{alias}_v{version}"
+
+    def _alias_targets(self, alias: str) -> List[str]:
+        if not self.client.indices.exists_alias(name=alias):
+            return []
+        return sorted(self.client.indices.get_alias(name=alias).keys())
+
+    def _versions(self, alias: str) -> List[Tuple[int, str]]:
+        """Existing versions of alias, oldest first"""
+        pattern = re.compile(rf"^{re.escape(alias)}_v(\d+)$")
+        versions = []
+        for index in self.client.indices.get(index=f"{alias}_v*", ignore_unavailable=True, allow_no_indices=True):
+            match = pattern.match(index)
+            if match:
+                versions.append((int(match.group(1)), index))
+        return sorted(versions)
+
+    def _legacy_index(self, alias: str) -> Optional[str]:
+        """alias itself, if it is still a concrete index from before versioning"""
+        if self.client.indices.exists_alias(name=alias):
+            return None
+        return alias if self.client.indices.exists(index=alias) else None
+
+    def _count(self, index: str) -> int:
+        return self.client.count(index=index)["count"]
+
+    def status(self, alias: str) -> Dict[str, Any]:
+        """Where the aliases point, and the document count of each version"""
+        write_alias = write_alias_name(alias)
+        legacy = self._legacy_index(alias)
+        return {
+            "alias": alias,
+            "read": self._alias_targets(alias),
+            "write_alias": write_alias,
+            "write": self._alias_targets(write_alias),
+            "legacy_index": legacy,
+            "versions": {index: self._count(index) for _, index in self._versions(alias)},
+            "legacy_count": self._count(legacy) if legacy else None
+        }
+
+    def ensure_index(self, alias: str, body: Dict[str, Any]) -> Optional[str]:
+        """
+        Create version 1 behind both aliases unless alias already exists
+
+        Never deletes anything; an existing index (versioned or legacy) is
+        left alone. Returns the created index, or None.
+        """
+        if self.client.indices.exists(index=alias):
+            logger.info(f"{alias} already exists; leaving it as is")
+            return None
+        index = self.versioned_name(alias, 1)
+        self.client.indices.create(index=index, body={
+            **body,
+            "aliases": {alias: {}, write_alias_name(alias): {}}
+        })
+        logger.info(f"Created {index} behind aliases {alias}, {write_alias_name(alias)}")
+        return index
+
+    def reindex(
+        self,
+        alias: str,
+        body: Dict[str, Any],
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Copy alias into a new version created from body, then switch reads to it
+
+        1. Create the next version with refresh off and no replicas.
+        2. Move the write alias to it, so new documents land there while the
+           copy runs (a legacy concrete index has no write alias yet; it is
+           made read-only for the copy instead).
+        3. Copy with scan + parallel_bulk as "create" operations, so a
+           document written to the new index during the copy is never
+           overwritten by its older source version.
+        4. Restore refresh and replicas, refresh, wait for the replicas.
+        5. Move the read alias in one atomic update.
+
+        If the copy comes up short, reads stay on the old index and the
+        error is raised; the write alias is moved back to it along with
+        the documents written to the new version meanwhile, which is kept
+        for inspection.
+
+        Documents written while the copy runs land only in the new version,
+        so reads (get_document, search) do not see them until the switch;
+        a resume uploaded meanwhile is found missing and processed again
+        from S3. Run reindex when uploads are quiet.
+        """
+        workers = workers or settings.OPENSEARCH_REINDEX_WORKERS
+        chunk_size = chunk_size or settings.OPENSEARCH_REINDEX_CHUNK_SIZE
+        write_alias = write_alias_name(alias)
+
+        legacy = self._legacy_index(alias)
+        if legacy:
+            source = legacy
+        else:
+            targets = self._alias_targets(alias)
+            if len(targets) != 1:
+                raise OpenSearchError(f"{alias} must point to exactly one index to reindex (found {targets})")
+            source = targets[0]
+
+        versions = self._versions(alias)
+        target = self.versioned_name(alias, versions[-1][0] + 1 if versions else 1)
+
+        source_settings = self.client.indices.get_settings(index=source)[source]
+        refresh_interval = _index_setting(body, "refresh_interval") or _index_setting(source_settings, "refresh_interval") or "1s"
+        replicas = _index_setting(body, "number_of_replicas")
+        if replicas is None:
+            replicas = _index_setting(source_settings, "number_of_replicas") or 0
+
+        self.client.indices.create(index=target, body=_without_load_settings(body))
+        logger.info(f"Created {target} for reindexing {source}")
+
+        if legacy:
+            self.client.indices.put_settings(index=source, body={"index": {"blocks": {"write": True}}})
+            logger.info(f"Blocked writes to legacy index {source} during the copy")
+        else:
+            self.client.indices.update_aliases(body={"actions": [
+                {"remove": {"index": source, "alias": write_alias}},
+                {"add": {"index": target, "alias": write_alias}}
+            ]})
+            # Writers cache the resolved write target; let those caches expire
+            wait = settings.OPENSEARCH_ALIAS_CACHE_SECONDS + ALIAS_SWITCH_MARGIN_SECONDS
+            logger.info(f"Moved {write_alias} to {target}; waiting {wait}s for writers to follow")
+            time.sleep(wait)
+
+        try:
+            copied = self._copy(source, target, workers, chunk_size)
+
+            self.client.indices.put_settings(index=target, body={"index": {
+                "refresh_interval": refresh_interval,
+                "number_of_replicas": replicas
+            }})
+            self.client.indices.refresh(index=target)
+            self.client.cluster.health(
+                index=target,
+                wait_for_status="green" if replicas else "yellow",
+                timeout="5m"
+            )
+
+            source_count = self._count(source)
+            target_count = self._count(target)
+            if target_count < source_count:
+                raise OpenSearchError(
+                    f"Reindex incomplete: {target} has {target_count} documents, {source} has {source_count}"
+                )
+        except Exception:
+            if legacy:
+                self.client.indices.put_settings(index=source, body={"index": {"blocks": {"write": False}}})
+            else:
+                self._restore_writes(alias, source, target, workers, chunk_size)
+            logger.error(f"Reindex of {alias} into {target} failed; reads stay on {source}")
+            raise
+
+        if legacy:
+            # The legacy index has to go for its name to become an alias;
+            # remove_index does both in the same atomic update
+            actions = [
+                {"add": {"index": target, "alias": write_alias}},
+                {"remove_index": {"index": source}},
+                {"add": {"index": target, "alias": alias}}
+            ]
+        else:
+            actions = [
+                {"remove": {"index": source, "alias": alias}},
+                {"add": {"index": target, "alias": alias}}
+            ]
+        self.client.indices.update_aliases(body={"actions": actions})
+        self.opensearch.invalidate_index(alias)
+        logger.info(f"Switched {alias} from {source} to {target}")
+
+        return {
+            "source": source,
+            "target": target,
+            "source_count": source_count,
+            "target_count": target_count,
+            **copied
+        }
+
+    def _restore_writes(self, alias: str, source: str, target: str, workers: int, chunk_size: int) -> None:
+        """
+        Undo the write alias move of a failed reindex
+
+        target holds the documents written through the write alias during
+        the copy, which no read alias shows. Writes to target are blocked
+        while they are copied back (as "index" operations: they are newer
+        than their source versions), so none slips in after the copy; then
+        the write alias returns to source.
+        """
+        write_alias = write_alias_name(alias)
+        try:
+            self._copy_back(target, source, workers, chunk_size)
+        except Exception as e:
+            logger.error(f"Copying documents written to {target} back into {source} failed: {e}")
+        finally:
+            self.client.indices.update_aliases(body={"actions": [
+                {"remove": {"index": target, "alias": write_alias}},
+                {"add": {"index": source, "alias": write_alias}}
+            ]})
+            self.client.indices.put_settings(index=target, body={"index": {"blocks": {"write": False}}})
+            self.opensearch.invalidate_index(alias)
+            logger.info(f"Moved {write_alias} back to {source}")
+
+    def _copy_back(self, index: str, into: str, workers: int, chunk_size: int) -> None:
+        """Block writes to index, then copy all of it into into (as "index" operations: its versions are newer)"""
+        self.client.indices.put_settings(index=index, body={"index": {"blocks": {"write": True}}})
+        self.client.indices.refresh(index=index)
+        restored = self._copy(index, into, workers, chunk_size, op_type="index")
+        if restored["failed"]:
+            logger.error(f"{restored['failed']} documents of {index} could not be copied back into {into}")
+
+    def _copy(
+        self,
+        source: str,
+        target: str,
+        workers: int,
+        chunk_size: int,
+        op_type: str = "create"
+    ) -> Dict[str, int]:
+        """Copy every document of source into target as-is"""
+        actions = (
+            {
+                "_op_type": op_type,
+                "_index": target,
+                "_id": hit["_id"],
+                "_source": hit["_source"]
+            }
+            for hit in helpers.scan(self.client, index=source, size=chunk_size, scroll="10m", preserve_order=False)
+        )
+        copied = skipped = failed = 0
+        for ok, item in helpers.parallel_bulk(
+            self.client,
+            actions,
+            thread_count=workers,
+            chunk_size=chunk_size,
+            raise_on_error=False,
+            raise_on_exception=False
+        ):
+            if ok:
+                copied += 1
+                if copied % 10000 == 0:
+                    logger.info(f"Copied {copied} documents into {target}")
+                continue
+            result = item.get(op_type, {})
+            if result.get("status") == 409:
+                # Already written to target through the write alias; that version is newer
+                skipped += 1
+            else:
+                failed += 1
+                if failed <= 5:
+                    logger.warning(f"Failed to copy document into {target}: {result}")
+        logger.info(f"Copied {copied} documents into {target} ({skipped} newer, {failed} failed)")
+        return {"copied": copied, "skipped": skipped, "failed": failed}
+
+    def rollback(
+        self,
+        alias: str,
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, str]:
+        """
+        Point both aliases back at the version before the current one
+
+        Documents written to the current version since the switch exist
+        only there, so the current version is copied into the previous one
+        first (writes to it are blocked meanwhile, and the whole version is
+        copied: nothing marks which documents are new). If that copy
+        fails, the aliases are left alone and the error is raised.
+        """
+        workers = workers or settings.OPENSEARCH_REINDEX_WORKERS
+        chunk_size = chunk_size or settings.OPENSEARCH_REINDEX_CHUNK_SIZE
+        write_alias = write_alias_name(alias)
+        targets = self._alias_targets(alias)
+        versions = [index for _, index in self._versions(alias)]
+        if len(targets) != 1 or targets[0] not in versions:
+            raise OpenSearchError(f"{alias} must point to exactly one version to roll back (found {targets})")
+        position = versions.index(targets[0])
+        if position == 0:
+            raise OpenSearchError(f"{targets[0]} is the oldest version of {alias}")
+        current, previous = versions[position], versions[position - 1]
+
+        try:
+            self._copy_back(current, previous, workers, chunk_size)
+        except Exception:
+            self.client.indices.put_settings(index=current, body={"index": {"blocks": {"write": False}}})
+            logger.error(f"Copying {current} back into {previous} failed; {alias} stays on {current}")
+            raise
+
+        actions = [
+            {"remove": {"index": current, "alias": alias}},
+            {"add": {"index": previous, "alias": alias}},
+            {"add": {"index": previous, "alias": write_alias}}
+        ]
+        for index in self._alias_targets(write_alias):
+            actions.insert(0, {"remove": {"index": index, "alias": write_alias}})
+        try:
+            self.client.indices.update_aliases(body={"actions": actions})
+        finally:
+            self.client.indices.put_settings(index=current, body={"index": {"blocks": {"write": False}}})
+        self.opensearch.invalidate_index(alias)
+        logger.info(f"Rolled {alias} back from {current} to {previous}")
+        return {"from": current, "to": previous}
+
+    def cleanup(self, alias: str, keep: int = 1) -> List[str]:
+        """
+        Delete old versions, keeping the newest keep versions besides the live one
+
+        Versions that either alias points to are never deleted.
+        """
+        live = set(self._alias_targets(alias)) | set(self._alias_targets(write_alias_name(alias)))
+        versions = [index for _, index in self._versions(alias)]
+        newest = max((versions.index(index) for index in live if index in versions), default=len(versions) - 1)
+        candidates = [index for index in versions[:newest] if index not in live]
+        doomed = candidates[:max(len(candidates) - keep, 0)]
+        for index in doomed:
+            self.client.indices.delete(index=index)
+            logger.info(f"Deleted old version {index}")
+        return doomed
+
+
+# Singleton instance
+index_management_service = IndexManagementService()
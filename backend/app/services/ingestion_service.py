@@ -0,0 +1,196 @@
+"""
+Ingestion Service
+Background bulk ingestion: submit returns a job id, queue workers do the work
+"""
+import json
+import threading
+from typing import Any, BinaryIO, Dict, List, Tuple, Union
+
+from app.clients.queue_client import get_queue_client, queue_backend, QueueMessage
+from app.clients.opensearch_client import opensearch_client
+from app.clients.s3_client import s3_client
+from app.repositories.ingestion_job_repository import ingestion_job_repository
+from app.repositories.job_repository import job_repository
+from app.repositories.resume_repository import resume_repository
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class IngestionService:
+    """
+    Ingestion jobs on top of the queue abstraction
+
+    Submitting does only the cheap part inside the request (storing the
+    files, writing the job record, enqueueing one message per item).
+    Extraction, embedding and indexing happen in queue workers, which
+    retry failed items with backoff up to INGESTION_MAX_ATTEMPTS times.
+    """
+
+    def __init__(self):
+        self.jobs = ingestion_job_repository
+        self._workers: List[threading.Thread] = []
+        self._stop = threading.Event()
+
+    @property
+    def queue(self):
+        return get_queue_client()
+
+    def submit_resume_upload(self, files: List[Tuple[Union[bytes, BinaryIO], str]]) -> Dict[str, Any]:
+        """
+        Stage uploaded resumes and queue them for processing
+
+        Duplicates of already processed content finish immediately.
+        """
+        staged = []
+        for file_content, file_name in files:
+            try:
+                staged.append(resume_repository.stage_resume(file_content, file_name))
+            except Exception as e:
+                logger.error(f"Failed to stage {file_name}: {e}")
+                staged.append({"name": file_name, "error": str(e)})
+
+        job = self.jobs.create_job("resume_upload", [{"file_name": item["name"]} for item in staged])
+        for index, item in enumerate(staged):
+            if item.get("staged"):
+                self.queue.send({
+                    "job_id": job["job_id"],
+                    "index": index,
+                    "kind": "resume_upload",
+                    "content_hash": item["content_hash"],
+                    "file_name": item["name"]
+                })
+            elif "error" in item:
+                self.jobs.update_item(job["job_id"], index, "failed", error=item["error"])
+            else:
+                self.jobs.update_item(job["job_id"], index, "succeeded", result=item)
+        return job
+
+    def submit_job_sync(self) -> Dict[str, Any]:
+        """Queue every job record stored in S3 for (re)indexing"""
+        jobs_data = s3_client.load_jobs_data()
+        job_repository.ensure_index()
+        job = self.jobs.create_job("job_sync", [
+            {"job_id": str(d.get("_id") or d.get("job_id") or d.get("id") or "")} for d in jobs_data
+        ])
+        for index, job_data in enumerate(jobs_data):
+            self.queue.send({
+                "job_id": job["job_id"],
+                "index": index,
+                "kind": "job_sync",
+                "job_data": job_data
+            })
+        return job
+
+    def process_message(self, message: QueueMessage, queue=None) -> None:
+        """Run one queued item, recording its outcome and scheduling retries"""
+        queue = queue or self.queue
+        body = message.body
+        job_id, index = body["job_id"], body["index"]
+        attempts = message.receive_count
+        self.jobs.update_item(job_id, index, "processing", attempts=attempts)
+        try:
+            result = self._run(body)
+        except Exception as e:
+            if attempts < settings.INGESTION_MAX_ATTEMPTS:
+                delay = settings.INGESTION_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1)
+                logger.warning(f"Ingestion item {job_id}/{index} failed (attempt {attempts}), retrying in {delay}s: {e}")
+                self.jobs.update_item(job_id, index, "retrying", attempts=attempts, error=str(e))
+                queue.release(message, delay_seconds=delay)
+            else:
+                logger.error(f"Ingestion item {job_id}/{index} failed after {attempts} attempts: {e}")
+                self.jobs.update_item(job_id, index, "failed", attempts=attempts, error=str(e))
+                queue.delete(message)
+            return
+
+        self.jobs.update_item(job_id, index, "succeeded", attempts=attempts, result=result)
+        queue.delete(message)
+
+    @staticmethod
+    def _run(body: Dict[str, Any]) -> Dict[str, Any]:
+        if body["kind"] == "resume_upload":
+            return resume_repository.process_staged_resume(body["content_hash"], body["file_name"])
+        if body["kind"] == "job_sync":
+            # Embedding failures (Bedrock throttling, mostly) go through the retry path
+            job_id = job_repository.sync_job(body["job_data"], require_embedding=True)
+            if not job_id:
+                raise ValueError("Job record has no id")
+            opensearch_client.invalidate_index(job_repository.INDEX_NAME)
+            return {"job_id": job_id}
+        raise ValueError(f"Unknown ingestion item kind: {body['kind']}")
+
+    def run_worker(self, stop_event: threading.Event, wait_seconds: int = 20) -> None:
+        """Consume the queue until stop_event is set"""
+        while not stop_event.is_set():
+            try:
+                messages = self.queue.receive(max_messages=1, wait_seconds=wait_seconds)
+            except Exception as e:
+                logger.error(f"Ingestion queue receive failed: {e}")
+                stop_event.wait(5)
+                continue
+            for message in messages:
+                self.process_message(message)
+
+    def start_local_workers(self) -> None:
+        """
+        Start in-process consumers for the local (sqlite/memory) queues
+
+        With SQS the queue is drained by separate workers (ingestion_worker.py
+        or an SQS-triggered Lambda), so nothing is started here.
+        """
+        if queue_backend() == "sqs" or self._workers:
+            return
+        self._stop.clear()
+        for n in range(settings.INGESTION_LOCAL_WORKERS):
+            worker = threading.Thread(
+                target=self.run_worker,
+                args=(self._stop, 1),
+                name=f"ingestion-worker-{n}",
+                daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+        logger.info(f"Started {len(self._workers)} local ingestion workers")
+
+    def stop_local_workers(self) -> None:
+        self._stop.set()
+        for worker in self._workers:
+            worker.join(timeout=5)
+        self._workers = []
+
+    def handle_sqs_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Entry point for an SQS-triggered Lambda
+
+        Failed items that should be retried are reported back as batch item
+        failures (requires ReportBatchItemFailures on the event source mapping).
+        """
+        failures = []
+        for record in event.get("Records", []):
+            message = QueueMessage(
+                json.loads(record["body"]),
+                record["receiptHandle"],
+                int(record.get("attributes", {}).get("ApproximateReceiveCount", 1))
+            )
+            batch = _LambdaBatchQueue()
+            self.process_message(message, queue=batch)
+            if batch.released:
+                failures.append({"itemIdentifier": record["messageId"]})
+        return {"batchItemFailures": failures}
+
+
+class _LambdaBatchQueue:
+    """Stand-in queue for Lambda SQS batches, where Lambda deletes or redelivers messages itself"""
+
+    def __init__(self):
+        self.released = False
+
+    def delete(self, message: QueueMessage) -> None:
+        pass
+
+    def release(self, message: QueueMessage, delay_seconds: int = 0) -> None:
+        self.released = True
+
+
+ingestion_service = IngestionService()
@@ -3,8 +3,10 @@ Matching Service
 Core business logic for resume-job matching
 """
 from typing import List, Dict, Any, Optional
+import asyncio
+
 from app.clients.bedrock_client import bedrock_client
-from app.clients.opensearch_client import opensearch_client
+from app.clients.async_opensearch_client import async_opensearch_client
 from app.core.logging import get_logger
 from app.core.config import settings
 from app.core.exceptions import EmbeddingError, RerankError, OpenSearchError
@@ -13,16 +15,22 @@ logger = get_logger(__name__)
 
 
 class MatchingService:
-    """Service for matching resumes and jobs"""
+    """
+    Service for matching resumes and jobs
+    
+    Searches are coroutines: OpenSearch calls go through the async client
+    and the blocking Bedrock calls run in threads, so one worker can serve
+    many searches at once.
+    """
     
     JOBS_INDEX = "jobs_index"
     RESUMES_INDEX = "resumes_index"
     
     def __init__(self):
         self.bedrock = bedrock_client
-        self.opensearch = opensearch_client
+        self.opensearch = async_opensearch_client
     
-    def search_jobs_by_resume(
+    async def search_jobs_by_resume(
         self,
         resume_text: str,
         resume_id: str,
@@ -44,7 +52,7 @@ class MatchingService:
         try:
             # 1. Generate embedding for resume
             logger.info(f"Generating embedding for resume {resume_id}")
-            resume_embedding = self.bedrock.generate_embedding(resume_text)
+            resume_embedding = await asyncio.to_thread(self.bedrock.generate_embedding, resume_text)
             
             # 2. Vector search in jobs index
             logger.info(f"Searching jobs index (top_k={top_k_initial})")
@@ -60,7 +68,7 @@ class MatchingService:
                     job_titles = [job.get("title", "N/A") for job in available_jobs[:10]]
                     logger.info(f"Sample job titles: {job_titles}")
             
-            candidates = self.opensearch.vector_search(
+            candidates = await self.opensearch.vector_search(
                 index_name=self.JOBS_INDEX,
                 query_vector=resume_embedding,
                 top_k=top_k_initial
@@ -87,7 +95,8 @@ class MatchingService:
             # 4. Rerank with Bedrock LLM
             logger.info(f"Reranking {len(candidates_for_rerank)} candidates")
             query_summary = f"Resume Summary: {resume_text[:500]}..."
-            reranked = self.bedrock.rerank_candidates(
+            reranked = await asyncio.to_thread(
+                self.bedrock.rerank_candidates,
                 query=query_summary,
                 candidates=candidates_for_rerank,
                 top_k=top_k_final
@@ -116,7 +125,7 @@ class MatchingService:
             logger.error(f"Error in search_jobs_by_resume: {e}")
             raise
     
-    def search_resumes_by_job(
+    async def search_resumes_by_job(
         self,
         job_description: str,
         job_id: Optional[str] = None,
@@ -139,7 +148,7 @@ class MatchingService:
         try:
             # 1. Generate embedding for job
             logger.info(f"Generating embedding for job {job_id or 'new'}")
-            job_embedding = self.bedrock.generate_embedding(job_description)
+            job_embedding = await asyncio.to_thread(self.bedrock.generate_embedding, job_description)
             
             # 2. Vector search in resumes index
             logger.info(f"Searching resumes index (top_k={top_k_initial})")
@@ -150,14 +159,17 @@ class MatchingService:
                 from app.repositories.resume_repository import resume_repository
                 import numpy as np
                 
-                # Get resumes by IDs and calculate similarity
-                candidates = []
-                for resume_id in resume_ids:
-                    resume = resume_repository.get_resume(resume_id)
+                async def load_resume(resume_id: str) -> Optional[Dict[str, Any]]:
+                    resume = await resume_repository.get_resume_async(resume_id)
                     if not resume:
                         # Try to get from S3
-                        resume = resume_repository.get_resume_from_s3(resume_id)
-                    
+                        resume = await asyncio.to_thread(resume_repository.get_resume_from_s3, resume_id)
+                    return resume
+                
+                # Get resumes by IDs (concurrently) and calculate similarity
+                resumes = await asyncio.gather(*(load_resume(resume_id) for resume_id in resume_ids))
+                candidates = []
+                for resume_id, resume in zip(resume_ids, resumes):
                     if resume:
                         # Calculate similarity score
                         resume_embedding = resume.get("embeddings")
@@ -187,7 +199,7 @@ class MatchingService:
                     available_resumes_count = len(available_resumes)
                     logger.info(f"Available resumes in index: {available_resumes_count}")
                 
-                candidates = self.opensearch.vector_search(
+                candidates = await self.opensearch.vector_search(
                     index_name=self.RESUMES_INDEX,
                     query_vector=job_embedding,
                     top_k=top_k_initial
@@ -214,7 +226,8 @@ class MatchingService:
             # 4. Rerank with Bedrock LLM
             logger.info(f"Reranking {len(candidates_for_rerank)} candidates")
             query_summary = f"Job Description: {job_description[:500]}..."
-            reranked = self.bedrock.rerank_candidates(
+            reranked = await asyncio.to_thread(
+                self.bedrock.rerank_candidates,
                 query=query_summary,
                 candidates=candidates_for_rerank,
                 top_k=top_k_final
@@ -0,0 +1,4 @@
+"""
+Offline benchmarks
+Run from the backend directory, e.g. python -m benchmarks.pdf_filters
+"""
@@ -0,0 +1,1010 @@
+"""
+Offline end-to-end benchmark of the two search modes
+Runs Mode A (POST /api/jobs/search_by_resume) and Mode B
+(POST /api/resumes/search_by_job) through the FastAPI app and through
+lambda_handler, in-process, against a synthetic corpus of jobs and
+PDF/TXT resumes, and reports throughput with p50/p95/p99 latency per
+request and per stage (the stage names of app/core/tracing.py)
+
+Nothing leaves the process: Bedrock is replaced by a stub with
+deterministic hashed embeddings, a canned rerank answer and configurable
+latencies, S3 by the in-memory storage backend and OpenSearch by an
+in-memory index with exact cosine kNN. Optional per-call latencies for
+S3 and OpenSearch stand in for the network. The search result caches are
+off unless --cache is given, so every request does the full work.
+
+Usage:
+    python -m benchmarks.end_to_end [--jobs 200] [--resumes 100] [--requests 50] [--concurrency 4]
+    python -m benchmarks.end_to_end --target lambda --modes b --shortlist 10 \\
+        --embedding-ms 40 --rerank-ms 800 --s3-ms 15 --search-ms 20
+    python -m benchmarks.end_to_end --json results.json
+"""
+import argparse
+import asyncio
+import contextlib
+import functools
+import gzip
+import io
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+
+DIMENSION = 1024
+BUCKET = "resume-matching-benchmark"
+
+ROLES = [
+    "Backend Engineer", "Frontend Developer", "Data Scientist", "Data Engineer", "DevOps Engineer",
+    "QA Engineer", "Mobile Developer", "Project Manager", "Accountant", "HR Officer",
+    "Sales Executive", "Marketing Manager", "Business Analyst", "UX Designer", "Network Administrator"
+]
+SKILLS = [
+    "Python", "Java", "Go", "TypeScript", "React", "Vue", "Kotlin", "Swift", "SQL", "PostgreSQL",
+    "MongoDB", "AWS", "Docker", "Kubernetes", "Terraform", "Spark", "Airflow", "TensorFlow",
+    "PyTorch", "Excel", "SAP", "Power BI", "Tableau", "Figma", "Selenium", "Jenkins", "Linux",
+    "Scrum", "Negotiation", "Payroll", "Recruitment", "SEO", "Copywriting", "CCNA", "Salesforce"
+]
+LEVELS = ["Junior", "Mid-level", "Senior", "Lead"]
+LOCATIONS = ["Bangkok", "Chiang Mai", "Phuket", "Khon Kaen", "Chonburi", "Remote"]
+UNIVERSITIES = ["Chulalongkorn University", "Mahidol University", "Kasetsart University", "Chiang Mai University"]
+
+
+# ---------- Synthetic corpus ----------
+
+def synthetic_jobs(count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    jobs = []
+    for i in range(count):
+        role = rng.choice(ROLES)
+        level = rng.choice(LEVELS)
+        location = rng.choice(LOCATIONS)
+        skills = rng.sample(SKILLS, 6)
+        description = (
+            f"We are hiring a {level.lower()} {role.lower()} to join our team in {location}. "
+            f"You will work with {', '.join(skills[:3])} every day and help us ship reliable products. "
+            f"Requirements: {rng.randint(1, 10)}+ years of experience, strong {skills[3]} and {skills[4]} skills, "
+            f"knowledge of {skills[5]} is a plus. Good communication in Thai and English."
+        )
+        jobs.append({
+            "id": f"job-{i:05d}",
+            "title": f"{level} {role}",
+            "description": description,
+            "metadata": {"location": location, "department": role.split()[-1]}
+        })
+    return jobs
+
+
+def synthetic_resume_lines(index: int, rng: random.Random) -> List[str]:
+    role = rng.choice(ROLES)
+    skills = rng.sample(SKILLS, 8)
+    lines = [
+        f"Candidate {index:05d}",
+        f"{rng.choice(LEVELS)} {role}",
+        f"Location: {rng.choice(LOCATIONS)}",
+        f"Email: candidate{index:05d}@example.com",
+        "",
+        "Skills",
+        ", ".join(skills),
+        "",
+        "Experience"
+    ]
+    for job in range(rng.randint(2, 5)):
+        lines.append(f"{2023 - 2 * job - 2} - {2023 - 2 * job}: {role} at Company {rng.randint(1, 500)}")
+        for _ in range(3):
+            lines.append(f"- Delivered projects using {rng.choice(skills)} and {rng.choice(skills)}")
+    lines += ["", "Education", f"B.Sc. {rng.choice(UNIVERSITIES)}"]
+    return lines
+
+
+def pdf_document(pages: List[List[str]]) -> bytes:
+    """A minimal PDF with one Helvetica text object per page"""
+    objects: List[bytes] = [b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    pages_id = 2 + 2 * len(pages)
+    page_ids = []
+    for lines in pages:
+        text = b" ".join(
+            b"(" + line.encode("latin-1").replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b") Tj T*"
+            for line in lines
+        )
+        stream = b"BT /F1 11 Tf 56 760 Td 14 TL " + text + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 1 0 R >> >> /Contents %d 0 R >>"
+            % (pages_id, len(objects))
+        )
+        page_ids.append(len(objects))
+    objects.append(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % p for p in page_ids), len(page_ids)))
+    objects.append(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, len(objects), xref)
+    return bytes(out)
+
+
+def synthetic_resumes(count: int, pdf_ratio: float, rng: random.Random) -> List[Dict[str, Any]]:
+    """Resume files: {file_name, content, text}; PDFs split over two pages"""
+    resumes = []
+    for i in range(count):
+        lines = synthetic_resume_lines(i, rng)
+        if rng.random() < pdf_ratio:
+            middle = len(lines) // 2
+            content = pdf_document([lines[:middle], lines[middle:]])
+            file_name = f"candidate_{i:05d}.pdf"
+        else:
+            content = "\n".join(lines).encode("utf-8")
+            file_name = f"candidate_{i:05d}.txt"
+        resumes.append({"file_name": file_name, "content": content, "text": "\n".join(lines)})
+    return resumes
+
+
+# ---------- Simulated latency ----------
+
+class Latency:
+    """Sleep for milliseconds (+/- jitter) per call; paused while seeding"""
+
+    def __init__(self, milliseconds: float, jitter: float, seed: int = 0):
+        self.milliseconds = milliseconds
+        self.jitter = jitter
+        self.paused = False
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if self.paused or self.milliseconds <= 0:
+            return
+        with self._lock:
+            factor = 1 + self.jitter * (2 * self._rng.random() - 1)
+        time.sleep(self.milliseconds * factor / 1000)
+
+
+def no_stage(name: str):
+    return contextlib.nullcontext()
+
+
+# ---------- Bedrock stub ----------
+
+def hashed_embedding(text: str, dimension: int = DIMENSION) -> List[float]:
+    """
+    Deterministic bag-of-words embedding: each token (and token bigram)
+    is hashed to a signed dimension, then the vector is normalized, so
+    texts sharing skills and titles end up close
+    """
+    tokens = re.findall(r"\w+", (text or "").lower())
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    vector = np.zeros(dimension, dtype=np.float64)
+    for feature in features:
+        digest = zlib.crc32(feature.encode("utf-8"))
+        vector[digest % dimension] += 1.0 if digest & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    if norm == 0:
+        vector[0] = norm = 1.0
+    return (vector / norm).tolist()
+
+
+class StubBedrockRuntime:
+    """
+    bedrock-runtime client with invoke_model only
+
+    Embedding models (model id containing "embed") return hashed_embedding
+    vectors in Cohere's and Titan's response shapes; every other model
+    returns a canned rerank of the first rerank_count candidates, readable
+    both as a Nova response (output.message.content, the Lambda) and as
+    content[0].text (BedrockClient).
+    """
+
+    def __init__(self, embedding_latency: Latency, rerank_latency: Latency,
+                 dimension: int = DIMENSION, rerank_count: int = 10, stage: Callable = no_stage):
+        self.embedding_latency = embedding_latency
+        self.rerank_latency = rerank_latency
+        self.dimension = dimension
+        self.rerank_count = rerank_count
+        self.stage = stage
+
+    def invoke_model(self, modelId: str, body: str, **kwargs) -> Dict[str, Any]:
+        request = json.loads(body)
+        if "embed" in modelId:
+            with self.stage("generate_embedding"):
+                self.embedding_latency.wait()
+                texts = request.get("texts") or [request.get("inputText", "")]
+                embeddings = [hashed_embedding(text, self.dimension) for text in texts]
+                payload = {"embeddings": embeddings, "embedding": embeddings[0]}
+        else:
+            with self.stage("rerank_candidates"):
+                self.rerank_latency.wait()
+                text = json.dumps({"ranked_candidates": [
+                    {
+                        "candidate_index": i,
+                        "rerank_score": round(0.92 - 0.04 * i, 2),
+                        "reason": "Relevant experience and most of the required skills",
+                        "reasons": "Relevant experience and most of the required skills",
+                        "highlighted_skills": [],
+                        "gaps": []
+                    }
+                    for i in range(self.rerank_count)
+                ]})
+                payload = {"output": {"message": {"content": [{"text": text}]}}, "content": [{"text": text}]}
+        return {"body": io.BytesIO(json.dumps(payload).encode("utf-8")), "contentType": "application/json"}
+
+
+# ---------- S3 stand-in ----------
+
+class TimedStorage:
+    """
+    Storage backend (app/clients/storage_backends.py) with a simulated
+    round trip per S3 call, each timed as stage s3_<operation>
+    """
+
+    OPERATIONS = {"put_object", "get_object", "head_object", "delete_object", "list_objects_v2", "upload_fileobj"}
+
+    def __init__(self, backend: Any, latency: Latency, stage: Callable = no_stage):
+        self.backend = backend
+        self.latency = latency
+        self.stage = stage
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.backend, name)
+        if name not in self.OPERATIONS:
+            return attribute
+
+        @functools.wraps(attribute)
+        def call(*args, **kwargs):
+            with self.stage(f"s3_{name}"):
+                self.latency.wait()
+                return attribute(*args, **kwargs)
+        return call
+
+    def get_paginator(self, operation_name: str) -> Any:
+        from app.clients.storage_backends import ListObjectsV2Paginator
+        if operation_name != "list_objects_v2":
+            raise NotImplementedError(f"No paginator for {operation_name}")
+        return ListObjectsV2Paginator(self)
+
+
+# ---------- OpenSearch stand-in ----------
+
+class QueryError(ValueError):
+    """A search body OpenSearch would reject with 400"""
+
+
+class IndexMissing(KeyError):
+    """No index or alias by that name (404)"""
+
+
+SEARCH_KEYS = {"size", "from", "query", "_source", "sort", "track_total_hits", "timeout", "min_score"}
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _single(clause: Dict[str, Any], where: str) -> Tuple[str, Any]:
+    if not isinstance(clause, dict) or len(clause) != 1:
+        raise QueryError(f"[{where}] malformed query, expected [END_OBJECT] but found [FIELD_NAME]")
+    return next(iter(clause.items()))
+
+
+def _field(source: Dict[str, Any], name: str) -> Any:
+    value: Any = source
+    for part in name.removesuffix(".keyword").split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+def _text_score(source: Dict[str, Any], kind: str, spec: Dict[str, Any]) -> float:
+    if kind == "match_all":
+        return 1.0
+    if kind == "multi_match":
+        query, fields = spec.get("query", ""), [f.split("^")[0] for f in spec.get("fields", ["*"])]
+    else:
+        field, value = _single(spec, kind)
+        query, fields = (value.get("query", "") if isinstance(value, dict) else value), [field]
+    if "*" in fields:
+        text = json.dumps(source, ensure_ascii=False)
+    else:
+        text = " ".join(str(_field(source, f) or "") for f in fields)
+    words = set(re.findall(r"\w+", text.lower()))
+    return float(sum(1 for token in re.findall(r"\w+", str(query).lower()) if token in words))
+
+
+def _matches(doc_id: str, source: Dict[str, Any], clause: Dict[str, Any]) -> bool:
+    kind, spec = _single(clause, "filter")
+    if kind == "bool":
+        required = _as_list(spec.get("must")) + _as_list(spec.get("filter"))
+        should = _as_list(spec.get("should"))
+        minimum = int(spec.get("minimum_should_match", 0 if required else 1)) if should else 0
+        return (
+            all(_matches(doc_id, source, c) for c in required) and
+            not any(_matches(doc_id, source, c) for c in _as_list(spec.get("must_not"))) and
+            sum(1 for c in should if _matches(doc_id, source, c)) >= minimum
+        )
+    if kind == "ids":
+        return doc_id in spec.get("values", [])
+    if kind in ("term", "terms"):
+        field, expected = next((k, v) for k, v in spec.items() if k != "boost")
+        if kind == "term":
+            expected = [expected["value"] if isinstance(expected, dict) else expected]
+        actual = doc_id if field == "_id" else _field(source, field)
+        return any(value in expected for value in _as_list(actual))
+    if kind in ("match_all", "match", "multi_match"):
+        return _text_score(source, kind, spec) > 0
+    raise QueryError(f"no [query] registered for [{kind}]")
+
+
+class MemoryIndex:
+    def __init__(self, body: Optional[Dict[str, Any]] = None):
+        self.body = body or {}
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self._matrices: Dict[str, Tuple[List[str], np.ndarray]] = {}
+
+    def put(self, doc_id: str, source: Dict[str, Any]) -> str:
+        result = "updated" if doc_id in self.documents else "created"
+        self.documents[doc_id] = source
+        self._matrices.clear()
+        return result
+
+    def matrix(self, field: str) -> Tuple[List[str], np.ndarray]:
+        """Ids and normalized vectors of the documents that have field"""
+        if field not in self._matrices:
+            ids = [doc_id for doc_id, source in self.documents.items() if source.get(field)]
+            vectors = np.array([self.documents[doc_id][field] for doc_id in ids], dtype=np.float32).reshape(len(ids), -1)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            self._matrices[field] = (ids, vectors / np.where(norms == 0, 1, norms))
+        return self._matrices[field]
+
+
+class MemoryOpenSearch:
+    """
+    In-process OpenSearch: the opensearch-py methods the app calls
+    (index, get, search, msearch, count, indices.*) over exact kNN
+
+    kNN scores follow nmslib's cosinesimil (1 / (2 - cosine)). Request
+    bodies are checked the way OpenSearch parses them, so a body it
+    would reject fails here too.
+    """
+
+    def __init__(self, latency: Latency):
+        self.latency = latency
+        self._indices: Dict[str, MemoryIndex] = {}
+        self._aliases: Dict[str, str] = {}
+        self._lock = threading.RLock()
+        self.indices = _MemoryIndices(self)
+
+    def resolve(self, name: str) -> MemoryIndex:
+        name = self._aliases.get(name, name)
+        if name not in self._indices:
+            raise IndexMissing(name)
+        return self._indices[name]
+
+    def create_index(self, name: str, body: Optional[Dict[str, Any]] = None) -> None:
+        with self._lock:
+            if name in self._indices or name in self._aliases:
+                raise QueryError(f"index [{name}] already exists")
+            self._indices[name] = MemoryIndex(body)
+            for alias in (body or {}).get("aliases", {}):
+                self._aliases[alias] = name
+
+    def index(self, index: str, body: Dict[str, Any], id: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        self.latency.wait()
+        with self._lock:
+            try:
+                target = self.resolve(index)
+            except IndexMissing:
+                self.create_index(index)
+                target = self._indices[index]
+            doc_id = id or f"{len(target.documents):020d}"
+            result = target.put(doc_id, json.loads(json.dumps(body)))
+        return {"_index": index, "_id": doc_id, "result": result}
+
+    def get(self, index: str, id: str, **kwargs) -> Dict[str, Any]:
+        self.latency.wait()
+        with self._lock:
+            source = self.resolve(index).documents.get(id)
+        if source is None:
+            from opensearchpy.exceptions import NotFoundError
+            raise NotFoundError(404, "not_found", {"_index": index, "_id": id, "found": False})
+        return {"_index": index, "_id": id, "found": True, "_source": dict(source)}
+
+    def count(self, index: str, body: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        self.latency.wait()
+        with self._lock:
+            target = self.resolve(index)
+            query = (body or {}).get("query")
+            count = sum(1 for doc_id, source in target.documents.items() if not query or _matches(doc_id, source, query))
+        return {"count": count}
+
+    def search(self, index: Optional[str] = None, body: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        self.latency.wait()
+        return self._search(index, body or {})
+
+    def msearch(self, body: Any, index: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        self.latency.wait()
+        if isinstance(body, bytes):
+            body = body.decode("utf-8")
+        lines = [json.loads(line) for line in body.splitlines() if line.strip()]
+        responses = []
+        for header, search_body in zip(lines[::2], lines[1::2]):
+            try:
+                responses.append({**self._search(header.get("index", index), search_body), "status": 200})
+            except (QueryError, IndexMissing) as e:
+                status = 404 if isinstance(e, IndexMissing) else 400
+                responses.append({"error": {"type": type(e).__name__, "reason": str(e)}, "status": status})
+        return {"took": 0, "responses": responses}
+
+    def _search(self, index: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        unknown = sorted(set(body) - SEARCH_KEYS)
+        if unknown:
+            raise QueryError(f"Unknown key for a START_OBJECT in [{unknown[0]}].")
+        knn, text, filters = self._parse(body.get("query") or {"match_all": {}})
+        with self._lock:
+            target = self.resolve(index)
+            if knn is not None:
+                field, params = _single(knn, "knn")
+                ids, matrix = target.matrix(field)
+                query = np.asarray(params["vector"], dtype=np.float32)
+                if matrix.shape[0] and query.shape[0] != matrix.shape[1]:
+                    raise QueryError(f"Query vector has invalid dimension: {query.shape[0]}. Dimension should be: {matrix.shape[1]}")
+                cosine = matrix @ (query / (np.linalg.norm(query) or 1.0)) if ids else np.zeros(0)
+                scored = [
+                    (ids[row], float(1.0 / (2.0 - cosine[row])))
+                    for row in np.argsort(-cosine)
+                    if all(_matches(ids[row], target.documents[ids[row]], f) for f in filters)
+                ][:int(params.get("k", 10))]
+            else:
+                kind, spec = _single(text, "query")
+                scored = sorted(
+                    ((doc_id, _text_score(source, kind, spec)) for doc_id, source in target.documents.items()
+                     if all(_matches(doc_id, source, f) for f in filters)),
+                    key=lambda item: -item[1]
+                )
+                scored = [item for item in scored if item[1] > 0]
+            offset = int(body.get("from", 0))
+            page = scored[offset:offset + int(body.get("size", 10))]
+            hits = []
+            for doc_id, score in page:
+                hit = {"_index": index, "_id": doc_id, "_score": score}
+                if body.get("_source", True) is not False:
+                    # Callers add keys to hit sources but never change stored values in place
+                    hit["_source"] = dict(target.documents[doc_id])
+                hits.append(hit)
+        return {
+            "took": int((time.perf_counter() - start) * 1000),
+            "timed_out": False,
+            "hits": {
+                "total": {"value": len(scored), "relation": "eq"},
+                "max_score": hits[0]["_score"] if hits else None,
+                "hits": hits
+            }
+        }
+
+    @staticmethod
+    def _parse(query: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """(knn clause, scoring text clause, filter clauses) of a query"""
+        kind, spec = _single(query, "query")
+        if kind == "knn":
+            _, params = _single(spec, "knn")
+            return spec, None, _as_list(params.get("filter"))
+        if kind in ("match_all", "match", "multi_match"):
+            return None, query, []
+        if kind != "bool":
+            return None, {"match_all": {}}, [query]
+        knn = text = None
+        filters = _as_list(spec.get("filter"))
+        for clause in _as_list(spec.get("must")):
+            clause_kind, clause_spec = _single(clause, "must")
+            if clause_kind == "knn" and knn is None:
+                knn = clause_spec
+                filters += _as_list(_single(clause_spec, "knn")[1].get("filter"))
+            elif clause_kind in ("match", "multi_match") and text is None:
+                text = clause
+            else:
+                filters.append(clause)
+        if spec.get("should") or spec.get("must_not"):
+            filters.append({"bool": {key: spec[key] for key in ("should", "must_not", "minimum_should_match") if key in spec}})
+        if knn is not None:
+            return knn, None, filters
+        return None, text or {"match_all": {}}, filters
+
+
+class _MemoryIndices:
+    def __init__(self, store: MemoryOpenSearch):
+        self.store = store
+
+    def exists(self, index: str, **kwargs) -> bool:
+        try:
+            self.store.resolve(index)
+            return True
+        except IndexMissing:
+            return False
+
+    def create(self, index: str, body: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        self.store.create_index(index, body)
+        return {"acknowledged": True, "index": index}
+
+    def exists_alias(self, name: str, **kwargs) -> bool:
+        return name in self.store._aliases
+
+    def get_alias(self, name: Optional[str] = None, index: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        aliases: Dict[str, Dict[str, Any]] = {}
+        for alias, target in self.store._aliases.items():
+            if (name is None or alias == name) and (index is None or target == index):
+                aliases.setdefault(target, {"aliases": {}})["aliases"][alias] = {}
+        if not aliases:
+            from opensearchpy.exceptions import NotFoundError
+            raise NotFoundError(404, "aliases_not_found_exception", {})
+        return aliases
+
+
+class _HTTPResponse:
+    def __init__(self, status_code: int, payload: Any):
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.headers = {"Content-Type": "application/json"}
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class MemoryOpenSearchSession:
+    """
+    requests.Session stand-in that answers the Lambda's OpenSearch REST
+    calls (lambda_function.OpenSearchHTTP) from a MemoryOpenSearch
+    """
+
+    def __init__(self, store: MemoryOpenSearch):
+        self.store = store
+        self.auth = None
+
+    def request(self, method: str, url: str, data: Any = None, headers: Optional[Dict[str, str]] = None, **kwargs) -> _HTTPResponse:
+        headers = headers or {}
+        if data is not None and headers.get("Content-Encoding") == "gzip":
+            data = gzip.decompress(data)
+        body = kwargs.get("json")
+        if body is None and data:
+            body = data if "ndjson" in headers.get("Content-Type", "") else json.loads(data)
+        parts = [part for part in urlsplit(url).path.split("/") if part]
+        try:
+            return self._route(method.upper(), parts, body)
+        except QueryError as e:
+            return _HTTPResponse(400, {"error": {"type": "parsing_exception", "reason": str(e)}, "status": 400})
+        except IndexMissing as e:
+            return _HTTPResponse(404, {"error": {"type": "index_not_found_exception", "reason": f"no such index [{e.args[0]}]"}, "status": 404})
+
+    def _route(self, method: str, parts: List[str], body: Any) -> _HTTPResponse:
+        store = self.store
+        if parts[:1] == ["_alias"] and len(parts) == 2:
+            return _HTTPResponse(200 if store.indices.exists_alias(parts[1]) else 404, None if method == "HEAD" else {})
+        if parts[-1:] == ["_msearch"]:
+            return _HTTPResponse(200, store.msearch(body, index=parts[0] if len(parts) == 2 else None))
+        if len(parts) == 1:
+            if method == "HEAD":
+                store.latency.wait()
+                return _HTTPResponse(200 if store.indices.exists(parts[0]) else 404, None)
+            if method == "PUT":
+                return _HTTPResponse(200, store.indices.create(parts[0], body))
+        if len(parts) == 2 and parts[1] == "_search":
+            return _HTTPResponse(200, store.search(parts[0], body))
+        if len(parts) == 2 and parts[1] == "_count":
+            return _HTTPResponse(200, store.count(parts[0], body))
+        if len(parts) == 3 and parts[1] == "_doc":
+            if method in ("PUT", "POST"):
+                return _HTTPResponse(201, store.index(parts[0], body, id=parts[2]))
+            try:
+                return _HTTPResponse(200, store.get(parts[0], parts[2]))
+            except Exception:
+                return _HTTPResponse(404, {"_index": parts[0], "_id": parts[2], "found": False})
+        return _HTTPResponse(404, {"error": f"no handler for {method} /{'/'.join(parts)}"})
+
+    def get(self, url: str, **kwargs) -> _HTTPResponse:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> _HTTPResponse:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> _HTTPResponse:
+        return self.request("PUT", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> _HTTPResponse:
+        return self.request("HEAD", url, **kwargs)
+
+
+# ---------- Results ----------
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 1)
+    return {
+        "count": len(ordered),
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": round(ordered[-1], 1)
+    }
+
+
+def report(target: str, mode: str, statuses: List[int], latencies: List[float], seconds: float,
+           stages: Dict[str, Dict[str, float]], concurrency: int) -> Dict[str, Any]:
+    errors = sum(1 for status in statuses if status >= 400)
+    result = {
+        "target": target,
+        "mode": mode,
+        "requests": len(statuses),
+        "errors": errors,
+        "concurrency": concurrency,
+        "seconds": round(seconds, 3),
+        "throughput_rps": round(len(statuses) / seconds, 2) if seconds else 0.0,
+        "latency": summarize(latencies),
+        "stages": stages
+    }
+    print(f"\n{target} / Mode {mode}: {len(statuses)} requests, concurrency {concurrency}, "
+          f"{result['throughput_rps']} req/s, {errors} errors")
+    print(f"  {'stage':<24}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, summary in [("request", result["latency"])] + sorted(stages.items()):
+        print(f"  {name:<24}{summary['count']:>7}{summary['p50_ms']:>10.1f}{summary['p95_ms']:>10.1f}"
+              f"{summary['p99_ms']:>10.1f}{summary['max_ms']:>10.1f}")
+    return result
+
+
+# ---------- Targets ----------
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """Settings for both targets; must run before the app or the Lambda is imported"""
+    os.environ.update({
+        "USE_MOCK": "false",  # real code paths; the clients below are swapped for stand-ins
+        "STORAGE_BACKEND": "memory",
+        "S3_BUCKET_NAME": BUCKET,
+        "OPENSEARCH_ASYNC_ENABLED": "false",
+        "VECTOR_SEARCH_CACHE_ENABLED": "true" if args.cache else "false",
+        "SEARCH_CACHE_MAX_BYTES": os.environ.get("SEARCH_CACHE_MAX_BYTES", str(16 * 1024 * 1024)) if args.cache else "0",
+        "SECRETS_MANAGER_SECRET_NAME": "",
+        "LOG_SHIPPING": "stdout",
+        # Placeholder credentials, so nothing can reach a real account
+        "AWS_ACCESS_KEY_ID": "benchmark",
+        "AWS_SECRET_ACCESS_KEY": "benchmark",
+        "AWS_DEFAULT_REGION": os.environ.get("AWS_DEFAULT_REGION", "ap-southeast-2")
+    })
+    for name in ("AWS_PROFILE", "AWS_SESSION_TOKEN"):
+        os.environ.pop(name, None)
+
+
+class Latencies:
+    def __init__(self, args: argparse.Namespace):
+        self.embedding = Latency(args.embedding_ms, args.jitter, seed=1)
+        self.rerank = Latency(args.rerank_ms, args.jitter, seed=2)
+        self.s3 = Latency(args.s3_ms, args.jitter, seed=3)
+        self.search = Latency(args.search_ms, args.jitter, seed=4)
+
+    @contextlib.contextmanager
+    def paused(self):
+        everything = (self.embedding, self.rerank, self.s3, self.search)
+        for latency in everything:
+            latency.paused = True
+        try:
+            yield
+        finally:
+            for latency in everything:
+                latency.paused = False
+
+
+class ASGIClient:
+    """Just enough of an HTTP client to call an ASGI app in-process"""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def request(self, method: str, path: str, query: Optional[Dict[str, str]] = None,
+                      body: Any = None) -> Tuple[int, Dict[str, str], bytes]:
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode("ascii"),
+            "query_string": urlencode(query or {}).encode("ascii"),
+            "root_path": "",
+            "headers": [
+                (b"host", b"benchmark"),
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode("ascii"))
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("benchmark", 80)
+        }
+        request_sent = False
+        response_done = asyncio.Event()
+        status = 500
+        headers: Dict[str, str] = {}
+        chunks: List[bytes] = []
+
+        async def receive() -> Dict[str, Any]:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": payload, "more_body": False}
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers.update({key.decode("latin-1").lower(): value.decode("latin-1") for key, value in message.get("headers", [])})
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_done.set()
+
+        await self.app(scope, receive, send)
+        return status, headers, b"".join(chunks)
+
+
+class AppTarget:
+    """The FastAPI app (backend/main.py) with its AWS clients replaced"""
+
+    name = "app"
+
+    def __init__(self, latencies: Latencies, args: argparse.Namespace):
+        from app.clients import storage_backends
+        # Installed before the clients are imported, so every S3Client shares it
+        storage_backends._backend = TimedStorage(storage_backends.InMemoryBackend(), latencies.s3)
+
+        from main import app
+        from app.clients.bedrock_client import bedrock_client
+        from app.clients.opensearch_client import opensearch_client
+        from app.core import tracing
+
+        # BedrockClient, S3Client and the search methods carry their own spans
+        bedrock_client.client = StubBedrockRuntime(latencies.embedding, latencies.rerank, args.dimension)
+        opensearch_client.client = MemoryOpenSearch(latencies.search)
+        self.app = app
+        self.client = ASGIClient(app)
+        self.tracing = tracing
+        self.latencies = latencies
+        self.job_ids: List[str] = []
+        self.resume_ids: List[str] = []
+
+    def seed(self, jobs: List[Dict[str, Any]], resumes: List[Dict[str, Any]]) -> None:
+        from app.repositories.job_repository import job_repository
+        from app.repositories.resume_repository import resume_repository
+        with self.latencies.paused():
+            job_repository.ensure_index()
+            for job in jobs:
+                self.job_ids.append(job_repository.create_job(job["title"], job["description"], job["metadata"])["job_id"])
+            for resume in resumes:
+                self.resume_ids.append(resume_repository.create_resume(resume["content"], resume["file_name"])["resume_id"])
+
+    def mode_a(self, i: int) -> Tuple[str, str, Optional[Dict[str, str]], Any]:
+        return "POST", "/api/jobs/search_by_resume", None, {"resume_id": self.resume_ids[i % len(self.resume_ids)]}
+
+    def mode_b(self, i: int, shortlist: List[int]) -> Tuple[str, str, Optional[Dict[str, str]], Any]:
+        body = {"resume_ids": [self.resume_ids[s] for s in shortlist]} if shortlist else None
+        return "POST", "/api/resumes/search_by_job", {"job_id": self.job_ids[i % len(self.job_ids)]}, body
+
+    def run(self, requests: List[Tuple[str, str, Optional[Dict[str, str]], Any]], concurrency: int) -> Tuple[List[int], List[float], float]:
+        async def drive() -> Tuple[List[int], List[float], float]:
+            semaphore = asyncio.Semaphore(concurrency)
+            statuses: List[int] = []
+            latencies: List[float] = []
+
+            async def one(request: Tuple[str, str, Optional[Dict[str, str]], Any]) -> None:
+                async with semaphore:
+                    start = time.perf_counter()
+                    status, _, _ = await self.client.request(*request)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    statuses.append(status)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(one(request) for request in requests))
+            return statuses, latencies, time.perf_counter() - start
+        return asyncio.run(drive())
+
+    def close(self) -> None:
+        # The lifespan (ingestion workers) is not needed to search; only the extraction pool is running
+        from app.services.extraction_service import extraction_service
+        extraction_service.shutdown()
+
+    def reset_stages(self) -> None:
+        self.tracing.latency_stats.reset()
+
+    def stages(self) -> Dict[str, Dict[str, float]]:
+        # Request totals are recorded as "<METHOD> <route>"; the harness reports its own
+        return {name: summary for name, summary in self.tracing.latency_stats.snapshot().items() if " " not in name}
+
+
+class LambdaTarget:
+    """lambda_function.lambda_handler with its AWS clients replaced"""
+
+    name = "lambda"
+
+    def __init__(self, latencies: Latencies, args: argparse.Namespace):
+        import lambda_function
+        from app.clients.storage_backends import InMemoryBackend
+
+        self.L = lambda_function
+        # botocore's event hooks time the real clients; the stand-ins time themselves
+        self.L.s3 = TimedStorage(InMemoryBackend(), latencies.s3, stage=self.L.stage)
+        self.L.bedrock_runtime = StubBedrockRuntime(latencies.embedding, latencies.rerank, args.dimension, stage=self.L.stage)
+        self.store = MemoryOpenSearch(latencies.search)
+        self.L.opensearch_http.session = MemoryOpenSearchSession(self.store)
+        self.latencies = latencies
+        self.args = args
+        self.job_ids: List[str] = []
+        self.resume_files: List[str] = []
+
+    def seed(self, jobs: List[Dict[str, Any]], resumes: List[Dict[str, Any]]) -> None:
+        """Jobs in jobs_index; resume files in S3 (not yet extracted) and resumes_index"""
+        with self.latencies.paused():
+            for index in (self.L.INDEX_NAME, "resumes_index"):
+                self.store.create_index(index)
+            for job in jobs:
+                self.store.index(self.L.INDEX_NAME, {
+                    **job,
+                    "text_excerpt": job["description"][:500],
+                    "embeddings": hashed_embedding(f"{job['title']}\n{job['description']}", self.args.dimension)
+                }, id=job["id"])
+                self.job_ids.append(job["id"])
+            for resume in resumes:
+                key = f"{self.L.RESUME_PREFIX}Candidate/{resume['file_name']}"
+                self.L.s3.put_object(Bucket=self.L.RESUME_BUCKET, Key=key, Body=resume["content"])
+                self.store.index("resumes_index", {
+                    "filename": resume["file_name"],
+                    "s3_key": key,
+                    "text_excerpt": resume["text"][:500],
+                    "full_text": resume["text"],
+                    "embeddings": hashed_embedding(resume["text"], self.args.dimension)
+                }, id=os.path.splitext(resume["file_name"])[0])
+                self.resume_files.append(resume["file_name"])
+
+    @staticmethod
+    def _event(method: str, path: str, query: Optional[Dict[str, str]], body: Any) -> Dict[str, Any]:
+        return {
+            "version": "2.0",
+            "rawPath": path,
+            "rawQueryString": urlencode(query or {}),
+            "queryStringParameters": query,
+            "headers": {"content-type": "application/json"},
+            "requestContext": {"http": {"method": method, "path": path}},
+            "body": json.dumps(body) if body is not None else "{}",
+            "isBase64Encoded": False
+        }
+
+    def mode_a(self, i: int) -> Dict[str, Any]:
+        resume = self.resume_files[i % len(self.resume_files)]
+        return self._event("POST", "/api/jobs/search_by_resume", None, {"resume_key": f"Candidate/{resume}"})
+
+    def mode_b(self, i: int, shortlist: List[int]) -> Dict[str, Any]:
+        # The Lambda requires a shortlist
+        keys = [f"Candidate/{self.resume_files[s]}" for s in (shortlist or range(len(self.resume_files)))]
+        return self._event("POST", "/api/resumes/search_by_job", {"job_id": self.job_ids[i % len(self.job_ids)]}, {"resume_keys": keys})
+
+    def run(self, events: List[Dict[str, Any]], concurrency: int) -> Tuple[List[int], List[float], float]:
+        statuses: List[int] = []
+        latencies: List[float] = []
+
+        def one(event: Dict[str, Any]) -> None:
+            start = time.perf_counter()
+            result = self.L.lambda_handler(event, None)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses.append(result.get("statusCode", 500))
+
+        # The handler prints every step; keep the report readable
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                list(pool.map(one, events))
+            seconds = time.perf_counter() - start
+        return statuses, latencies, seconds
+
+    def close(self) -> None:
+        pass
+
+    def reset_stages(self) -> None:
+        with self.L._trace_lock:
+            self.L._stage_samples.clear()
+
+    def stages(self) -> Dict[str, Dict[str, float]]:
+        return {name: summary for name, summary in self.L.stage_percentiles().items() if name != "total"}
+
+
+def run_mode(target: Any, mode: str, args: argparse.Namespace, rng: random.Random) -> Dict[str, Any]:
+    def build(i: int) -> Any:
+        if mode == "A":
+            return target.mode_a(i)
+        shortlist = rng.sample(range(args.resumes), min(args.shortlist, args.resumes)) if args.shortlist else []
+        return target.mode_b(i, shortlist)
+
+    if args.warmup:
+        target.run([build(i) for i in range(args.warmup)], args.concurrency)
+    requests = [build(args.warmup + i) for i in range(args.requests)]
+    target.reset_stages()
+    statuses, latencies, seconds = target.run(requests, args.concurrency)
+    return report(target.name, mode, statuses, latencies, seconds, target.stages(), args.concurrency)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("app", "lambda", "both"), default="both")
+    parser.add_argument("--modes", choices=("a", "b", "ab"), default="ab")
+    parser.add_argument("--jobs", type=int, default=200, help="Synthetic jobs")
+    parser.add_argument("--resumes", type=int, default=100, help="Synthetic resumes")
+    parser.add_argument("--pdf-ratio", type=float, default=0.5, help="Share of resumes stored as PDF (the rest TXT)")
+    parser.add_argument("--dimension", type=int, default=DIMENSION)
+    parser.add_argument("--requests", type=int, default=50, help="Measured requests per mode")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests per mode first")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--shortlist", type=int, default=20, help="Resumes sent with each Mode B request (0 = none)")
+    parser.add_argument("--embedding-ms", type=float, default=0.0, help="Simulated Bedrock embedding latency")
+    parser.add_argument("--rerank-ms", type=float, default=0.0, help="Simulated Bedrock rerank latency")
+    parser.add_argument("--s3-ms", type=float, default=0.0, help="Simulated latency per S3 call")
+    parser.add_argument("--search-ms", type=float, default=0.0, help="Simulated latency per OpenSearch call")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Relative +/- spread of simulated latencies")
+    parser.add_argument("--cache", action="store_true", help="Keep the vector search result caches on")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="Also write the results here")
+    args = parser.parse_args()
+
+    configure_environment(args)
+    rng = random.Random(args.seed)
+    jobs = synthetic_jobs(args.jobs, rng)
+    resumes = synthetic_resumes(args.resumes, args.pdf_ratio, rng)
+    print(f"{len(jobs)} jobs, {len(resumes)} resumes "
+          f"({sum(1 for r in resumes if r['file_name'].endswith('.pdf'))} PDF), {args.dimension}-d embeddings")
+
+    latencies = Latencies(args)
+    targets = []
+    if args.target in ("app", "both"):
+        targets.append(AppTarget(latencies, args))
+        # main.py configures console logging; only warnings are useful here
+        root = logging.getLogger()
+        root.handlers = [logging.StreamHandler()]
+        root.setLevel(logging.WARNING)
+    if args.target in ("lambda", "both"):
+        targets.append(LambdaTarget(latencies, args))
+
+    results = []
+    for target in targets:
+        try:
+            target.seed(jobs, resumes)
+            for mode in args.modes.upper():
+                results.append(run_mode(target, mode, args, random.Random(args.seed)))
+        finally:
+            target.close()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+        print(f"\nWrote results to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
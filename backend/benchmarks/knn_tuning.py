@@ -0,0 +1,462 @@
+"""
+Offline tuning harness for the kNN mapping
+Sweeps HNSW engine, m, ef_construction, ef_search and vector encoding,
+measures recall@k against exact NumPy top-k together with p50/p99 query
+latency and memory, and prints the mapping of the best configuration
+
+Vectors come from an index snapshot (written by --export or
+infra/export_opensearch_index.py), a .npy file, or a synthetic clustered
+corpus. Configurations run against
+a local OpenSearch container (--target opensearch, security disabled) or
+the in-process HNSW below (--target local); local latencies are only
+comparable with each other.
+
+Usage:
+    python -m benchmarks.knn_tuning --export jobs_index --vectors snapshots/jobs_index
+    python -m benchmarks.knn_tuning --vectors snapshots/jobs_index --target opensearch \\
+        --engines nmslib,faiss,lucene --m 16,24,32 --ef-search 50,100,200
+    python -m benchmarks.knn_tuning --synthetic 2000 --dim 256 --target local \\
+        --emit tuned_mapping.json
+"""
+import argparse
+import copy
+import heapq
+import json
+import math
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+MAPPING_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "infra", "opensearch_index_mapping.json")
+VECTOR_FIELD = "embeddings"
+
+# Encodings each engine supports: fp16 through faiss's scalar quantizer,
+# int8 through lucene's (OpenSearch 2.16+); nmslib stores float32 only
+ENGINE_ENCODINGS = {
+    "nmslib": ("fp32",),
+    "faiss": ("fp32", "fp16"),
+    "lucene": ("fp32", "int8"),
+    "local": ("fp32", "fp16", "int8"),
+}
+BYTES_PER_DIMENSION = {"fp32": 4, "fp16": 2, "int8": 1}
+
+
+# ---------- Vectors ----------
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.maximum(norms, 1e-12)).astype(np.float32)
+
+
+def synthetic_vectors(count: int, dim: int, clusters: int = 50, seed: int = 0) -> np.ndarray:
+    """Clustered Gaussian vectors (embeddings of similar documents cluster too)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    assignment = rng.integers(0, clusters, size=count)
+    return normalize(centers[assignment] + rng.normal(scale=0.6, size=(count, dim)))
+
+
+def load_vectors(path: str) -> np.ndarray:
+    """Vectors from an index snapshot directory or a .npy file"""
+    if os.path.isdir(path):
+        from app.services.index_export_service import load_snapshot
+        documents, vectors = load_snapshot(path)
+        return vectors[[i for i, document in enumerate(documents) if document["_has_vector"]]]
+    return np.load(path, mmap_mode="r")
+
+
+def split_queries(vectors: np.ndarray, query_count: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Hold query_count random vectors out of the corpus to use as queries"""
+    order = np.random.default_rng(seed).permutation(len(vectors))
+    return vectors[order[query_count:]], vectors[order[:query_count]]
+
+
+def exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int, block: int = 256) -> np.ndarray:
+    """Exact cosine top-k ids per query (rows normalized), best first"""
+    results = np.empty((len(queries), k), dtype=np.int64)
+    for start in range(0, len(queries), block):
+        scores = queries[start:start + block] @ corpus.T
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+        results[start:start + block] = np.take_along_axis(top, order, axis=1)
+    return results
+
+
+def encode(corpus: np.ndarray, encoding: str) -> np.ndarray:
+    """corpus as stored under encoding, decoded back to float32"""
+    if encoding == "fp32":
+        return corpus
+    if encoding == "fp16":
+        return corpus.astype(np.float16).astype(np.float32)
+    if encoding == "int8":
+        # Per-dimension min/max scalar quantization, like lucene's sq encoder
+        low, high = corpus.min(axis=0), corpus.max(axis=0)
+        scale = np.maximum(high - low, 1e-12) / 255.0
+        codes = np.round((corpus - low) / scale)
+        return (codes * scale + low).astype(np.float32)
+    raise ValueError(f"Unknown encoding: {encoding}")
+
+
+def recall_at_k(found: List[List[int]], truth: np.ndarray) -> float:
+    k = truth.shape[1]
+    hits = sum(len(set(row[:k]) & set(expected.tolist())) for row, expected in zip(found, truth))
+    return hits / (k * len(truth))
+
+
+def estimated_memory_bytes(count: int, dim: int, m: int, encoding: str) -> int:
+    """OpenSearch's HNSW sizing formula: 1.1 * (bytes per vector + 8 * m) * vectors"""
+    return int(1.1 * (BYTES_PER_DIMENSION[encoding] * dim + 8 * m) * count)
+
+
+# ---------- Local HNSW ----------
+
+class LocalHNSW:
+    """
+    Minimal HNSW graph (cosine, normalized vectors) for sweeping without a cluster
+
+    Same structure and parameters as the engines' HNSW (m links per node,
+    2m on the bottom layer, ef_construction / ef_search candidate lists),
+    with plain nearest-neighbour link selection.
+    """
+
+    def __init__(self, m: int, ef_construction: int, seed: int = 0):
+        self.m = m
+        self.ef_construction = ef_construction
+        self.level_factor = 1 / math.log(m)
+        self.rng = random.Random(seed)
+        self.vectors: Optional[np.ndarray] = None
+        self.layers: List[Dict[int, List[int]]] = []
+        self.entry: Optional[int] = None
+
+    def build(self, vectors: np.ndarray) -> None:
+        self.vectors = vectors
+        for node in range(len(vectors)):
+            self._insert(node)
+
+    def _search_layer(self, query: np.ndarray, entries: List[int], ef: int, layer: int) -> List[Tuple[float, int]]:
+        graph = self.layers[layer]
+        visited = set(entries)
+        distances = (1 - self.vectors[entries] @ query).tolist()
+        candidates = list(zip(distances, entries))
+        heapq.heapify(candidates)
+        results = [(-distance, node) for distance, node in candidates]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+        while candidates:
+            distance, node = heapq.heappop(candidates)
+            if distance > -results[0][0]:
+                break
+            neighbours = [n for n in graph[node] if n not in visited]
+            if not neighbours:
+                continue
+            visited.update(neighbours)
+            for neighbour_distance, neighbour in zip((1 - self.vectors[neighbours] @ query).tolist(), neighbours):
+                if len(results) < ef or neighbour_distance < -results[0][0]:
+                    heapq.heappush(candidates, (neighbour_distance, neighbour))
+                    heapq.heappush(results, (-neighbour_distance, neighbour))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+        return sorted((-distance, node) for distance, node in results)
+
+    def _descend(self, query: np.ndarray, down_to: int) -> List[int]:
+        entries = [self.entry]
+        for layer in range(len(self.layers) - 1, down_to, -1):
+            entries = [self._search_layer(query, entries, 1, layer)[0][1]]
+        return entries
+
+    def _insert(self, node: int) -> None:
+        level = int(-math.log(1 - self.rng.random()) * self.level_factor)
+        top = len(self.layers) - 1
+        while len(self.layers) <= level:
+            self.layers.append({})
+        for layer in range(level + 1):
+            self.layers[layer][node] = []
+        if self.entry is None:
+            self.entry = node
+            return
+
+        query = self.vectors[node]
+        entries = self._descend(query, level) if top > level else [self.entry]
+        for layer in range(min(level, top), -1, -1):
+            found = self._search_layer(query, entries, self.ef_construction, layer)
+            max_links = 2 * self.m if layer == 0 else self.m
+            links = [n for _, n in found[:self.m]]
+            self.layers[layer][node] = links
+            for neighbour in links:
+                neighbour_links = self.layers[layer][neighbour]
+                neighbour_links.append(node)
+                if len(neighbour_links) > max_links:
+                    distances = 1 - self.vectors[neighbour_links] @ self.vectors[neighbour]
+                    self.layers[layer][neighbour] = [neighbour_links[i] for i in np.argsort(distances)[:max_links]]
+            entries = [n for _, n in found]
+        if level > top:
+            self.entry = node
+
+    def search(self, query: np.ndarray, k: int, ef_search: int) -> List[int]:
+        entries = self._descend(query, 0)
+        return [node for _, node in self._search_layer(query, entries, max(ef_search, k), 0)[:k]]
+
+
+# ---------- Targets ----------
+
+def method_definition(engine: str, m: int, ef_construction: int, encoding: str) -> Dict[str, Any]:
+    method = {
+        "name": "hnsw",
+        "space_type": "cosinesimil",
+        "engine": engine,
+        "parameters": {"ef_construction": ef_construction, "m": m}
+    }
+    if engine == "faiss" and encoding == "fp16":
+        method["parameters"]["encoder"] = {"name": "sq", "parameters": {"type": "fp16"}}
+    elif engine == "lucene" and encoding == "int8":
+        method["parameters"]["encoder"] = {"name": "sq"}
+    return method
+
+
+class LocalTarget:
+    engines = ("local",)
+
+    def __init__(self):
+        self.graph: Optional[LocalHNSW] = None
+
+    def build(self, corpus: np.ndarray, engine: str, m: int, ef_construction: int, encoding: str) -> Optional[int]:
+        self.graph = LocalHNSW(m, ef_construction)
+        self.graph.build(encode(corpus, encoding))
+        return None  # memory is estimated
+
+    def search(self, query: np.ndarray, k: int, ef_search: int) -> List[int]:
+        return self.graph.search(query, k, ef_search)
+
+    def drop(self) -> None:
+        self.graph = None
+
+
+class OpenSearchTarget:
+    """Scratch indices on a local OpenSearch container (security plugin disabled)"""
+
+    engines = ("nmslib", "faiss", "lucene")
+    INDEX = "knn_tuning_scratch"
+
+    def __init__(self, url: str):
+        from opensearchpy import OpenSearch, helpers
+        self.client = OpenSearch(hosts=[url], timeout=300)
+        self.helpers = helpers
+        self.engine = None
+
+    def build(self, corpus: np.ndarray, engine: str, m: int, ef_construction: int, encoding: str) -> Optional[int]:
+        self.drop()
+        self.engine = engine
+        self.client.indices.create(index=self.INDEX, body={
+            "settings": {"index": {"knn": True, "number_of_shards": 1, "number_of_replicas": 0, "refresh_interval": "-1"}},
+            "mappings": {"properties": {VECTOR_FIELD: {
+                "type": "knn_vector",
+                "dimension": corpus.shape[1],
+                "method": method_definition(engine, m, ef_construction, encoding)
+            }}}
+        })
+        self.helpers.bulk(self.client, (
+            {"_index": self.INDEX, "_id": str(i), VECTOR_FIELD: vector.tolist()}
+            for i, vector in enumerate(corpus)
+        ), chunk_size=500)
+        self.client.indices.refresh(index=self.INDEX)
+        # One segment = one graph, as a long-lived index ends up after merging
+        self.client.indices.forcemerge(index=self.INDEX, max_num_segments=1)
+        if engine == "lucene":
+            return None  # not in the native graph memory stats; estimated
+        self.client.transport.perform_request("GET", f"/_plugins/_knn/warmup/{self.INDEX}")
+        stats = self.client.transport.perform_request("GET", "/_plugins/_knn/stats")
+        return sum(node.get("graph_memory_usage", 0) for node in stats["nodes"].values()) * 1024
+
+    def search(self, query: np.ndarray, k: int, ef_search: int) -> List[int]:
+        knn = {"vector": query.tolist(), "k": k}
+        if self.engine != "nmslib":  # nmslib reads ef_search from the index setting (set_ef_search)
+            knn["method_parameters"] = {"ef_search": ef_search}
+        response = self.client.search(index=self.INDEX, body={
+            "size": k,
+            "_source": False,
+            "query": {"knn": {VECTOR_FIELD: knn}}
+        })
+        return [int(hit["_id"]) for hit in response["hits"]["hits"]]
+
+    def set_ef_search(self, ef_search: int) -> None:
+        if self.engine == "nmslib":
+            self.client.indices.put_settings(index=self.INDEX, body={"index": {"knn.algo_param.ef_search": ef_search}})
+
+    def drop(self) -> None:
+        if self.client.indices.exists(index=self.INDEX):
+            self.client.indices.delete(index=self.INDEX)
+
+
+# ---------- Sweep ----------
+
+def run_sweep(target, corpus: np.ndarray, queries: np.ndarray, truth: np.ndarray, args) -> List[Dict[str, Any]]:
+    rows = []
+    engines = [engine for engine in args.engines if engine in target.engines] or list(target.engines)
+    for engine in engines:
+        encodings = [encoding for encoding in args.encodings if encoding in ENGINE_ENCODINGS[engine]]
+        for m in args.m:
+            for ef_construction in args.ef_construction:
+                for encoding in encodings:
+                    start = time.perf_counter()
+                    memory = target.build(corpus, engine, m, ef_construction, encoding)
+                    build_seconds = time.perf_counter() - start
+                    for ef_search in args.ef_search:
+                        if hasattr(target, "set_ef_search"):
+                            target.set_ef_search(ef_search)
+                        for query in queries[:args.warmup]:
+                            target.search(query, args.k, ef_search)
+                        found, latencies = [], []
+                        for query in queries:
+                            start = time.perf_counter()
+                            found.append(target.search(query, args.k, ef_search))
+                            latencies.append((time.perf_counter() - start) * 1000)
+                        row = {
+                            "engine": engine,
+                            "m": m,
+                            "ef_construction": ef_construction,
+                            "ef_search": ef_search,
+                            "encoding": encoding,
+                            "recall": recall_at_k(found, truth),
+                            "p50_ms": float(np.percentile(latencies, 50)),
+                            "p99_ms": float(np.percentile(latencies, 99)),
+                            "memory_mb": (memory or estimated_memory_bytes(len(corpus), corpus.shape[1], m, encoding)) / 2**20,
+                            "memory_measured": memory is not None,
+                            "build_s": build_seconds
+                        }
+                        rows.append(row)
+                        print_row(row)
+    target.drop()
+    return rows
+
+
+def print_header(k: int) -> None:
+    print(f"{'engine':<8}{'m':>4}{'ef_c':>6}{'ef_s':>6}{'enc':>6}{f'recall@{k}':>11}{'p50 ms':>9}{'p99 ms':>9}{'mem MB':>9}{'build s':>9}")
+
+
+def print_row(row: Dict[str, Any]) -> None:
+    memory = f"{row['memory_mb']:.1f}" + ("" if row["memory_measured"] else "~")
+    print(f"{row['engine']:<8}{row['m']:>4}{row['ef_construction']:>6}{row['ef_search']:>6}{row['encoding']:>6}"
+          f"{row['recall']:>11.4f}{row['p50_ms']:>9.2f}{row['p99_ms']:>9.2f}{memory:>9}{row['build_s']:>9.1f}")
+
+
+def load_mapping(index_name: str) -> Dict[str, Any]:
+    with open(MAPPING_PATH) as f:
+        return copy.deepcopy(json.load(f)[index_name])
+
+
+def emitted_engine(body: Dict[str, Any], row: Dict[str, Any]) -> str:
+    """Engine the mapping for row uses: results from the local target carry over to the engine already in use"""
+    return body["mappings"]["properties"][VECTOR_FIELD]["method"]["engine"] if row["engine"] == "local" else row["engine"]
+
+
+def choose(rows: List[Dict[str, Any]], target_recall: float, index_name: str) -> Dict[str, Any]:
+    """
+    Lowest p99 among configurations meeting target_recall (else the best recall)
+
+    Only rows whose encoding the emitted engine supports are considered,
+    so the chosen row describes the mapping that is written.
+    """
+    body = load_mapping(index_name)
+    emittable = [row for row in rows if row["encoding"] in ENGINE_ENCODINGS[emitted_engine(body, row)]]
+    if len(emittable) < len(rows):
+        skipped = sorted({row["encoding"] for row in rows} - {row["encoding"] for row in emittable})
+        print(f"Not choosing {', '.join(skipped)} rows: the engine of the emitted mapping does not support them")
+    rows = emittable or rows
+    eligible = [row for row in rows if row["recall"] >= target_recall]
+    if not eligible:
+        print(f"No configuration reached recall {target_recall}; choosing the highest recall")
+        return max(rows, key=lambda row: (row["recall"], -row["p99_ms"]))
+    return min(eligible, key=lambda row: (row["p99_ms"], row["memory_mb"]))
+
+
+def tuned_mapping(index_name: str, row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The index_name mapping with the chosen method and ef_search
+
+    ef_search goes in the index settings for nmslib and in the method
+    parameters for faiss; lucene only takes it at query time.
+    """
+    body = load_mapping(index_name)
+    engine = emitted_engine(body, row)
+    encoding = row["encoding"]
+    if encoding not in ENGINE_ENCODINGS[engine]:
+        print(f"{engine} does not support {encoding}; emitting fp32 (the chosen row's recall and latency do not apply)")
+        encoding = "fp32"
+    method = method_definition(engine, row["m"], row["ef_construction"], encoding)
+    index_settings = body["settings"]["index"]
+    index_settings.pop("knn.algo_param.ef_search", None)
+    if engine == "nmslib":
+        index_settings["knn.algo_param.ef_search"] = row["ef_search"]
+    elif engine == "faiss":
+        method["parameters"]["ef_search"] = row["ef_search"]
+    else:
+        # Lucene's method only takes m, ef_construction and encoder
+        print(f"lucene has no index-level ef_search; pass \"method_parameters\": "
+              f"{{\"ef_search\": {row['ef_search']}}} in the knn query to match the chosen row")
+    body["mappings"]["properties"][VECTOR_FIELD]["method"] = method
+    return body
+
+
+def int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(",")]
+
+
+def str_list(value: str) -> List[str]:
+    return [part.strip() for part in value.split(",")]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--vectors", help="Index snapshot directory (written by --export) or .npy file")
+    source.add_argument("--synthetic", type=int, help="Generate this many clustered vectors")
+    parser.add_argument("--export", metavar="INDEX", help="Export INDEX to the --vectors snapshot first (resumes)")
+    parser.add_argument("--dim", type=int, default=1024, help="Dimension of synthetic vectors")
+    parser.add_argument("--index", default="jobs_index", help="Mapping to tune in infra/opensearch_index_mapping.json")
+    parser.add_argument("--target", choices=("local", "opensearch"), default="local")
+    parser.add_argument("--opensearch-url", default="http://localhost:9200")
+    parser.add_argument("--engines", type=str_list, default=["nmslib", "faiss", "lucene"])
+    parser.add_argument("--m", type=int_list, default=[16, 24, 32])
+    parser.add_argument("--ef-construction", type=int_list, default=[128])
+    parser.add_argument("--ef-search", type=int_list, default=[50, 100, 200])
+    parser.add_argument("--encodings", type=str_list, default=["fp32", "fp16", "int8"])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--target-recall", type=float, default=0.95)
+    parser.add_argument("--emit", help="Write the chosen mapping here (default: print it)")
+    args = parser.parse_args()
+
+    if args.export:
+        if not args.vectors:
+            parser.error("--export needs --vectors")
+        from app.services.index_export_service import index_export_service
+        index_export_service.export(args.export, args.vectors, vector_field=VECTOR_FIELD)
+    vectors = normalize(load_vectors(args.vectors)) if args.vectors else synthetic_vectors(args.synthetic, args.dim)
+    corpus, queries = split_queries(vectors, args.queries)
+    truth = exact_top_k(corpus, queries, args.k)
+    print(f"{len(corpus)} vectors x {corpus.shape[1]} dims, {len(queries)} queries, target {args.target}")
+
+    target = LocalTarget() if args.target == "local" else OpenSearchTarget(args.opensearch_url)
+    print_header(args.k)
+    rows = run_sweep(target, corpus, queries, truth, args)
+    print("(~ memory estimated with OpenSearch's HNSW sizing formula)")
+
+    best = choose(rows, args.target_recall, args.index)
+    print("\nChosen:")
+    print_row(best)
+    mapping = tuned_mapping(args.index, best)
+    if args.emit:
+        with open(args.emit, "w") as f:
+            json.dump(mapping, f, indent=2)
+        print(f"Wrote mapping for {args.index} to {args.emit}")
+    else:
+        print(json.dumps(mapping, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Microbenchmark for the bundled PyPDF2 stream decoders
+Compares the PNG-predictor and LZW decoders in PyPDF2/filters.py with the
+original byte-by-byte implementations and checks that output is identical
+
+Usage:
+    python -m benchmarks.pdf_filters [--rows 400] [--columns 600] [--repeat 5]
+"""
+import argparse
+import math
+import random
+import time
+from io import BytesIO
+
+from PyPDF2 import filters
+from PyPDF2._utils import paeth_predictor
+from PyPDF2.errors import PdfReadError
+
+
+def legacy_png_prediction(data: bytes, columns: int, rowlength: int) -> bytes:
+    """PyPDF2 3.0.1 FlateDecode._decode_png_prediction"""
+    output = BytesIO()
+    if len(data) % rowlength != 0:
+        raise PdfReadError("Image data is not rectangular")
+    prev_rowdata = (0,) * rowlength
+    for row in range(len(data) // rowlength):
+        rowdata = [x for x in data[(row * rowlength) : ((row + 1) * rowlength)]]
+        filter_byte = rowdata[0]
+        if filter_byte == 0:
+            pass
+        elif filter_byte == 1:
+            for i in range(2, rowlength):
+                rowdata[i] = (rowdata[i] + rowdata[i - 1]) % 256
+        elif filter_byte == 2:
+            for i in range(1, rowlength):
+                rowdata[i] = (rowdata[i] + prev_rowdata[i]) % 256
+        elif filter_byte == 3:
+            for i in range(1, rowlength):
+                left = rowdata[i - 1] if i > 1 else 0
+                floor = math.floor(left + prev_rowdata[i]) / 2
+                rowdata[i] = (rowdata[i] + int(floor)) % 256
+        elif filter_byte == 4:
+            for i in range(1, rowlength):
+                left = rowdata[i - 1] if i > 1 else 0
+                up = prev_rowdata[i]
+                up_left = prev_rowdata[i - 1] if i > 1 else 0
+                rowdata[i] = (rowdata[i] + paeth_predictor(left, up, up_left)) % 256
+        else:
+            raise PdfReadError(f"Unsupported PNG filter {filter_byte!r}")
+        prev_rowdata = tuple(rowdata)
+        output.write(bytearray(rowdata[1:]))
+    return output.getvalue()
+
+
+def legacy_lzw_decode(data: bytes) -> str:
+    """PyPDF2 3.0.1 LZWDecode.Decoder"""
+    table = [chr(i) for i in range(256)] + [""] * (4096 - 256)
+    state = {"bytepos": 0, "bitpos": 0}
+    dictlen, bitspercode = 258, 9
+
+    def next_code(bits: int) -> int:
+        fillbits, value = bits, 0
+        while fillbits > 0:
+            if state["bytepos"] >= len(data):
+                return -1
+            nextbits = data[state["bytepos"]]
+            bitsfromhere = min(8 - state["bitpos"], fillbits)
+            value |= (
+                (nextbits >> (8 - state["bitpos"] - bitsfromhere)) & (0xFF >> (8 - bitsfromhere))
+            ) << (fillbits - bitsfromhere)
+            fillbits -= bitsfromhere
+            state["bitpos"] += bitsfromhere
+            if state["bitpos"] >= 8:
+                state["bitpos"] = 0
+                state["bytepos"] += 1
+        return value
+
+    cW, baos = 256, ""
+    while True:
+        pW = cW
+        cW = next_code(bitspercode)
+        if cW == -1:
+            raise PdfReadError("Missed the stop code in LZWDecode!")
+        if cW == 257:
+            break
+        elif cW == 256:
+            dictlen, bitspercode = 258, 9
+        elif pW == 256:
+            baos += table[cW]
+        else:
+            if cW < dictlen:
+                baos += table[cW]
+                table[dictlen] = table[pW] + table[cW][0]
+            else:
+                p = table[pW] + table[pW][0]
+                baos += p
+                table[dictlen] = p
+            dictlen += 1
+            if dictlen >= (1 << bitspercode) - 1 and bitspercode < 12:
+                bitspercode += 1
+    return baos
+
+
+def lzw_encode(data: bytes) -> bytes:
+    """
+    Minimal PDF LZW encoder used to build benchmark input
+
+    The decoder adds its first table entry one code later than the encoder,
+    so the code width grows once the encoder's table reaches 2**bits entries.
+    """
+    table = {bytes((i,)): i for i in range(256)}
+    dictlen, bits = 258, 9
+    codes = [(256, 9)]
+    w = b""
+    for byte in data:
+        wc = w + bytes((byte,))
+        if wc in table:
+            w = wc
+            continue
+        codes.append((table[w], bits))
+        table[wc] = dictlen
+        dictlen += 1
+        if dictlen >= (1 << bits) and bits < 12:
+            bits += 1
+        if dictlen >= 4094:
+            codes.append((256, bits))
+            table = {bytes((i,)): i for i in range(256)}
+            dictlen, bits = 258, 9
+        w = bytes((byte,))
+    if w:
+        codes.append((table[w], bits))
+        dictlen += 1
+        if dictlen >= (1 << bits) and bits < 12:
+            bits += 1
+    codes.append((257, bits))
+
+    acc, nbits, out = 0, 0, bytearray()
+    for code, width in codes:
+        acc = (acc << width) | code
+        nbits += width
+        while nbits >= 8:
+            nbits -= 8
+            out.append((acc >> nbits) & 0xFF)
+    if nbits:
+        out.append((acc << (8 - nbits)) & 0xFF)
+    return bytes(out)
+
+
+def png_input(rows: int, columns: int, seed: int = 0) -> bytes:
+    """Rows cycling through all five PNG filters over image-like data"""
+    rng = random.Random(seed)
+    data = bytearray()
+    for row in range(rows):
+        data.append(row % 5)
+        base = rng.randrange(256)
+        data.extend((base + rng.randrange(8)) & 0xFF for _ in range(columns))
+    return bytes(data)
+
+
+def best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=400)
+    parser.add_argument("--columns", type=int, default=600)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    png = png_input(args.rows, args.columns)
+    rowlength = args.columns + 1
+    assert filters.FlateDecode._decode_png_prediction(png, args.columns, rowlength) == \
+        legacy_png_prediction(png, args.columns, rowlength), "PNG output differs"
+    legacy_png = best_of(lambda: legacy_png_prediction(png, args.columns, rowlength), args.repeat)
+    new_png = best_of(lambda: filters.FlateDecode._decode_png_prediction(png, args.columns, rowlength), args.repeat)
+
+    text = png_input(args.rows, args.columns, seed=1)
+    lzw = lzw_encode(text)
+    assert filters.LZWDecode.decode(lzw) == legacy_lzw_decode(lzw) == text.decode("latin-1"), "LZW output differs"
+    legacy_lzw = best_of(lambda: legacy_lzw_decode(lzw), args.repeat)
+    new_lzw = best_of(lambda: filters.LZWDecode.decode(lzw), args.repeat)
+
+    print(f"numpy: {'yes' if filters.np is not None else 'no'}")
+    print(f"{'decoder':<16}{'input':>12}{'legacy ms':>12}{'new ms':>10}{'speedup':>10}")
+    for name, size, old, new in (
+        ("png predictor", len(png), legacy_png, new_png),
+        ("lzw", len(lzw), legacy_lzw, new_lzw),
+    ):
+        print(f"{name:<16}{size:>12}{old * 1000:>12.1f}{new * 1000:>10.1f}{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-# Script to create Lambda Layer for requests and requests-aws4auth
+# Script to create Lambda Layer for requests, requests-aws4auth and zstandard
 # This replaces bundling dependencies in Lambda package
 
 Write-Host "=== Creating Lambda Layer for requests ===" -ForegroundColor Cyan
@@ -17,7 +17,7 @@ New-Item -ItemType Directory -Path $pythonDir -Force | Out-Null
 Write-Host "[OK] Created directory $pythonDir" -ForegroundColor Green
 
 # Install dependencies
-Write-Host "`n[2/4] Installing requests and requests-aws4auth..." -ForegroundColor Yellow
+Write-Host "`n[2/4] Installing requests, requests-aws4auth and zstandard..." -ForegroundColor Yellow
 Push-Location $pythonDir
 
 try {
@@ -29,6 +29,15 @@ try {
         exit 1
     }
     
+    # zstandard is a native extension: take the Linux wheel for the Lambda runtime,
+    # not the one for this machine (the app and upload script write zstd objects)
+    pip install zstandard -t . --quiet --only-binary=:all: --platform manylinux2014_x86_64 --implementation cp --python-version 3.10
+    
+    if ($LASTEXITCODE -ne 0) {
+        Write-Host "[ERROR] pip install zstandard failed" -ForegroundColor Red
+        exit 1
+    }
+    
     Write-Host "[OK] Dependencies installed successfully" -ForegroundColor Green
     
     # Check if requests is installed
@@ -153,10 +153,10 @@ if ($dockerAvailable) {
     # ⚠️ สำคัญ: ต้อง copy ไปใน python/ เท่านั้น ไม่ให้มีไฟล์ต้องห้ามที่ root level
     $dependenciesToCopy = @(
         "fastapi", "mangum", "starlette", "pydantic", "pydantic_core", "pydantic_settings",
-        "opensearchpy", "multipart", "PyPDF2", "docx", "pythonjsonlogger", "watchtower",
+        "opensearchpy", "multipart", "PyPDF2", "docx", "pythonjsonlogger",
         "h11", "anyio", "sniffio", "idna", "certifi", "charset_normalizer", "urllib3",
         "requests", "requests_aws4auth", "click", "colorama", "dateutil", "jmespath", "six.py", "typing_extensions.py",
-        "yaml", "_yaml", "dotenv", "httptools", "lxml"
+        "yaml", "_yaml", "dotenv", "httptools", "lxml", "zstandard"
     )
     
     $copiedCount = 0
@@ -0,0 +1,35 @@
+"""
+Ingestion worker
+Drains the ingestion queue (SQS in production, the local SQLite queue otherwise)
+
+Usage:
+    python ingestion_worker.py
+
+For an SQS-triggered Lambda, point the handler at ingestion_worker.lambda_handler
+and enable ReportBatchItemFailures on the event source mapping.
+"""
+import signal
+import threading
+
+from app.core.logging import setup_logging, get_logger
+from app.services.ingestion_service import ingestion_service
+
+setup_logging()
+logger = get_logger(__name__)
+
+
+def lambda_handler(event, context):
+    return ingestion_service.handle_sqs_event(event)
+
+
+def main():
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+    logger.info("Ingestion worker started")
+    ingestion_service.run_worker(stop_event)
+    logger.info("Ingestion worker stopped")
+
+
+if __name__ == "__main__":
+    main()
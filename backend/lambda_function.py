@@ -1,5 +1,7 @@
 import json
 import boto3
+from botocore import xform_name
+from botocore.config import Config
 import urllib.parse
 import sys
 import os
@@ -13,8 +15,19 @@ if os.path.exists(python_dir) and python_dir not in sys.path:
 import requests
 from requests_aws4auth import AWS4Auth
 from requests.auth import HTTPBasicAuth
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import io
 import os
+import hashlib
+import struct
+import time
+import gzip
+import unicodedata
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from collections import OrderedDict, deque
 
 # ================== CONFIG ==================
 OPENSEARCH_HOST = "search-resume-search-dev-hfdsgupxj4uwviltrlqhpc2liu.ap-southeast-2.es.amazonaws.com"
@@ -31,6 +44,257 @@ BEDROCK_EMBEDDING_MODEL = "cohere.embed-multilingual-v3"
 # Use model ID directly instead of inference profile
 BEDROCK_RERANK_MODEL = "amazon.nova-lite-v1:0"  # Changed from us.amazon.nova-lite-v1:0
 
+# ---------- Stage tracing ----------
+# Mirrors app/core/tracing.py: per-invocation stage timings (Server-Timing
+# header + one JSON log line) and rolling percentiles per container (/api/metrics)
+TRACING_ENABLED = os.environ.get("TRACING_ENABLED", "true").lower() == "true"
+TRACING_WINDOW_SAMPLES = int(os.environ.get("TRACING_WINDOW_SAMPLES", "1024"))  # Most recent samples kept per stage
+_trace_stages = {}  # stage -> [count, total ms] for the current invocation
+_trace_lock = threading.Lock()
+_stage_samples = {}  # stage -> deque of recent ms, across warm invocations
+
+
+def record_stage(name, milliseconds):
+    with _trace_lock:
+        totals = _trace_stages.setdefault(name, [0, 0.0])
+        totals[0] += 1
+        totals[1] += milliseconds
+        samples = _stage_samples.get(name)
+        if samples is None:
+            samples = _stage_samples[name] = deque(maxlen=TRACING_WINDOW_SAMPLES)
+        samples.append(milliseconds)
+
+
+@contextmanager
+def stage(name):
+    """Time one stage of the current invocation"""
+    if not TRACING_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, (time.perf_counter() - start) * 1000)
+
+
+def stage_percentiles():
+    """p50/p95/p99 of the recent samples of every stage in this container"""
+    with _trace_lock:
+        values = {name: sorted(samples) for name, samples in _stage_samples.items() if samples}
+    summary = {}
+    for name, latencies in sorted(values.items()):
+        def percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 1)
+        summary[name] = {
+            "count": len(latencies),
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(latencies[-1], 1)
+        }
+    return summary
+
+
+def server_timing(stages, total_ms):
+    entries = [
+        f'{name};dur={total:.1f}' + (f';desc="x{count}"' if count > 1 else "")
+        for name, (count, total) in stages.items()
+    ]
+    entries.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(entries)
+
+def iter_pdf_page_text(file_content, max_pages=None):
+    """
+    Yield the text of each PDF page, parsing pages lazily. The reader is
+    text-only, so image XObjects are skipped without loading their data.
+    """
+    import PyPDF2
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content), text_only=True)
+    for page in pdf_reader.iter_pages(max_pages):
+        yield page.extract_text()
+
+# Stored object codecs (same format as app.core.codecs): JSON is written
+# compact and compressed, and the codec is recorded in the "codec" object
+# metadata. Objects without it (older uploads) are sniffed by magic bytes.
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+STORAGE_CODEC = os.environ.get("STORAGE_CODEC", "auto").lower()  # auto | zstd | gzip | identity
+
+def storage_codec():
+    if STORAGE_CODEC in ("auto", "zstd"):
+        return "zstd" if zstandard is not None else "gzip"
+    return STORAGE_CODEC
+
+def encode_stored_json(data, metadata=None):
+    """Keyword arguments for s3.put_object storing data as compressed JSON"""
+    codec = storage_codec()
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    put_args = {"ContentType": "application/json", "Metadata": {**(metadata or {}), "codec": codec}}
+    if codec == "gzip":
+        body = gzip.compress(body)
+    elif codec == "zstd":
+        body = zstandard.ZstdCompressor(level=3).compress(body)
+    if codec != "identity":
+        put_args["ContentEncoding"] = codec
+    put_args["Body"] = body
+    return put_args
+
+def decode_stored_json(obj):
+    """Parse the JSON body of an s3.get_object response, whatever codec it was stored with"""
+    body = obj["Body"].read()
+    codec = obj.get("Metadata", {}).get("codec")
+    if codec is None:
+        codec = "gzip" if body[:2] == b"\x1f\x8b" else "zstd" if body[:4] == b"\x28\xb5\x2f\xfd" else "identity"
+    if codec == "gzip":
+        body = gzip.decompress(body)
+    elif codec == "zstd":
+        if zstandard is None:
+            raise ValueError("Object is zstd-compressed but the zstandard package is not installed")
+        with zstandard.ZstdDecompressor().stream_reader(body) as reader:
+            body = reader.read()
+    return json.loads(body)
+
+# Persisted extraction sidecars: resumes/_extracted/<path under RESUME_PREFIX>.json
+# Same format and version as app.services.file_processor.EXTRACTOR_VERSION, so
+# sidecars written by the API and by this Lambda are interchangeable.
+EXTRACTION_PREFIX = f"{RESUME_PREFIX}_extracted/"
+EXTRACTOR_FORMAT = "1"
+
+def extractor_version():
+    """Version stamped on sidecars; a change forces re-extraction"""
+    import PyPDF2
+    return f"{EXTRACTOR_FORMAT}/pypdf2-{PyPDF2.__version__}"
+
+def extraction_sidecar_key(resume_key):
+    relative = resume_key[len(RESUME_PREFIX):] if resume_key.startswith(RESUME_PREFIX) else resume_key
+    return f"{EXTRACTION_PREFIX}{relative}.json"
+
+def extract_resume_document(file_content, file_name):
+    """
+    Normalized text, page count and section offsets of a resume file
+    (mirrors FileProcessor.extract_document). text is None for file
+    types this Lambda cannot parse.
+    """
+    with stage("extract_text"):
+        return _extract_resume_document(file_content, file_name)
+
+
+def _extract_resume_document(file_content, file_name):
+    lower_name = file_name.lower()
+    if lower_name.endswith('.pdf'):
+        sections = iter_pdf_page_text(file_content)
+    elif lower_name.endswith('.txt'):
+        sections = [file_content.decode('utf-8', errors='ignore')]
+    else:
+        return {"text": None, "page_count": 0, "sections": []}
+
+    parts = [unicodedata.normalize("NFC", section or "").replace("\x00", "") for section in sections]
+    raw = "\n".join(parts)
+    text = raw.strip()
+    lead = len(raw) - len(raw.lstrip())
+    offsets = []
+    start = 0
+    for part in parts:
+        end = start + len(part)
+        offsets.append([min(max(start - lead, 0), len(text)), min(max(end - lead, 0), len(text))])
+        start = end + 1
+    return {"text": text, "page_count": len(parts), "sections": offsets}
+
+# Resume index: resumes/_index/<resume_id>.json (same layout as app.clients.s3_client.S3Client.index_resume)
+RESUME_INDEX_PREFIX = f"{RESUME_PREFIX}_index/"
+
+def index_resume_object(resume_key, bucket=RESUME_BUCKET, etag=None, size=None, resume_id=None):
+    """
+    Record resume_id -> key, size, etag, content hash for a stored resume.
+    The id is the one the API put in the object metadata, else resume_id.
+    """
+    try:
+        head = s3.head_object(Bucket=bucket, Key=resume_key)
+        metadata = head.get("Metadata", {})
+        resume_id = metadata.get("resume_id") or resume_id
+        if not resume_id:
+            return None
+        entry = {
+            "resume_id": resume_id,
+            "s3_key": resume_key,
+            "file_name": metadata.get("original_filename") or resume_key.split("/")[-1],
+            "size": size if size is not None else head.get("ContentLength", 0),
+            "etag": (etag or head.get("ETag", "")).strip('"'),
+            "content_hash": metadata.get("content_sha256"),
+            "uploaded_at": metadata.get("uploaded_at") or (
+                head["LastModified"].isoformat() if head.get("LastModified") else datetime.utcnow().isoformat()
+            ),
+            "indexed_at": datetime.utcnow().isoformat()
+        }
+        s3.put_object(
+            Bucket=bucket,
+            Key=f"{RESUME_INDEX_PREFIX}{resume_id}.json",
+            Body=json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+            ContentType="application/json"
+        )
+        return entry
+    except Exception as e:
+        print(f"Warning: could not index resume {resume_key}: {e}")
+        return None
+
+def load_extraction_sidecar(resume_key, bucket=RESUME_BUCKET, etag=None):
+    """Persisted extraction of resume_key, or None if missing, outdated or stale against etag"""
+    try:
+        obj = s3.get_object(Bucket=bucket, Key=extraction_sidecar_key(resume_key))
+        sidecar = decode_stored_json(obj)
+    except Exception:
+        return None
+    if sidecar.get("extractor_version") != extractor_version():
+        return None
+    if etag and sidecar.get("source_etag") and sidecar["source_etag"] != etag.strip('"'):
+        return None
+    return sidecar
+
+def load_resume_extraction(resume_key, bucket=RESUME_BUCKET, etag=None):
+    """
+    Extraction of a stored resume: the sidecar when it is current, otherwise
+    download, extract and persist a new one. Raises if the resume object
+    cannot be read; text is None when it could not be extracted. Without
+    an etag the object is HEADed for it, so an overwritten file never gets
+    its predecessor's sidecar.
+    """
+    if etag is None:
+        etag = s3.head_object(Bucket=bucket, Key=resume_key).get("ETag", "")
+    sidecar = load_extraction_sidecar(resume_key, bucket, etag)
+    if sidecar:
+        return sidecar
+
+    obj = s3.get_object(Bucket=bucket, Key=resume_key)
+    file_content = obj["Body"].read()
+    file_name = resume_key.split("/")[-1]
+    try:
+        extraction = extract_resume_document(file_content, file_name)
+    except Exception as e:
+        print(f"Warning: Could not extract text from {file_name}: {e}")
+        extraction = {"text": None, "page_count": 0, "sections": []}
+    extraction.update({
+        "extractor_version": extractor_version(),
+        "source_key": resume_key,
+        "source_etag": obj.get("ETag", "").strip('"'),
+        "source_size": len(file_content),
+        "extracted_at": datetime.utcnow().isoformat()
+    })
+
+    if extraction["text"] is not None:
+        try:
+            s3.put_object(
+                Bucket=bucket,
+                Key=extraction_sidecar_key(resume_key),
+                **encode_stored_json(extraction)
+            )
+        except Exception as e:
+            print(f"Warning: Could not persist extraction for {resume_key}: {e}")
+    return extraction
+
 # Helper function to extract important information from resume for embedding
 def extract_important_resume_info(resume_text, max_chars=2048):
     """
@@ -155,26 +419,222 @@ def extract_important_job_info(job_title, job_location, job_description, max_cha
 # OpenSearch credentials (from environment or default)
 OPENSEARCH_USERNAME = os.environ.get("OPENSEARCH_USERNAME", "Admin")
 OPENSEARCH_PASSWORD = os.environ.get("OPENSEARCH_PASSWORD", "P@ssw0rd")
+
+# Vector search result cache (module level, so it survives warm invocations)
+SEARCH_CACHE_MAX_BYTES = int(os.environ.get("SEARCH_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+# Writes made by other containers are only seen through the TTL
+SEARCH_CACHE_TTL_SECONDS = int(os.environ.get("SEARCH_CACHE_TTL_SECONDS", "300"))
+SEARCH_CACHE_PRECISION = 4  # Decimal places kept when hashing query vectors
 # ============================================
 
 # ---------- AWS clients ----------
+# Created once per container and reused by every warm invocation (boto3
+# clients are thread-safe); pool, keep-alive, timeouts and retries from env
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "50")),
+    tcp_keepalive=os.environ.get("AWS_TCP_KEEPALIVE", "true").lower() == "true",
+    connect_timeout=int(os.environ.get("AWS_CONNECT_TIMEOUT_SECONDS", "5")),
+    read_timeout=int(os.environ.get("AWS_READ_TIMEOUT_SECONDS", "60")),
+    retries={
+        "mode": os.environ.get("AWS_RETRY_MODE", "standard"),
+        "total_max_attempts": int(os.environ.get("AWS_MAX_ATTEMPTS", "5"))
+    }
+)
 session = boto3.Session()
+# RefreshableCredentials under the Lambda role: refreshed on access, not up front
 credentials = session.get_credentials()
 
 # Use HTTPBasicAuth for OpenSearch (username/password)
 opensearch_auth = HTTPBasicAuth(OPENSEARCH_USERNAME, OPENSEARCH_PASSWORD)
 
+# ---------- OpenSearch HTTP client ----------
+OPENSEARCH_POOL_SIZE = int(os.environ.get("OPENSEARCH_POOL_SIZE", "10"))
+OPENSEARCH_MAX_RETRIES = int(os.environ.get("OPENSEARCH_MAX_RETRIES", "3"))
+OPENSEARCH_RETRY_BACKOFF = float(os.environ.get("OPENSEARCH_RETRY_BACKOFF", "0.3"))  # 0.3s, 0.6s, 1.2s ...
+OPENSEARCH_GZIP_MIN_BYTES = int(os.environ.get("OPENSEARCH_GZIP_MIN_BYTES", "1024"))  # Smaller bodies are sent as is
+OPENSEARCH_MSEARCH_MAX_QUERIES = int(os.environ.get("OPENSEARCH_MSEARCH_MAX_QUERIES", "50"))  # kNN queries per _msearch request
+OPENSEARCH_MSEARCH_MAX_BYTES = int(os.environ.get("OPENSEARCH_MSEARCH_MAX_BYTES", str(4 * 1024 * 1024)))  # NDJSON bytes per _msearch request
+# Versioned indices: documents are written through "<index>_write" when that alias exists
+WRITE_ALIAS_SUFFIX = os.environ.get("WRITE_ALIAS_SUFFIX", "_write")
+ALIAS_CACHE_SECONDS = int(os.environ.get("ALIAS_CACHE_SECONDS", "30"))  # Must not exceed the reindex tool's wait
+
+
+class OpenSearchHTTP:
+    """
+    requests-style client for the OpenSearch domain on one pooled Session.
+
+    Module level, so connections (and their TLS sessions) are kept alive
+    across calls and warm invocations instead of a new handshake per
+    request. 429 and 5xx responses are retried with exponential backoff
+    (honouring Retry-After), and larger JSON bodies are sent gzipped.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, auth, pool_size, max_retries, backoff, gzip_min_bytes):
+        self.gzip_min_bytes = gzip_min_bytes
+        self.session = requests.Session()
+        self.session.auth = auth
+        self.adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=max_retries,
+                backoff_factor=backoff,
+                status_forcelist=self.RETRY_STATUSES,
+                allowed_methods=None,  # _search, _bulk and doc PUTs are all safe to repeat
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        )
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.requests_sent = 0
+        self.bytes_saved = 0
+
+    def request(self, method, url, data=None, headers=None, **kwargs):
+        headers = dict(headers or {})
+        body = kwargs.pop("json", None)
+        if body is not None:
+            data = json.dumps(body).encode("utf-8")
+            headers.setdefault("Content-Type", "application/json")
+        if data is not None and len(data) >= self.gzip_min_bytes:
+            compressed = gzip.compress(data, compresslevel=5)
+            self.bytes_saved += len(data) - len(compressed)
+            data = compressed
+            headers["Content-Encoding"] = "gzip"
+        kwargs.pop("auth", None)  # the session carries the auth
+        self.requests_sent += 1
+        path = urllib.parse.urlsplit(url).path
+        with stage("vector_search" if path.endswith(("/_search", "/_msearch")) else "opensearch"):
+            return self.session.request(method, url, data=data, headers=headers, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def stats(self):
+        """Requests sent vs TCP/TLS connections opened since the container started"""
+        connections = 0
+        pool_requests = 0
+        for key in self.adapter.poolmanager.pools.keys():
+            pool = self.adapter.poolmanager.pools[key]
+            connections += pool.num_connections
+            pool_requests += pool.num_requests
+        return {
+            "requests": self.requests_sent,
+            "http_requests": pool_requests,  # includes retries
+            "connections_opened": connections,
+            "connection_reuse_ratio": round(1 - connections / pool_requests, 4) if pool_requests else 0.0,
+            "gzip_bytes_saved": self.bytes_saved
+        }
+
+
+opensearch_http = OpenSearchHTTP(
+    opensearch_auth,
+    OPENSEARCH_POOL_SIZE,
+    OPENSEARCH_MAX_RETRIES,
+    OPENSEARCH_RETRY_BACKOFF,
+    OPENSEARCH_GZIP_MIN_BYTES
+)
+
+_write_indices = {}  # index name -> (write target, resolved at)
+
+
+def write_index(index_name):
+    """
+    Index (or alias) to write index_name documents to
+
+    The write alias while the index is managed as versions, so documents
+    written during a reindex land in the new version; the index itself
+    otherwise. Rechecked every ALIAS_CACHE_SECONDS.
+    """
+    cached = _write_indices.get(index_name)
+    if cached and time.time() - cached[1] < ALIAS_CACHE_SECONDS:
+        return cached[0]
+    alias = f"{index_name}{WRITE_ALIAS_SUFFIX}"
+    try:
+        res = opensearch_http.head(f"https://{OPENSEARCH_HOST}/_alias/{alias}", auth=opensearch_auth, timeout=5)
+        target = alias if res.status_code == 200 else index_name
+    except Exception as e:
+        print(f"WARNING: Could not resolve write alias {alias}: {e}")
+        target = cached[0] if cached else index_name
+    _write_indices[index_name] = (target, time.time())
+    return target
+
+
+def ensure_index(index_name, index_mapping):
+    """
+    Create index_name as version 1 behind its read and write aliases
+
+    The same layout the app and create_opensearch_indices.py create, so a
+    later reindex can move the aliases instead of blocking writes to a
+    concrete index. Does nothing when index_name (an index or an alias)
+    already exists.
+    """
+    check_res = opensearch_http.head(f"https://{OPENSEARCH_HOST}/{index_name}", auth=opensearch_auth, timeout=10)
+    if check_res.status_code != 404:
+        return
+    versioned = f"{index_name}_v1"
+    write_alias = f"{index_name}{WRITE_ALIAS_SUFFIX}"
+    create_res = opensearch_http.put(
+        f"https://{OPENSEARCH_HOST}/{versioned}",
+        auth=opensearch_auth,
+        headers={"Content-Type": "application/json"},
+        json={**index_mapping, "aliases": {index_name: {}, write_alias: {}}},
+        timeout=30
+    )
+    if create_res.status_code not in [200, 201]:
+        print(f"Warning: Could not create index: {create_res.text}")
+    else:
+        _write_indices.pop(index_name, None)
+        print(f"Created {versioned} behind aliases {index_name}, {write_alias} in OpenSearch")
+
 # Keep AWS4Auth for other AWS services if needed
 awsauth = AWS4Auth(
-    credentials.access_key,
-    credentials.secret_key,
-    REGION,
-    SERVICE,
-    session_token=credentials.token
+    refreshable_credentials=credentials,
+    region=REGION,
+    service=SERVICE
 ) if credentials else None
 
-s3 = boto3.client("s3")
-bedrock_runtime = boto3.client("bedrock-runtime", region_name=BEDROCK_REGION)
+s3 = session.client("s3", config=AWS_CLIENT_CONFIG)
+bedrock_runtime = session.client("bedrock-runtime", region_name=BEDROCK_REGION, config=AWS_CLIENT_CONFIG)
+
+
+def _aws_call_started(context, **kwargs):
+    context["trace_started"] = time.perf_counter()
+
+
+def _aws_call_finished(service, model, context, **kwargs):
+    started = context.get("trace_started")
+    if started is None or not TRACING_ENABLED:
+        return
+    if service == "bedrock":
+        model_id = context.get("trace_model_id", "")
+        name = "generate_embedding" if model_id == BEDROCK_EMBEDDING_MODEL else "rerank_candidates"
+    else:
+        name = f"s3_{xform_name(model.name)}"
+    record_stage(name, (time.perf_counter() - started) * 1000)
+
+
+def _bedrock_call_started(context, params, **kwargs):
+    context["trace_started"] = time.perf_counter()
+    context["trace_model_id"] = params.get("modelId", "")
+
+
+# Time every S3 and Bedrock call (retries included) as a stage
+s3.meta.events.register("before-parameter-build.s3", _aws_call_started)
+s3.meta.events.register("after-call.s3", lambda **kwargs: _aws_call_finished("s3", **kwargs))
+bedrock_runtime.meta.events.register("before-parameter-build.bedrock-runtime", _bedrock_call_started)
+bedrock_runtime.meta.events.register("after-call.bedrock-runtime", lambda **kwargs: _aws_call_finished("bedrock", **kwargs))
 
 # ---------- Helpers ----------
 def response(status, body):
@@ -187,8 +647,209 @@ def response(status, body):
         "body": json.dumps(body)
     }
 
+# ---------- Search cache ----------
+_search_cache = OrderedDict()  # (index_name, key) -> (generation, stored_at, raw response bytes)
+_search_cache_bytes = 0
+_index_generations = {}
+
+
+def bump_index_generation(index_name):
+    """Invalidate cached searches for an index after this container wrote to it"""
+    global _search_cache_bytes
+    _index_generations[index_name] = _index_generations.get(index_name, 0) + 1
+    for cache_key in [k for k in _search_cache if k[0] == index_name]:
+        _search_cache_bytes -= len(_search_cache.pop(cache_key)[2])
+
+
+def search_cache_key(query_vector, k, filters=None):
+    """Cache key from a quantized vector hash, k and filters"""
+    scale = 10 ** SEARCH_CACHE_PRECISION
+    packed = struct.pack(f"<{len(query_vector)}q", *(int(round(x * scale)) for x in query_vector))
+    filters_part = json.dumps(filters, sort_keys=True) if filters else ""
+    return f"{hashlib.sha1(packed).hexdigest()}|{k}|{filters_part}"
+
+
+class CachedSearchResponse:
+    """Stand-in for requests.Response when a search is served from the cache"""
+    status_code = 200
+
+    def __init__(self, content):
+        self.content = content
+        self.text = content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def search_cache_get(index_name, cache_key):
+    """Raw response bytes cached for (index_name, cache_key), or None when missing or stale"""
+    global _search_cache_bytes
+    entry = _search_cache.get((index_name, cache_key))
+    if entry is None:
+        return None
+    entry_generation, stored_at, content = entry
+    if entry_generation == _index_generations.get(index_name, 0) and time.time() - stored_at <= SEARCH_CACHE_TTL_SECONDS:
+        _search_cache.move_to_end((index_name, cache_key))
+        return content
+    _search_cache_bytes -= len(_search_cache.pop((index_name, cache_key))[2])
+    return None
+
+
+def search_cache_put(index_name, cache_key, generation, content):
+    """Cache raw response bytes from a search that started at generation"""
+    global _search_cache_bytes
+    if len(content) > SEARCH_CACHE_MAX_BYTES or generation != _index_generations.get(index_name, 0):
+        return
+    previous = _search_cache.pop((index_name, cache_key), None)
+    if previous is not None:
+        _search_cache_bytes -= len(previous[2])
+    _search_cache[(index_name, cache_key)] = (generation, time.time(), content)
+    _search_cache_bytes += len(content)
+    while _search_cache_bytes > SEARCH_CACHE_MAX_BYTES and _search_cache:
+        _, (_, _, evicted) = _search_cache.popitem(last=False)
+        _search_cache_bytes -= len(evicted)
+
+
+def cached_vector_search(index_name, search_query, query_vector, k, filters=None, timeout=10):
+    """POST a kNN query to OpenSearch, serving repeats from the in-container cache"""
+    cache_key = search_cache_key(query_vector, k, filters)
+    generation = _index_generations.get(index_name, 0)
+
+    content = search_cache_get(index_name, cache_key)
+    if content is not None:
+        print(f"Search cache hit for {index_name} (k={k})")
+        return CachedSearchResponse(content)
+
+    search_res = opensearch_http.post(
+        f"https://{OPENSEARCH_HOST}/{index_name}/_search",
+        auth=opensearch_auth,
+        headers={"Content-Type": "application/json"},
+        json=search_query,
+        timeout=timeout
+    )
+    if search_res.status_code == 200:
+        search_cache_put(index_name, cache_key, generation, search_res.content)
+    return search_res
+
+
+def knn_search_body(query_vector, k, size=None, filters=None):
+    """kNN query on the embeddings field, optionally filtered"""
+    knn = {"knn": {"embeddings": {"vector": query_vector, "k": k}}}
+    query = {"bool": {"must": [knn], "filter": filters}} if filters else knn
+    return {"size": size or k, "query": query}
+
+
+def vector_search_many(index_name, queries, timeout=30):
+    """
+    Several kNN searches in as few _msearch round trips as possible.
+
+    queries are dicts with query_vector, top_k and optionally size and
+    filters (the same keys as the app's OpenSearchClient.vector_search_many).
+    Cached queries come from the search cache; the rest are sent in
+    batches of at most OPENSEARCH_MSEARCH_MAX_QUERIES queries and
+    OPENSEARCH_MSEARCH_MAX_BYTES. Returns one search response dict per
+    query, in order; a failed query (or batch) gets {"error": ..., "status": ...}
+    instead of failing the others.
+    """
+    generation = _index_generations.get(index_name, 0)
+    results = [None] * len(queries)
+    cache_keys = []
+    pending = []
+    for position, query in enumerate(queries):
+        cache_key = search_cache_key(query["query_vector"], query["top_k"], query.get("filters"))
+        cache_keys.append(cache_key)
+        content = search_cache_get(index_name, cache_key)
+        if content is not None:
+            results[position] = json.loads(content)
+        else:
+            pending.append(position)
+    if len(pending) < len(queries):
+        print(f"Search cache hits for {len(queries) - len(pending)} of {len(queries)} queries in {index_name}")
+
+    header = json.dumps({"index": index_name})
+    batches = []
+    batch, lines, size = [], [], 0
+    for position in pending:
+        query = queries[position]
+        body = json.dumps(
+            knn_search_body(query["query_vector"], query["top_k"], query.get("size"), query.get("filters")),
+            separators=(",", ":")
+        )
+        entry = f"{header}\n{body}\n".encode("utf-8")
+        if batch and (len(batch) >= OPENSEARCH_MSEARCH_MAX_QUERIES or size + len(entry) > OPENSEARCH_MSEARCH_MAX_BYTES):
+            batches.append((batch, b"".join(lines)))
+            batch, lines, size = [], [], 0
+        batch.append(position)
+        lines.append(entry)
+        size += len(entry)
+    if batch:
+        batches.append((batch, b"".join(lines)))
+
+    for batch, body in batches:
+        try:
+            msearch_res = opensearch_http.post(
+                f"https://{OPENSEARCH_HOST}/_msearch",
+                auth=opensearch_auth,
+                headers={"Content-Type": "application/x-ndjson"},
+                data=body,
+                timeout=timeout
+            )
+            if msearch_res.status_code == 200:
+                items = msearch_res.json()["responses"]
+            else:
+                items = [{"error": msearch_res.text[:500], "status": msearch_res.status_code}] * len(batch)
+        except Exception as e:
+            print(f"Multi-search batch of {len(batch)} failed: {e}")
+            items = [{"error": str(e), "status": 0}] * len(batch)
+        for position, item in zip(batch, items):
+            results[position] = item
+            if "error" not in item:
+                search_cache_put(index_name, cache_keys[position], generation,
+                                 json.dumps(item, separators=(",", ":")).encode("utf-8"))
+    return results
+
 # ---------- Lambda ----------
+JOB_ACTION_PATHS = ("/api/jobs/list", "/api/jobs/search_by_resume", "/api/jobs/sync_from_s3")
+
+
 def lambda_handler(event, context):
+    """
+    Entry point: handle_event with its stages timed
+
+    The breakdown goes out as a Server-Timing header on HTTP responses and
+    as one JSON log line per invocation, along with the container's
+    OpenSearch connection counters.
+    """
+    if not TRACING_ENABLED:
+        return handle_event(event, context)
+    with _trace_lock:
+        _trace_stages.clear()
+    start = time.perf_counter()
+    result = handle_event(event, context)
+    total_ms = (time.perf_counter() - start) * 1000
+    record_stage("total", total_ms)
+    with _trace_lock:
+        stages = {name: tuple(totals) for name, totals in _trace_stages.items() if name != "total"}
+
+    if "requestContext" in event:
+        route = f"{event['requestContext'].get('http', {}).get('method', '')} {event.get('rawPath', '')}"
+    else:
+        route = "s3_event" if "Records" in event else "event"
+    print(json.dumps({
+        "message": "request timing",
+        "request": route,
+        "status_code": result.get("statusCode") if isinstance(result, dict) else None,
+        "duration_ms": round(total_ms, 1),
+        "stages": {name: {"count": count, "ms": round(total, 1)} for name, (count, total) in stages.items()},
+        "opensearch_http": opensearch_http.stats()
+    }))
+    if isinstance(result, dict) and isinstance(result.get("headers"), dict):
+        result["headers"]["Server-Timing"] = server_timing(stages, total_ms)
+        result["headers"]["Access-Control-Expose-Headers"] = "Server-Timing"
+    return result
+
+
+def handle_event(event, context):
     print("=== Lambda Handler Started ===")
     print("EVENT:", json.dumps(event))
 
@@ -217,7 +878,11 @@ def lambda_handler(event, context):
 
         # ---- health ----
         if path == "/api/health":
-            return response(200, {"status": "ok"})
+            return response(200, {"status": "ok", "opensearch_http": opensearch_http.stats()})
+
+        # ---- rolling stage latencies of this container ----
+        if path == "/api/metrics" and method == "GET":
+            return response(200, {"latency": stage_percentiles()})
 
         # ---- list jobs from S3 directory: resumes/jobs/ ----
         if (path == "/api/jobs" or path == "/api/jobs/list") and method == "GET":
@@ -242,8 +907,7 @@ def lambda_handler(event, context):
                         try:
                             # Get and parse JSON file
                             file_obj = s3.get_object(Bucket=RESUME_BUCKET, Key=s3_key)
-                            content = file_obj['Body'].read().decode('utf-8')
-                            job_data = json.loads(content)
+                            job_data = decode_stored_json(file_obj)
                             
                             # Each file should contain 1 job object (dict)
                             if isinstance(job_data, dict):
@@ -328,8 +992,7 @@ def lambda_handler(event, context):
                         
                         try:
                             file_obj = s3.get_object(Bucket=RESUME_BUCKET, Key=s3_key)
-                            content = file_obj['Body'].read().decode('utf-8')
-                            job_data = json.loads(content)
+                            job_data = decode_stored_json(file_obj)
                             
                             # Check if this file contains the job we're looking for
                             if isinstance(job_data, dict):
@@ -425,7 +1088,8 @@ def lambda_handler(event, context):
                 return response(500, {"error": str(e)})
 
         # ---- update job in S3 (will trigger S3 event → auto update embedding in OpenSearch) ----
-        if path.startswith("/api/jobs/") and path != "/api/jobs/list" and method in ["PUT", "POST"]:
+        # POST /api/jobs/search_by_resume and /api/jobs/sync_from_s3 are handled below, not job ids
+        if path.startswith("/api/jobs/") and path not in JOB_ACTION_PATHS and method in ["PUT", "POST"]:
             try:
                 # Extract job_id from path (e.g., /api/jobs/job123)
                 job_id = path.split("/api/jobs/")[-1]
@@ -460,8 +1124,7 @@ def lambda_handler(event, context):
                         
                         try:
                             file_obj = s3.get_object(Bucket=RESUME_BUCKET, Key=s3_key)
-                            content = file_obj['Body'].read().decode('utf-8')
-                            job_data = json.loads(content)
+                            job_data = decode_stored_json(file_obj)
                             
                             # Check if this file contains the job we're looking for
                             if isinstance(job_data, dict):
@@ -515,10 +1178,10 @@ def lambda_handler(event, context):
                 s3.put_object(
                     Bucket=RESUME_BUCKET,
                     Key=found_s3_key,
-                    Body=json.dumps(job_to_save, ensure_ascii=False, indent=2).encode('utf-8'),
-                    ContentType='application/json'
+                    **encode_stored_json(job_to_save)
                 )
                 
+                bump_index_generation(INDEX_NAME)
                 print(f"Updated job {job_id} in S3: {found_s3_key}")
                 print(f"S3 event will trigger Lambda to update embedding in OpenSearch automatically")
                 
@@ -557,8 +1220,7 @@ def lambda_handler(event, context):
                         
                         try:
                             file_obj = s3.get_object(Bucket=RESUME_BUCKET, Key=s3_key)
-                            content = file_obj['Body'].read().decode('utf-8')
-                            job_data = json.loads(content)
+                            job_data = decode_stored_json(file_obj)
                             
                             if isinstance(job_data, dict):
                                 jobs_data.append(job_data)
@@ -579,7 +1241,6 @@ def lambda_handler(event, context):
                 print(f"Found {len(jobs_data)} jobs in S3, starting sync...")
                 
                 # 2. Ensure index exists
-                index_url = f"https://{OPENSEARCH_HOST}/jobs_index"
                 index_mapping = {
                     "mappings": {
                         "properties": {
@@ -597,21 +1258,7 @@ def lambda_handler(event, context):
                     }
                 }
                 
-                # Check if index exists
-                check_res = requests.head(index_url, auth=opensearch_auth, timeout=10)
-                if check_res.status_code == 404:
-                    # Create index
-                    create_res = requests.put(
-                        index_url,
-                        auth=opensearch_auth,
-                        headers={"Content-Type": "application/json"},
-                        json=index_mapping,
-                        timeout=30
-                    )
-                    if create_res.status_code not in [200, 201]:
-                        print(f"Warning: Could not create index: {create_res.text}")
-                    else:
-                        print("Created jobs_index in OpenSearch")
+                ensure_index("jobs_index", index_mapping)
                 
                 # 3. Sync each job with embedding
                 synced_count = 0
@@ -684,8 +1331,8 @@ def lambda_handler(event, context):
                                 # Continue without embedding
                         
                         # Index to OpenSearch
-                        index_doc_url = f"https://{OPENSEARCH_HOST}/jobs_index/_doc/{job_id}"
-                        index_res = requests.put(
+                        index_doc_url = f"https://{OPENSEARCH_HOST}/{write_index('jobs_index')}/_doc/{job_id}"
+                        index_res = opensearch_http.put(
                             index_doc_url,
                             auth=opensearch_auth,
                             headers={"Content-Type": "application/json"},
@@ -706,6 +1353,7 @@ def lambda_handler(event, context):
                         traceback.print_exc()
                         skipped_count += 1
                 
+                bump_index_generation("jobs_index")
                 print(f"Sync completed: {synced_count} synced, {skipped_count} skipped")
                 return response(200, {
                     "message": f"Successfully synced {synced_count} jobs from S3 to OpenSearch",
@@ -769,10 +1417,12 @@ def lambda_handler(event, context):
                 )
                 
                 resume_files = []
+                resume_etags = {}
                 for obj in resp.get("Contents", []):
                     key = obj["Key"]
                     if not key.endswith("/"):
                         resume_files.append(key)
+                        resume_etags[key] = obj.get("ETag")
                 
                 if not resume_files:
                     return response(200, {
@@ -785,7 +1435,6 @@ def lambda_handler(event, context):
                 print(f"Found {len(resume_files)} resume files in S3, starting sync...")
                 
                 # 2. Ensure index exists
-                index_url = f"https://{OPENSEARCH_HOST}/resumes_index"
                 index_mapping = {
                     "mappings": {
                         "properties": {
@@ -803,19 +1452,7 @@ def lambda_handler(event, context):
                     }
                 }
                 
-                check_res = requests.head(index_url, auth=opensearch_auth, timeout=10)
-                if check_res.status_code == 404:
-                    create_res = requests.put(
-                        index_url,
-                        auth=opensearch_auth,
-                        headers={"Content-Type": "application/json"},
-                        json=index_mapping,
-                        timeout=30
-                    )
-                    if create_res.status_code not in [200, 201]:
-                        print(f"Warning: Could not create index: {create_res.text}")
-                    else:
-                        print("Created resumes_index in OpenSearch")
+                ensure_index("resumes_index", index_mapping)
                 
                 # 3. Process each resume
                 synced_count = 0
@@ -830,24 +1467,11 @@ def lambda_handler(event, context):
                         
                         print(f"Processing resume: {resume_key} (ID: {resume_id})")
                         
-                        # Get file from S3
-                        file_obj = s3.get_object(Bucket=RESUME_BUCKET, Key=resume_key)
-                        file_content = file_obj["Body"].read()
+                        # Extract text (persisted extraction if current, else parse the file)
+                        extraction = load_resume_extraction(resume_key, etag=resume_etags.get(resume_key))
                         file_name = resume_key.split("/")[-1]
-                        
-                        # Extract text
-                        resume_text = ""
-                        try:
-                            if file_name.lower().endswith('.pdf'):
-                                import PyPDF2
-                                pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-                                resume_text = "\n".join([page.extract_text() for page in pdf_reader.pages])
-                            elif file_name.lower().endswith('.txt'):
-                                resume_text = file_content.decode('utf-8')
-                            else:
-                                resume_text = f"Resume file: {file_name}"
-                        except Exception as e:
-                            print(f"Warning: Could not extract text from {file_name}: {e}")
+                        resume_text = extraction["text"]
+                        if resume_text is None:
                             resume_text = f"Resume file: {file_name}"
                         
                         if not resume_text or len(resume_text.strip()) < 10:
@@ -863,7 +1487,7 @@ def lambda_handler(event, context):
                             "text_excerpt": resume_text[:500],
                             "metadata": {
                                 "s3_key": resume_key,
-                                "file_size": len(file_content)
+                                "file_size": extraction.get("source_size")
                             }
                         }
                         
@@ -888,8 +1512,8 @@ def lambda_handler(event, context):
                             # Continue without embedding
                         
                         # Index to OpenSearch
-                        index_doc_url = f"https://{OPENSEARCH_HOST}/resumes_index/_doc/{resume_id}"
-                        index_res = requests.put(
+                        index_doc_url = f"https://{OPENSEARCH_HOST}/{write_index('resumes_index')}/_doc/{resume_id}"
+                        index_res = opensearch_http.put(
                             index_doc_url,
                             auth=opensearch_auth,
                             headers={"Content-Type": "application/json"},
@@ -910,6 +1534,7 @@ def lambda_handler(event, context):
                         traceback.print_exc()
                         skipped_count += 1
                 
+                bump_index_generation("resumes_index")
                 print(f"Sync completed: {synced_count} synced, {skipped_count} skipped")
                 return response(200, {
                     "message": f"Successfully synced {synced_count} resumes from S3 to OpenSearch",
@@ -942,28 +1567,15 @@ def lambda_handler(event, context):
                 
                 print(f"Searching jobs for resume: {resume_key}")
                 
-                # 1. Get resume from S3
+                # 1-2. Get resume text (persisted extraction first; the PDF is only parsed once)
+                file_name = resume_key.split("/")[-1]
                 try:
-                    obj = s3.get_object(Bucket=RESUME_BUCKET, Key=resume_key)
-                    file_content = obj["Body"].read()
-                    file_name = resume_key.split("/")[-1]
+                    extraction = load_resume_extraction(resume_key)
                 except Exception as e:
                     print(f"Error fetching resume from S3: {str(e)}")
                     return response(404, {"error": f"Resume not found in S3: {resume_key}"})
-                
-                # 2. Extract text (simple version - for PDF only)
-                resume_text = ""
-                try:
-                    if file_name.lower().endswith('.pdf'):
-                        import PyPDF2
-                        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-                        resume_text = "\n".join([page.extract_text() for page in pdf_reader.pages])
-                    elif file_name.lower().endswith('.txt'):
-                        resume_text = file_content.decode('utf-8')
-                    else:
-                        resume_text = f"Resume file: {file_name}"
-                except Exception as e:
-                    print(f"Error extracting text: {str(e)}")
+                resume_text = extraction["text"]
+                if resume_text is None:
                     resume_text = f"Resume file: {file_name}"
                 
                 if not resume_text or len(resume_text.strip()) < 10:
@@ -999,7 +1611,7 @@ def lambda_handler(event, context):
                 # Check if index exists
                 try:
                     index_check_url = f"https://{OPENSEARCH_HOST}/{INDEX_NAME}"
-                    index_check_res = requests.head(index_check_url, auth=opensearch_auth, timeout=5)
+                    index_check_res = opensearch_http.head(index_check_url, auth=opensearch_auth, timeout=5)
                     if index_check_res.status_code == 404:
                         print(f"WARNING: OpenSearch index '{INDEX_NAME}' does not exist!")
                         return response(200, {
@@ -1026,12 +1638,11 @@ def lambda_handler(event, context):
                             }
                         }
                         
-                        search_res = requests.post(
-                            search_url,
-                            auth=opensearch_auth,
-                            headers={"Content-Type": "application/json"},
-                            json=search_query,
-                            timeout=10
+                        search_res = cached_vector_search(
+                            INDEX_NAME,
+                            search_query,
+                            query_vector=resume_embedding,
+                            k=100
                         )
                         
                         if search_res.status_code == 200:
@@ -1055,7 +1666,7 @@ def lambda_handler(event, context):
                         }
                     }
                     
-                    search_res = requests.post(
+                    search_res = opensearch_http.post(
                         search_url,
                         auth=opensearch_auth,
                         headers={"Content-Type": "application/json"},
@@ -1136,7 +1747,7 @@ def lambda_handler(event, context):
                     # Try to get job count from index to provide better error message
                     try:
                         count_url = f"https://{OPENSEARCH_HOST}/{INDEX_NAME}/_count"
-                        count_res = requests.get(count_url, auth=opensearch_auth, timeout=5)
+                        count_res = opensearch_http.get(count_url, auth=opensearch_auth, timeout=5)
                         if count_res.status_code == 200:
                             job_count = count_res.json().get("count", 0)
                             print(f"Total jobs in index '{INDEX_NAME}': {job_count}")
@@ -1540,7 +2151,7 @@ def lambda_handler(event, context):
                 
                 # 1. Get job from OpenSearch
                 job_url = f"https://{OPENSEARCH_HOST}/{INDEX_NAME}/_doc/{job_id}"
-                job_res = requests.get(job_url, auth=opensearch_auth, timeout=10)
+                job_res = opensearch_http.get(job_url, auth=opensearch_auth, timeout=10)
                 
                 if job_res.status_code != 200:
                     return response(404, {"error": f"Job {job_id} not found"})
@@ -1650,12 +2261,12 @@ def lambda_handler(event, context):
                         else:
                             print("No resume_keys provided, searching all resumes in index")
                         
-                        search_res = requests.post(
-                            search_url,
-                            auth=opensearch_auth,
-                            headers={"Content-Type": "application/json"},
-                            json=search_query,
-                            timeout=10
+                        search_res = cached_vector_search(
+                            "resumes_index",
+                            search_query,
+                            query_vector=job_embedding,
+                            k=100,
+                            filters=search_query["knn"]["embeddings"].get("filter")
                         )
                         
                         if search_res.status_code == 200:
@@ -1739,7 +2350,7 @@ def lambda_handler(event, context):
                                 print(f"[{idx+1}/{len(resume_keys)}] Processing: original='{original_key}', normalized='{resume_key}'")
                                 
                                 try:
-                                    obj = s3.get_object(Bucket=RESUME_BUCKET, Key=resume_key)
+                                    extraction = load_resume_extraction(resume_key)
                                 except Exception as s3_error:
                                     print(f"  - S3 ERROR: Cannot get object '{resume_key}': {str(s3_error)}")
                                     results.append({
@@ -1750,17 +2361,10 @@ def lambda_handler(event, context):
                                         "error": f"S3 Error: {str(s3_error)}"
                                     })
                                     continue
-                                file_content = obj["Body"].read()
                                 file_name = resume_key.split("/")[-1]
                                 
-                                # Extract text
-                                resume_text = ""
-                                if file_name.lower().endswith('.pdf'):
-                                    import PyPDF2
-                                    pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-                                    resume_text = "\n".join([page.extract_text() for page in pdf_reader.pages])
-                                elif file_name.lower().endswith('.txt'):
-                                    resume_text = file_content.decode('utf-8')
+                                # Extracted text (from the persisted sidecar when current)
+                                resume_text = extraction["text"] or ""
                                 
                                 print(f"  - File: {file_name}, text length: {len(resume_text)}")
                                 
@@ -2452,7 +3056,7 @@ def lambda_handler(event, context):
             if key.startswith(f"{RESUME_PREFIX}jobs/") and key.endswith('.json'):
                 try:
                     obj = s3.get_object(Bucket=bucket, Key=key)
-                    jobs_data = json.loads(obj["Body"].read().decode("utf-8"))
+                    jobs_data = decode_stored_json(obj)
                     
                     if isinstance(jobs_data, dict):
                         jobs_data = [jobs_data]
@@ -2523,8 +3127,8 @@ def lambda_handler(event, context):
                             # Continue without embedding
 
                         # Index to OpenSearch (jobs_index)
-                        index_doc_url = f"https://{OPENSEARCH_HOST}/jobs_index/_doc/{job_id}"
-                        index_res = requests.put(
+                        index_doc_url = f"https://{OPENSEARCH_HOST}/{write_index('jobs_index')}/_doc/{job_id}"
+                        index_res = opensearch_http.put(
                             index_doc_url,
                             auth=opensearch_auth,
                             headers={"Content-Type": "application/json"},
@@ -2552,25 +3156,19 @@ def lambda_handler(event, context):
                         resume_id = key.replace("/", "_").replace(".", "_")
 
                     print(f"Processing resume: {key} (ID: {resume_id})")
+                    index_resume_object(
+                        key,
+                        bucket=bucket,
+                        etag=record["s3"]["object"].get("eTag"),
+                        size=record["s3"]["object"].get("size"),
+                        resume_id=resume_id
+                    )
 
-                    # Get file from S3
-                    file_obj = s3.get_object(Bucket=bucket, Key=key)
-                    file_content = file_obj["Body"].read()
+                    # Extract text; the event ETag tells whether a persisted extraction still matches
+                    extraction = load_resume_extraction(key, bucket=bucket, etag=record["s3"]["object"].get("eTag"))
                     file_name = key.split("/")[-1]
-
-                    # Extract text
-                    resume_text = ""
-                    try:
-                        if file_name.lower().endswith('.pdf'):
-                            import PyPDF2
-                            pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-                            resume_text = "\n".join([page.extract_text() for page in pdf_reader.pages])
-                        elif file_name.lower().endswith('.txt'):
-                            resume_text = file_content.decode('utf-8')
-                        else:
-                            resume_text = f"Resume file: {file_name}"
-                    except Exception as e:
-                        print(f"Warning: Could not extract text from {file_name}: {e}")
+                    resume_text = extraction["text"]
+                    if resume_text is None:
                         resume_text = f"Resume file: {file_name}"
 
                     if not resume_text or len(resume_text.strip()) < 10:
@@ -2585,7 +3183,7 @@ def lambda_handler(event, context):
                         "text_excerpt": resume_text[:500],
                         "metadata": {
                             "s3_key": key,
-                            "file_size": len(file_content)
+                            "file_size": extraction.get("source_size")
                         }
                     }
 
@@ -2610,8 +3208,8 @@ def lambda_handler(event, context):
                         # Continue without embedding
 
                     # Index to OpenSearch (resumes_index)
-                    index_doc_url = f"https://{OPENSEARCH_HOST}/resumes_index/_doc/{resume_id}"
-                    index_res = requests.put(
+                    index_doc_url = f"https://{OPENSEARCH_HOST}/{write_index('resumes_index')}/_doc/{resume_id}"
+                    index_res = opensearch_http.put(
                         index_doc_url,
                         auth=opensearch_auth,
                         headers={"Content-Type": "application/json"},
@@ -2630,6 +3228,11 @@ def lambda_handler(event, context):
                     import traceback
                     traceback.print_exc()
 
+        if jobs_processed:
+            bump_index_generation("jobs_index")
+        if resumes_processed:
+            bump_index_generation("resumes_index")
+
         return response(200, {
             "message": f"Processed S3 events successfully",
             "jobs_processed": jobs_processed,
@@ -13,9 +13,10 @@ env_path = Path(__file__).parent.parent / 'infra' / '.env'
 if env_path.exists():
     load_dotenv(env_path)
 
-from app.routers import resumes, jobs, health
+from app.routers import resumes, jobs, health, ingestion, metrics
 from app.core.config import settings
 from app.core.logging import setup_logging, get_logger
+from app.core.tracing import tracing_middleware
 
 # Initialize logging
 setup_logging()
@@ -39,6 +40,7 @@ async def lifespan(app: FastAPI):
                 jobs_data = s3_client.load_jobs_data()
                 if jobs_data:
                     opensearch_client._mock_data_storage["jobs_index"] = jobs_data
+                    opensearch_client.invalidate_index("jobs_index")
                     logger.info(f"Loaded {len(jobs_data)} jobs from S3")
                 else:
                     logger.info("No jobs in S3. Auto-seeding 100 test jobs...")
@@ -56,10 +58,10 @@ async def lifespan(app: FastAPI):
                         except Exception as e:
                             logger.error(f"Failed to create job {job_data['title']}: {e}")
                     
-                    # Save to S3 after seeding
+                    # Seeded jobs are already in the job store's log; fold them into the snapshot
                     final_jobs = opensearch_client._mock_data_storage.get("jobs_index", [])
                     if final_jobs:
-                        s3_client.save_jobs_data(final_jobs)
+                        opensearch_client.compact_mock_jobs()
                     
                     final_count = len(final_jobs)
                     logger.info(f"Auto-seeding completed. Total jobs: {final_count}")
@@ -67,10 +69,18 @@ async def lifespan(app: FastAPI):
                 logger.error(f"Failed to load/seed jobs: {e}")
                 logger.info("You can manually seed jobs by running 'python seed_jobs.py'")
     
+    # Local queues (sqlite/memory) are drained by in-process workers
+    from app.services.ingestion_service import ingestion_service
+    ingestion_service.start_local_workers()
+    
     yield
     
-    # Shutdown (if needed)
-    pass
+    # Shutdown: stop ingestion workers, extraction worker processes and the async OpenSearch session
+    ingestion_service.stop_local_workers()
+    from app.services.extraction_service import extraction_service
+    extraction_service.shutdown()
+    from app.clients.async_opensearch_client import async_opensearch_client
+    await async_opensearch_client.close()
 
 
 # Create FastAPI app
@@ -88,8 +98,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browser dev tools show the stage breakdown of cross-origin calls
+    expose_headers=["Server-Timing"],
 )
 
+# Per-stage timings: Server-Timing header, one log record per request, /api/metrics
+app.middleware("http")(tracing_middleware)
+
 # Root endpoint for testing
 @app.get("/")
 async def root():
@@ -100,6 +115,8 @@ async def root():
 app.include_router(health.router, prefix="/api", tags=["Health"])
 app.include_router(resumes.router, prefix="/api/resumes", tags=["Resumes"])
 app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
+app.include_router(ingestion.router, prefix="/api/ingestion", tags=["Ingestion"])
+app.include_router(metrics.router, prefix="/api", tags=["Metrics"])
 
 # Local development only
 if __name__ == "__main__":
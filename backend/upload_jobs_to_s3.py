@@ -2,10 +2,16 @@
 Script to upload jobs data to S3
 """
 import boto3
+import gzip
 import json
 import os
 from botocore.exceptions import ClientError
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 # S3 configuration
 BUCKET_NAME = "resume-matching-533267343789"
 S3_KEY = "resumes/jobs_data.json"
@@ -23,18 +29,28 @@ def upload_jobs_data():
         # Create S3 client
         s3_client = boto3.client('s3', region_name=REGION)
         
-        # Convert to JSON string
-        data_json = json.dumps(jobs_data, ensure_ascii=False, indent=2).encode('utf-8')
+        # Compact JSON, compressed with zstd when available (else gzip);
+        # the codec is recorded in the object metadata for S3Client to decode
+        data_json = json.dumps(jobs_data, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+        if zstandard is not None:
+            codec = "zstd"
+            body = zstandard.ZstdCompressor(level=3).compress(data_json)
+        else:
+            codec = "gzip"
+            body = gzip.compress(data_json)
         
         # Upload to S3
         s3_client.put_object(
             Bucket=BUCKET_NAME,
             Key=S3_KEY,
-            Body=data_json,
-            ContentType='application/json'
+            Body=body,
+            ContentType='application/json',
+            ContentEncoding=codec,
+            Metadata={"codec": codec, "total_jobs": str(len(jobs_data))}
         )
         
-        print(f"✅ Successfully uploaded {len(jobs_data)} jobs to s3://{BUCKET_NAME}/{S3_KEY}")
+        print(f"✅ Successfully uploaded {len(jobs_data)} jobs to s3://{BUCKET_NAME}/{S3_KEY} "
+              f"({len(body):,} bytes {codec}, {len(data_json):,} bytes raw)")
         return True
         
     except FileNotFoundError:
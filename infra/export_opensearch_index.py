@@ -0,0 +1,34 @@
+"""
+Script to export an OpenSearch index to a local snapshot
+Run this script to copy a whole index (e.g. for analytics or kNN tuning):
+
+    python infra/export_opensearch_index.py jobs_index snapshots/jobs_index
+
+The snapshot directory gets documents.jsonl (ids and metadata, one line
+per document) and vectors.npy (float32, row i = line i), which
+np.load(..., mmap_mode="r") opens without reading it into memory. An
+interrupted export resumes when rerun with the same directory.
+"""
+import argparse
+from app.services.index_export_service import index_export_service
+
+def main():
+    parser = argparse.ArgumentParser(description="Export an OpenSearch index to a local snapshot")
+    parser.add_argument("index", help="Index or alias, e.g. jobs_index")
+    parser.add_argument("out_dir", help="Snapshot directory")
+    parser.add_argument("--vector-field", default="embeddings")
+    parser.add_argument("--slices", type=int, help="Parallel point-in-time slices")
+    parser.add_argument("--page-size", type=int, help="Documents per page")
+    args = parser.parse_args()
+    
+    manifest = index_export_service.export(
+        args.index,
+        args.out_dir,
+        vector_field=args.vector_field,
+        slices=args.slices,
+        page_size=args.page_size
+    )
+    print(f"✅ Exported {manifest['documents']} documents ({manifest['dimension']}-dim vectors) to {args.out_dir}")
+
+if __name__ == "__main__":
+    main()
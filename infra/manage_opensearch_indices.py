@@ -0,0 +1,69 @@
+"""
+Script to manage versioned OpenSearch indices
+Run this script to roll out mapping changes without downtime:
+
+    python infra/manage_opensearch_indices.py status jobs_index
+    python infra/manage_opensearch_indices.py reindex jobs_index
+    python infra/manage_opensearch_indices.py rollback jobs_index
+    python infra/manage_opensearch_indices.py cleanup jobs_index --keep 1
+
+reindex builds the next version from infra/opensearch_index_mapping.json,
+copies every document (embeddings included) and switches the alias once
+the copy is complete. Indices created before versioning are converted on
+their first reindex; writes to them are blocked while they are copied.
+Documents written during the copy are only readable after the switch.
+
+rollback copies the current version back into the previous one (so writes
+made since the switch survive), then moves both aliases back.
+"""
+import argparse
+import json
+from app.services.index_management_service import index_management_service
+
+def load_body(mapping_path, alias):
+    with open(mapping_path, 'r') as f:
+        mappings = json.load(f)
+    if alias not in mappings:
+        raise SystemExit(f"❌ No mapping for {alias} in {mapping_path}")
+    return mappings[alias]
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage versioned OpenSearch indices")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command in ("status", "ensure", "reindex", "rollback", "cleanup"):
+        subparser = subparsers.add_parser(command)
+        subparser.add_argument("alias", help="Index alias, e.g. jobs_index")
+        if command in ("ensure", "reindex"):
+            subparser.add_argument("--mapping", default="infra/opensearch_index_mapping.json")
+        if command in ("reindex", "rollback"):
+            subparser.add_argument("--workers", type=int, help="parallel_bulk threads")
+            subparser.add_argument("--chunk-size", type=int, help="Documents per scroll page and _bulk request")
+        if command == "cleanup":
+            subparser.add_argument("--keep", type=int, default=1, help="Old versions to keep for rollback")
+    args = parser.parse_args()
+    
+    if args.command == "status":
+        print(json.dumps(index_management_service.status(args.alias), indent=2))
+    elif args.command == "ensure":
+        created = index_management_service.ensure_index(args.alias, load_body(args.mapping, args.alias))
+        print(f"✅ Created {created}" if created else f"{args.alias} already exists")
+    elif args.command == "reindex":
+        result = index_management_service.reindex(
+            args.alias,
+            load_body(args.mapping, args.alias),
+            workers=args.workers,
+            chunk_size=args.chunk_size
+        )
+        print(f"✅ {args.alias} now reads from {result['target']} "
+              f"({result['target_count']} documents, {result['source_count']} in {result['source']})")
+        if result['failed']:
+            print(f"❌ Failed to copy {result['failed']} documents (see log)")
+    elif args.command == "rollback":
+        result = index_management_service.rollback(args.alias, workers=args.workers, chunk_size=args.chunk_size)
+        print(f"✅ {args.alias} rolled back from {result['from']} to {result['to']}")
+    elif args.command == "cleanup":
+        deleted = index_management_service.cleanup(args.alias, keep=args.keep)
+        print(f"✅ Deleted {len(deleted)} old versions: {', '.join(deleted) or 'none'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""
+Script to rebuild the resume index
+Run this script once for buckets that already hold resumes uploaded before
+the index existed (new uploads are indexed as they are stored)
+"""
+from app.clients.s3_client import s3_client
+from app.core.config import settings
+
+def rebuild_index():
+    """Write an index entry for every resume in the Candidate folder"""
+    print(f"Rebuilding resume index for s3://{settings.S3_BUCKET_NAME}/{settings.S3_PREFIX}Candidate/")
+    counts = s3_client.rebuild_resume_index()
+    print(f"✅ Indexed {counts['indexed']} resumes")
+    if counts['failed']:
+        print(f"❌ Failed to index {counts['failed']} objects (see log)")
+
+if __name__ == "__main__":
+    rebuild_index()